@@ -0,0 +1,36 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[5]
+HEAVY_MODULES = ['pm4py', 'pandas', 'sklearn', 'IPython', 'matplotlib', 'networkx']
+
+# Prints the heavy modules the import of the module pulled in
+HEAVY_IMPORTS = '''
+import json, sys
+import {module}
+print(json.dumps([m for m in {heavy} if m in sys.modules]))
+'''
+
+
+class TestHeavyImports:
+    @pytest.mark.parametrize(
+        "module",
+        [
+            "practical.ProcessMining.group1.shared.utils",
+            "practical.ProcessMining.group1.shared.visualizer",
+            "practical.ProcessMining.group1.task3.inductiveminer",
+            "practical.ProcessMining.group1.task3.inductiveminer_infrequent",
+            "practical.ProcessMining.group1.task4.tokenreplay",
+        ]
+    )
+    def test_import_does_not_load_heavy_modules(self, module: str):
+        # Run in a fresh interpreter, the test session has imported everything already
+        output = subprocess.run([sys.executable, '-c', HEAVY_IMPORTS.format(module=module, heavy=HEAVY_MODULES)],
+                                cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+        loaded = json.loads(output.strip().splitlines()[-1])
+
+        assert loaded == [], f'{module} imports {loaded} at import time'
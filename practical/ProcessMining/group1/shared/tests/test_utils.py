@@ -0,0 +1,91 @@
+import os
+from unittest.mock import patch
+
+import pandas as pd
+import pm4py
+
+from practical.ProcessMining.group1.shared import utils
+from practical.ProcessMining.group1.task2.alphaminer import AlphaMiner
+from practical.ProcessMining.group1.task3.inductiveminer import InductiveMiner
+
+DATA_DIR = utils.SAMPLES_PATH
+
+
+def test_event_log_to_csv(tmp_path):
+    log = [('a', 'b', 'c'), ('a',), ('b', 'a')]
+    first_file = utils.event_log_to_csv(log, str(tmp_path))
+    second_file = utils.event_log_to_csv(log[:1], str(tmp_path))
+
+    # Writing a log keeps the logs written before
+    assert os.path.exists(first_file) and first_file != second_file
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(first_file), os.path.basename(second_file)])
+
+    event_log = pd.read_csv(first_file, sep=';')
+    assert event_log['case_id'].tolist() == [1, 1, 1, 2, 3, 3]
+    assert event_log['activity'].tolist() == ['a', 'b', 'c', 'a', 'b', 'a']
+    assert pd.to_datetime(event_log['timestamp']).is_monotonic_increasing
+
+    # The events keep the order of the traces after formatting
+    formatted = pm4py.format_dataframe(event_log, case_id='case_id', activity_key='activity',
+                                       timestamp_key='timestamp')
+    assert formatted['concept:name'].tolist() == ['a', 'b', 'c', 'a', 'b', 'a']
+
+
+def test_event_log_columns():
+    case_ids, activities = utils.event_log_columns([('a', 'b'), (), ('c',)], first_case_id=0)
+
+    assert case_ids.tolist() == [0, 0, 2]
+    assert activities.tolist() == ['a', 'b', 'c']
+    assert utils.event_log_to_pm4py_dataframe([('a', 'b'), ('c',)])['case:concept:name'].tolist() == ['0', '0', '1']
+
+
+def test_load_event_log_cache(tmp_path):
+    log_path = tmp_path / 'log.csv'
+    log_path.write_text((DATA_DIR / 'common-example.csv').read_text())
+    cache_path = tmp_path / 'cache'
+
+    event_log = utils.load_event_log(str(log_path), cache_path=cache_path)
+    assert len(list(cache_path.iterdir())) == 1
+
+    # The second import reads the cache instead of parsing the file
+    with patch('practical.ProcessMining.group1.shared.utils._parse_event_log') as parse:
+        cached = utils.load_event_log(str(log_path), cache_path=cache_path)
+    parse.assert_not_called()
+    pd.testing.assert_frame_equal(cached, event_log)
+
+    # Changing the file invalidates the entry
+    with open(log_path, 'a') as file:
+        file.write('\n9;a;2024-01-01 00:00:00+01:00\n')
+    changed = utils.load_event_log(str(log_path), cache_path=cache_path)
+    assert len(changed) == len(event_log) + 1
+    assert len(list(cache_path.iterdir())) == 1
+
+
+def test_load_event_log_categorical():
+    event_log = utils.load_event_log(str(DATA_DIR / 'running-example.xes'), categorical=True)
+
+    assert list(event_log['concept:name'].cat.categories) == sorted(event_log['concept:name'].unique())
+    assert event_log['case:concept:name'].is_monotonic_increasing
+    for _, case in event_log.groupby('case:concept:name'):
+        assert case['time:timestamp'].is_monotonic_increasing
+
+
+def test_load_event_log_cache_is_opt_in():
+    with patch('practical.ProcessMining.group1.shared.utils._write_cached_event_log') as write:
+        utils.load_event_log(str(DATA_DIR / 'running-example.csv'))
+        utils.import_xes(str(DATA_DIR / 'running-example.xes'))
+        AlphaMiner(str(DATA_DIR / 'running-example.csv'))
+        InductiveMiner(str(DATA_DIR / 'running-example.xes'))
+    write.assert_not_called()
+
+
+def test_miners_use_cache(tmp_path):
+    log_path = str(DATA_DIR / 'running-example.xes')
+    alpha_miner = AlphaMiner(log_path, cache_path=str(tmp_path / 'alpha'))
+    inductive_miner = InductiveMiner(log_path, cache_path=str(tmp_path / 'inductive'))
+
+    assert len(list((tmp_path / 'alpha').iterdir())) == 1
+    assert len(list((tmp_path / 'inductive').iterdir())) == 1
+    cached_alpha_miner = AlphaMiner(log_path, cache_path=str(tmp_path / 'alpha'))
+    assert [trace.tolist() for trace in cached_alpha_miner.traces] == [trace.tolist() for trace in alpha_miner.traces]
+    assert InductiveMiner(log_path, cache_path=str(tmp_path / 'inductive')).event_log == inductive_miner.event_log
@@ -1,47 +1,204 @@
-import csv
+import hashlib
 import os
 
 import numpy as np
-import pandas as pd
-import pm4py
 import shutil
 import uuid
 import re
-from IPython.utils import io
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
-from sklearn.metrics import silhouette_score
 
 TMP_LOGS_PATH = './tmp_logs'
 SAMPLES_PATH = Path(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'example_files'))
 
 
-def import_csv(file_path):
-    event_log = pd.read_csv(file_path, sep=';')
-    event_log = pm4py.format_dataframe(event_log, case_id='case_id', activity_key='activity', timestamp_key='timestamp')
+def import_csv(file_path, cache_path=None):
+    return load_event_log(file_path, cache_path=cache_path)
+
+
+def import_xes(file_path, cache_path=None):
+    return load_event_log(file_path, cache_path=cache_path)
+
+
+def load_event_log(file_path, case_id='case_id', activity_key='activity', timestamp_key='timestamp',
+                   categorical=False, cache_path=None):
+    """
+    Imports an event log from a .csv or .xes file as a pm4py DataFrame, sorted by case and timestamp.
+
+    Caching is opt-in: if cache_path is given, the first import of a file stores the parsed log there, as a
+    Feather file if pyarrow is installed and as a pickle otherwise. Later imports read the cached file,
+    memory-mapped for Feather, instead of parsing the source again. Only use a cache directory that nobody else
+    can write to, pickles are loaded as they are.
+
+    Cache entries are keyed by the path, modification time and content hash of the source file. There is one
+    entry per source file: importing a changed file replaces its entry. Entries of moved or deleted files are
+    never evicted, delete the cache directory to clear the cache.
+
+    Parameters:
+        file_path: Path to the event log file
+        case_id: Column of the case ids in a .csv file
+        activity_key: Column of the activities in a .csv file
+        timestamp_key: Column of the timestamps in a .csv file
+        categorical: If True, the activities are returned as integer-coded categories with sorted categories.
+            pm4py functions expect string activities, so the default is False.
+        cache_path: Directory of the cache, by default None (no caching)
+
+    Returns:
+        A pandas DataFrame with the event log formatted for pm4py.
+    """
+    if not os.path.exists(file_path):
+        raise Exception("File does not exist")
+    if os.path.splitext(file_path)[1] not in ('.csv', '.xes'):
+        raise Exception("File extension must be .csv or xes")
+
+    if cache_path is None:
+        event_log = _parse_event_log(file_path, case_id, activity_key, timestamp_key)
+    else:
+        entry, version = _event_log_cache_entry(file_path, (case_id, activity_key, timestamp_key), cache_path)
+        cached = [path for path in (Path(cache_path) / f'{entry}_{version}.feather',
+                                    Path(cache_path) / f'{entry}_{version}.pkl') if path.exists()]
+        if cached:
+            event_log = _read_cached_event_log(cached[0])
+        else:
+            event_log = _parse_event_log(file_path, case_id, activity_key, timestamp_key)
+            _write_cached_event_log(event_log, Path(cache_path), entry, version)
+
+    if not categorical:
+        # The categories keep the string type of the parsed column
+        event_log['concept:name'] = event_log['concept:name'].astype(event_log['concept:name'].cat.categories.dtype)
     return event_log
 
 
-def import_xes(file_path):
-    event_log = pm4py.read_xes(file_path)
+def _parse_event_log(file_path, case_id, activity_key, timestamp_key):
+    import pandas as pd
+    import pm4py
+
+    if file_path.endswith('.csv'):
+        event_log = pd.read_csv(file_path, sep=';')
+        event_log = pm4py.format_dataframe(event_log, case_id=case_id, activity_key=activity_key,
+                                           timestamp_key=timestamp_key)
+    else:
+        event_log = pm4py.read_xes(file_path)
+
+    # Stable sort, so events with the same timestamp and logs without timestamps keep the file order
+    sort_keys = [key for key in ('case:concept:name', 'time:timestamp') if key in event_log.columns]
+    event_log = event_log.sort_values(sort_keys, kind='stable').reset_index(drop=True)
+    if '@@index' in event_log.columns:
+        event_log['@@index'] = np.arange(len(event_log))
+    if '@@case_index' in event_log.columns:
+        event_log['@@case_index'] = event_log.groupby('case:concept:name').ngroup()
+    event_log['concept:name'] = event_log['concept:name'].astype('category')
     return event_log
 
 
-def event_log_to_csv(event_log):
-    if os.path.exists(Path(TMP_LOGS_PATH)):
-        shutil.rmtree(Path(TMP_LOGS_PATH))
-    os.makedirs(TMP_LOGS_PATH, exist_ok=True)
-    filename = f'{TMP_LOGS_PATH}/event_log_{uuid.uuid4()}.csv'
-    with open(filename, 'w', newline='') as file:
-        writer = csv.writer(file, delimiter=';')
-        writer.writerow(["case_id", "activity", "timestamp"])
-        for i, activities in enumerate(event_log, start=1):
-            for activity in activities:
-                timestamp = datetime.now().isoformat()
-                writer.writerow([i, activity, timestamp])
+def _event_log_cache_entry(file_path, columns, cache_path):
+    # The entry identifies the source file and columns, the version its content
+    file_path = os.path.abspath(file_path)
+    content_hash = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            content_hash.update(chunk)
+    entry = hashlib.sha256('|'.join((file_path,) + columns).encode('utf-8')).hexdigest()[:32]
+    version = hashlib.sha256(f'{os.stat(file_path).st_mtime_ns}|{content_hash.hexdigest()}'.encode('utf-8'))
+    return entry, version.hexdigest()[:32]
+
+
+def _read_cached_event_log(path):
+    if path.suffix == '.feather':
+        from pyarrow import feather
+
+        return feather.read_table(path, memory_map=True).to_pandas()
+    import pandas as pd
+
+    return pd.read_pickle(path)
+
+
+def _write_cached_event_log(event_log, cache_path, entry, version):
+    os.makedirs(cache_path, exist_ok=True)
+    # Write to a temporary file first, so concurrent imports never read a partial file
+    tmp_file = cache_path / f'{entry}_{uuid.uuid4()}.tmp'
+    try:
+        event_log.to_feather(tmp_file)
+        extension = 'feather'
+    except (ImportError, ValueError, TypeError):  # pyarrow is optional, or the columns are not Arrow compatible
+        event_log.to_pickle(tmp_file)
+        extension = 'pkl'
+
+    # Drop the older versions of the entry
+    for path in cache_path.glob(f'{entry}_*.*'):
+        if path.suffix in ('.feather', '.pkl'):
+            path.unlink(missing_ok=True)
+    os.replace(tmp_file, cache_path / f'{entry}_{version}.{extension}')
+
+
+def event_log_to_csv(event_log, directory=TMP_LOGS_PATH):
+    """
+    Writes the event log to a new csv file. The columns are built in bulk, see event_log_columns.
+
+    Parameters:
+        event_log: List of traces
+        directory: Directory of the file, created if it does not exist. Files in TMP_LOGS_PATH are kept until
+            clear_tmp_logs is called.
+
+    Returns:
+        The path of the csv file.
+    """
+    filename = _new_log_filename(directory, 'csv')
+    event_log_to_dataframe(event_log).to_csv(filename, sep=';', index=False)
     return filename
 
 
+def event_log_to_parquet(event_log, directory=TMP_LOGS_PATH):
+    """
+    Writes the event log to a new Parquet file. Requires pyarrow or fastparquet.
+
+    Parameters:
+        event_log: List of traces
+        directory: Directory of the file, created if it does not exist. Files in TMP_LOGS_PATH are kept until
+            clear_tmp_logs is called.
+
+    Returns:
+        The path of the Parquet file.
+    """
+    filename = _new_log_filename(directory, 'parquet')
+    event_log_to_dataframe(event_log).to_parquet(filename, index=False)
+    return filename
+
+
+def clear_tmp_logs():
+    """ Deletes all event logs written to TMP_LOGS_PATH. """
+    shutil.rmtree(Path(TMP_LOGS_PATH), ignore_errors=True)
+
+
+def _new_log_filename(directory, extension):
+    # Every log gets its own file, so logs written earlier stay valid
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f'event_log_{uuid.uuid4()}.{extension}')
+
+
+def event_log_columns(event_log, first_case_id=1):
+    """
+    Builds the case id and activity columns of an event log with one entry per event.
+
+    Parameters:
+        event_log: List of traces
+        first_case_id: Case id of the first trace, the following traces are numbered consecutively
+
+    Returns:
+        Tuple of the case id array and the activity array.
+    """
+    lengths = np.fromiter(map(len, event_log), dtype=np.int64, count=len(event_log))
+    case_ids = np.repeat(np.arange(first_case_id, first_case_id + len(lengths)), lengths)
+    activities = np.array(list(chain.from_iterable(event_log)), dtype=object)
+    return case_ids, activities
+
+
+def _event_timestamps(n):
+    # One microsecond apart from now, so the events keep their order when sorted by time
+    return np.datetime64(datetime.now(), 'us') + np.arange(n).astype('timedelta64[us]')
+
+
 def read_txt_test_logs(file):
     event_dict = {}
     with open(file, 'r') as file:
@@ -66,12 +223,20 @@ def deduplicate_list(list_with_duplicates):
 
 
 def event_log_to_dataframe(event_log):
-    data = []
-    for i, activities in enumerate(event_log, start=1):
-        for activity in activities:
-            timestamp = datetime.now().isoformat()
-            data.append([i, activity, timestamp])
-    return pd.DataFrame(data, columns=["case_id", "activity", "timestamp"])
+    """
+    Converts the event log to a pandas DataFrame with the columns case_id, activity and timestamp. Case ids start
+    at 1 and the timestamps increase by one microsecond per event.
+
+    Parameters:
+        event_log: List of traces
+
+    Returns:
+        A pandas DataFrame with one row per event.
+    """
+    import pandas as pd
+
+    case_ids, activities = event_log_columns(event_log)
+    return pd.DataFrame({"case_id": case_ids, "activity": activities, "timestamp": _event_timestamps(len(case_ids))})
 
 
 def event_log_to_pm4py_dataframe(log):
@@ -84,12 +249,12 @@ def event_log_to_pm4py_dataframe(log):
     Returns:
         A pandas DataFrame with the event log formatted for pm4py.
     """
-    data = []
-    for i, trace in enumerate(log):
-        for event in trace:
-            data.append({"case_id": i, "activity": event, "timestamp": i})
-    return pm4py.format_dataframe(pd.DataFrame(data), case_id='case_id', activity_key='activity',
-                                  timestamp_key='timestamp')
+    import pandas as pd
+    import pm4py
+
+    case_ids, activities = event_log_columns(log, first_case_id=0)
+    return pm4py.format_dataframe(pd.DataFrame({"case_id": case_ids, "activity": activities, "timestamp": case_ids}),
+                                  case_id='case_id', activity_key='activity', timestamp_key='timestamp')
 
 
 def check_lists_of_sets_equal(list1, list2):
@@ -100,6 +265,10 @@ def check_lists_of_sets_equal(list1, list2):
 
 
 def custom_metric(log, features, cluster_labels, net, im, fm, weights=None):
+    import pm4py
+    from IPython.utils import io
+    from sklearn.metrics import silhouette_score
+
     if weights is None:
         weights = {"ss": 0.4, "f": 0.25, "p": 0.35}
 
@@ -131,6 +300,8 @@ class Splitter:
         """
         Splits the log into two parts based on the given date. Filters all cases that are present in both parts.
         """
+        import pandas as pd
+
         date = pd.to_datetime(date).tz_localize('UTC')
 
         # Split the log
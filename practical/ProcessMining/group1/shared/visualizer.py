@@ -1,12 +1,13 @@
-from typing import Dict, Optional, Union, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, TextIO, Union, Tuple
 
-from IPython.core.display import Image
-from IPython.core.display_functions import display
-from pm4py.objects.petri_net.obj import PetriNet, Marking
 from graphviz import Digraph
+from graphviz.quoting import attr_list, quote
 import tempfile
-import matplotlib.pyplot as plt
-import matplotlib
+
+if TYPE_CHECKING:  # IPython, pm4py and matplotlib are only imported where they are used
+    from pm4py.objects.petri_net.obj import PetriNet, Marking
 
 
 class Visualizer:
@@ -21,10 +22,16 @@ class Visualizer:
         Builds a process tree from a given tree structure.
     build_petri_net(net, initial_marking, final_marking, tokens=None)
         Builds a Petri net from a given net structure, initial marking, final marking, and tokens.
+    write_petri_net(net, initial_marking, final_marking, file, tokens=None, ...)
+        Writes a Petri net in DOT format to a file, optionally with reduced level of detail.
+    render_petri_nets(nets, file_names, max_workers=None)
+        Builds many Petri nets and saves them to files in parallel.
     display(graph)
         Displays the given graph.
     save(graph, file_name)
         Saves the given graph to a file.
+    save_all(graphs, file_names, max_workers=None)
+        Saves many graphs to files in parallel.
     """
 
     def build_process_tree(self, tree: Union[Tuple, str], graph: Optional[Digraph] = None) -> Digraph:
@@ -79,7 +86,7 @@ class Visualizer:
 
         return graph
 
-    def build_petri_net(self, net: PetriNet, initial_marking: Marking, final_marking: Marking,
+    def build_petri_net(self, net: 'PetriNet', initial_marking: 'Marking', final_marking: 'Marking',
                         tokens: Optional[Dict[str, Dict]] = None) -> Digraph:
         """
         Builds a Petri net from a given net structure, initial marking, final marking, and tokens.
@@ -108,35 +115,180 @@ class Visualizer:
         graph = Digraph(net.name, filename=filename.name, engine='dot')
         graph.graph_attr.update({'rankdir': 'LR', 'bgcolor': 'white'})
         graph.format = 'png'
+
+        # Add transitions, places and arcs to the graph
+        for kind, source, target, attributes in self._iter_petri_net_elements(net, initial_marking, final_marking,
+                                                                              tokens):
+            if kind == 'node':
+                self._create_graph_node(graph, id(source), target, **attributes)
+            else:
+                self._create_graph_edge(graph, source, target, **attributes)
+
+        graph.attr(overlap='false')
+
+        return graph
+
+    def write_petri_net(self, net: 'PetriNet', initial_marking: 'Marking', final_marking: 'Marking',
+                        file: Union[str, TextIO], tokens: Optional[Dict[str, Dict]] = None,
+                        collapse_silent_chains: bool = False, max_label_length: Optional[int] = None) -> None:
+        """
+        Writes a Petri net in DOT format node by node and edge by edge to a file, without building a Digraph in
+        memory. Without reduction, the output equals the source of build_petri_net. The file can be rendered
+        with the Graphviz command line tools or graphviz.render.
+
+        Parameters
+        ----------
+        net : PetriNet
+            The Petri net structure to visualize.
+        initial_marking : Marking
+            The initial marking of the Petri net.
+        final_marking : Marking
+            The final marking of the Petri net.
+        file : Union[str, TextIO]
+            The path of the DOT file or an open text file.
+        tokens : Optional[Dict[str, Dict]], optional
+            The tokens in the Petri net, by default None
+        collapse_silent_chains : bool, optional
+            Whether to collapse chains of silent transitions into one silent transition, by default False
+        max_label_length : Optional[int], optional
+            The maximum length of transition labels, longer labels are cut, by default no limit
+        """
+        if isinstance(file, str):
+            with open(file, 'w', encoding='utf-8') as handle:
+                self.write_petri_net(net, initial_marking, final_marking, handle, tokens, collapse_silent_chains,
+                                     max_label_length)
+            return
+
+        file.write(f'digraph {quote(net.name)} {{\n')
+        file.write(f'\tgraph{attr_list(kwargs={"rankdir": "LR", "bgcolor": "white"})}\n')
+        for kind, source, target, attributes in self._iter_petri_net_elements(
+                net, initial_marking, final_marking, tokens, collapse_silent_chains, max_label_length):
+            if kind == 'node':
+                file.write(f'\t{quote(str(id(source)))}{attr_list(target, kwargs=attributes)}\n')
+            else:
+                file.write(f'\t{quote(str(id(source)))} -> {quote(str(id(target)))}{attr_list(kwargs=attributes)}\n')
+        file.write('\toverlap=false\n}\n')
+
+    def _iter_petri_net_elements(self, net: 'PetriNet', initial_marking: 'Marking', final_marking: 'Marking',
+                                 tokens: Optional[Dict[str, Dict]] = None, collapse_silent_chains: bool = False,
+                                 max_label_length: Optional[int] = None) -> Iterator[Tuple]:
+        """
+        Yields the nodes and edges of a Petri net with their graph attributes: transitions first, then the
+        places sorted by name, then the arcs sorted by the names of their source and target.
+
+        Parameters
+        ----------
+        net : PetriNet
+            The Petri net structure to visualize.
+        initial_marking : Marking
+            The initial marking of the Petri net.
+        final_marking : Marking
+            The final marking of the Petri net.
+        tokens : Optional[Dict[str, Dict]], optional
+            The tokens in the Petri net, by default None
+        collapse_silent_chains : bool, optional
+            Whether to collapse chains of silent transitions into one silent transition, by default False
+        max_label_length : Optional[int], optional
+            The maximum length of transition labels, longer labels are cut, by default no limit
+
+        Yields
+        ------
+        Tuple
+            ('node', transition or place, label, attributes) or ('edge', source, target, attributes).
+        """
         font_size = "12"
+        representative, hidden_places = {}, set()
+        if collapse_silent_chains:
+            representative, hidden_places = self._find_silent_chains(net, initial_marking, final_marking, tokens)
+
+        def cut_label(label: str) -> str:
+            if max_label_length is None or len(label) <= max_label_length:
+                return label
+            return label[:max(max_label_length - 1, 0)] + '…'
 
-        # Add transitions to the graph
+        # Transitions
         for t in net.transitions:
+            if representative.get(t, t) is not t:
+                continue  # Part of a collapsed chain, drawn as its representative
             textcolor = "black"
-            label = str(t.label)
+            label = cut_label(str(t.label))
             fillcolor = "transparent" if t.label else "black"
-            self._create_graph_node(graph, id(t), label, style='filled', shape='box', fillcolor=fillcolor,
-                                    fontsize=font_size, fontname="Arial", fontcolor=textcolor)
+            yield 'node', t, label, dict(style='filled', shape='box', fillcolor=fillcolor, fontsize=font_size,
+                                         fontname="Arial", fontcolor=textcolor)
 
-        # Add places to the graph
+        # Compute the token maxima for the color scale once per render
+        maxima = self._get_token_maxima(tokens)
+
+        # Places
         places_sort_list = sorted(list(net.places), key=lambda x: x.name)
         for p in places_sort_list:
+            if p in hidden_places:
+                continue
             fillcolor, label, penwidth, fontsize, shape = self._get_place_attributes(p, initial_marking,
-                                                                                     final_marking, tokens)
-            self._create_graph_node(graph, id(p), label, shape=shape, fixedsize='true', width='0.75', style="filled",
-                                    fillcolor=fillcolor, fontname="Arial", weight="bold", penwidth=penwidth,
-                                    fontsize=fontsize)
+                                                                                     final_marking, tokens, maxima)
+            yield 'node', p, label, dict(shape=shape, fixedsize='true', width='0.75', style="filled",
+                                         fillcolor=fillcolor, fontname="Arial", weight="bold", penwidth=penwidth,
+                                         fontsize=fontsize)
 
-        # Add arcs to the graph
+        # Arcs, redirected to the representatives of collapsed chains
+        emitted = set()
         arcs_sort_list = sorted(list(net.arcs), key=lambda x: (x.source.name, x.target.name))
         for a in arcs_sort_list:
-            color, weight = self._get_edge_attributes(a.source, a.target, tokens)
-            self._create_graph_edge(graph, a.source, a.target, color=color, penwidth=weight,
-                                    fontsize=font_size, arrowhead="normal")
+            if a.source in hidden_places or a.target in hidden_places:
+                continue
+            source, target = representative.get(a.source, a.source), representative.get(a.target, a.target)
+            if collapse_silent_chains and (source, target) in emitted:
+                continue
+            emitted.add((source, target))
+            color, weight = self._get_edge_attributes(a.source, a.target, tokens, maxima)
+            attributes = dict(color=color, penwidth=weight, fontsize=font_size, arrowhead="normal")
+            yield 'edge', source, target, attributes
 
-        graph.attr(overlap='false')
+    @staticmethod
+    def _find_silent_chains(net: 'PetriNet', initial_marking: 'Marking', final_marking: 'Marking',
+                            tokens: Optional[Dict[str, Dict]] = None) -> Tuple[Dict, set]:
+        """
+        Finds chains of silent transitions that are connected by places with exactly one incoming and one outgoing
+        arc. Places in a marking or with tokens are kept.
 
-        return graph
+        Parameters
+        ----------
+        net : PetriNet
+            The Petri net structure to visualize.
+        initial_marking : Marking
+            The initial marking of the Petri net.
+        final_marking : Marking
+            The final marking of the Petri net.
+        tokens : Optional[Dict[str, Dict]], optional
+            The tokens in the Petri net, by default None
+
+        Returns
+        -------
+        Tuple[Dict, set]
+            The representative silent transition of every collapsed transition and the places inside the chains.
+        """
+        parent = {}
+
+        def find(t):
+            while parent.get(t, t) is not t:
+                parent[t] = parent.get(parent[t], parent[t])
+                t = parent[t]
+            return t
+
+        hidden_places = set()
+        token_places = set(tokens["missing"]) | set(tokens["remaining"]) if tokens else set()
+        for p in sorted(net.places, key=lambda x: x.name):
+            if (len(p.in_arcs) != 1 or len(p.out_arcs) != 1 or p in initial_marking or p in final_marking
+                    or p in token_places):
+                continue
+            source, target = next(iter(p.in_arcs)).source, next(iter(p.out_arcs)).target
+            if source.label is None and target.label is None and source is not target:
+                hidden_places.add(p)
+                root_source, root_target = find(source), find(target)
+                if root_source is not root_target:
+                    parent[root_target] = root_source
+
+        return {t: find(t) for t in parent}, hidden_places
 
     @staticmethod
     def _create_graph_node(graph: Digraph, node_id: str, label: str, **kwargs: str) -> None:
@@ -157,8 +309,8 @@ class Visualizer:
         graph.node(str(node_id), label, **kwargs)
 
     @staticmethod
-    def _create_graph_edge(graph: Digraph, source: Union[PetriNet.Transition, PetriNet.Place],
-                           target: Union[PetriNet.Transition, PetriNet.Place], **kwargs: str) -> None:
+    def _create_graph_edge(graph: Digraph, source: 'Union[PetriNet.Transition, PetriNet.Place]',
+                           target: 'Union[PetriNet.Transition, PetriNet.Place]', **kwargs: str) -> None:
         """
         Create an edge in the graph with the given attributes.
 
@@ -175,9 +327,10 @@ class Visualizer:
         """
         graph.edge(str(id(source)), str(id(target)), **kwargs)
 
-    def _get_edge_attributes(self, source: Union[PetriNet.Transition, PetriNet.Place],
-                             target: Union[PetriNet.Transition, PetriNet.Place],
-                             tokens: Optional[Dict[str, Dict]]) -> Tuple:
+    def _get_edge_attributes(self, source: 'Union[PetriNet.Transition, PetriNet.Place]',
+                             target: 'Union[PetriNet.Transition, PetriNet.Place]',
+                             tokens: Optional[Dict[str, Dict]],
+                             maxima: Optional[Tuple[int, int]] = None) -> Tuple:
         """
         Determines the color and weight of an edge in the graph based on the source and target nodes and tokens.
 
@@ -189,6 +342,8 @@ class Visualizer:
             The target node of the edge.
         tokens : Optional[Dict[str, Dict]]
             The tokens in the Petri net, by default None
+        maxima : Optional[Tuple[int, int]], optional
+            The maximum missing and remaining tokens, computed from the tokens if None
 
         Returns
         -------
@@ -199,13 +354,12 @@ class Visualizer:
         weight = "1"
         if tokens:
             missing_tokens = tokens["missing"]
-            max_missing_tokens = max([v for k, v in missing_tokens.items()], default=0)
             remaining_tokens = tokens["remaining"]
-            max_remaining_tokens = max([v for k, v in remaining_tokens.items()], default=0)
-            all_tokens = missing_tokens | remaining_tokens
+            max_missing_tokens, max_remaining_tokens = maxima or self._get_token_maxima(tokens)
 
             # If either the source or target node has tokens, adjust the color and weight of the edge
-            if source in all_tokens or target in all_tokens:
+            if (source in missing_tokens or source in remaining_tokens or
+                    target in missing_tokens or target in remaining_tokens):
                 missing_source = missing_tokens.get(source, 0)
                 remaining_source = remaining_tokens.get(source, 0)
                 missing_target = missing_tokens.get(target, 0)
@@ -217,8 +371,9 @@ class Visualizer:
                 weight = "2"
         return color, weight
 
-    def _get_place_attributes(self, place: PetriNet.Place, initial_marking: Marking,
-                              final_marking: Marking, tokens: Optional[Dict[str, Dict]] = None) -> Tuple:
+    def _get_place_attributes(self, place: 'PetriNet.Place', initial_marking: 'Marking',
+                              final_marking: 'Marking', tokens: Optional[Dict[str, Dict]] = None,
+                              maxima: Optional[Tuple[int, int]] = None) -> Tuple:
         """
         Determines the attributes of a place in the graph based on the place, initial marking,
         final marking, and tokens.
@@ -233,6 +388,8 @@ class Visualizer:
             The final marking of the Petri net.
         tokens : Optional[Dict[str, Dict]]
             The tokens in the Petri net, by default None
+        maxima : Optional[Tuple[int, int]], optional
+            The maximum missing and remaining tokens, computed from the tokens if None
 
         Returns
         -------
@@ -259,9 +416,8 @@ class Visualizer:
         # If there are tokens, adjust the fill color, label, pen width, and font size based on the tokens
         if tokens:
             missing_tokens = tokens["missing"]
-            max_missing_tokens = max([v for k, v in missing_tokens.items()], default=0)
             remaining_tokens = tokens["remaining"]
-            max_remaining_tokens = max([v for k, v in remaining_tokens.items()], default=0)
+            max_missing_tokens, max_remaining_tokens = maxima or self._get_token_maxima(tokens)
 
             if place in remaining_tokens and place in missing_tokens:
                 fillcolor = self._get_color(missing_tokens[place], remaining_tokens[place],
@@ -290,6 +446,25 @@ class Visualizer:
 
         return fillcolor, label, penwidth, fontsize, shape
 
+    @staticmethod
+    def _get_token_maxima(tokens: Optional[Dict[str, Dict]]) -> Tuple[int, int]:
+        """
+        Determines the maximum number of missing and remaining tokens of any node.
+
+        Parameters
+        ----------
+        tokens : Optional[Dict[str, Dict]]
+            The tokens in the Petri net
+
+        Returns
+        -------
+        Tuple[int, int]
+            The maximum missing and remaining tokens, 0 if there are no tokens.
+        """
+        if not tokens:
+            return 0, 0
+        return max(tokens["missing"].values(), default=0), max(tokens["remaining"].values(), default=0)
+
     @staticmethod
     def _get_color(missing_tokens: int, remaining_tokens: int, max_tokens_miss: int,
                    max_tokens_remain: int, scale: float = 0.6) -> str:
@@ -321,16 +496,12 @@ class Visualizer:
             # If there are more remaining tokens than missing tokens, use a blue color map
             ratio = res / max_tokens_remain
             ratio = ratio * scale + (1 - scale) / 2
-            cmap = plt.cm.get_cmap("Blues")
-            fillcolor = cmap(ratio)
-            fillcolor = matplotlib.colors.to_hex(fillcolor)
+            fillcolor = _get_hex_color("Blues", ratio)
         elif res < 0:
             # If there are more missing tokens than remaining tokens, use a red color map
             ratio = res / max_tokens_miss
             ratio = abs(ratio) * scale + (1 - scale) / 2
-            cmap = plt.cm.get_cmap("Reds")
-            fillcolor = cmap(ratio)
-            fillcolor = matplotlib.colors.to_hex(fillcolor)
+            fillcolor = _get_hex_color("Reds", ratio)
         return fillcolor
 
     @staticmethod
@@ -343,6 +514,8 @@ class Visualizer:
         graph : Digraph
             The graph to display.
         """
+        from IPython.display import Image, display
+
         display(Image(graph.render()))
 
     @staticmethod
@@ -359,3 +532,76 @@ class Visualizer:
         """
         graph.graph_attr.update({'bgcolor': 'transparent'})
         graph.render(filename=file_name, format='png', cleanup=True)
+
+    @staticmethod
+    def save_all(graphs: Iterable[Digraph], file_names: Iterable[str], max_workers: Optional[int] = None) -> List[str]:
+        """
+        Saves many graphs to PNG files. Each graph is laid out by its own Graphviz subprocess, and up to
+        max_workers of them run in parallel.
+
+        Parameters
+        ----------
+        graphs : Iterable[Digraph]
+            The graphs to save.
+        file_names : Iterable[str]
+            The names of the files to save the graphs to, one per graph.
+        max_workers : Optional[int], optional
+            The maximum number of parallel Graphviz processes, by default the default of ThreadPoolExecutor
+
+        Returns
+        -------
+        List[str]
+            The paths of the rendered files, in the order of the graphs.
+        """
+        graphs, file_names = list(graphs), list(file_names)
+        if len(graphs) != len(file_names):
+            raise ValueError("Number of graphs and file names must be equal")
+        if len(set(file_names)) != len(file_names):
+            raise ValueError("File names must be unique")
+
+        def render(graph: Digraph, file_name: str) -> str:
+            graph.graph_attr.update({'bgcolor': 'transparent'})
+            return graph.render(filename=file_name, format='png', cleanup=True)
+
+        # The threads only wait for their Graphviz subprocess, so the rendering runs in parallel
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(render, graphs, file_names))
+
+    def render_petri_nets(self, nets: Iterable[Tuple], file_names: Iterable[str],
+                          max_workers: Optional[int] = None) -> List[str]:
+        """
+        Builds many Petri nets and saves them to PNG files, see build_petri_net and save_all.
+
+        Parameters
+        ----------
+        nets : Iterable[Tuple]
+            (net, initial marking, final marking) or (net, initial marking, final marking, tokens) tuples.
+        file_names : Iterable[str]
+            The names of the files to save the Petri nets to, one per net.
+        max_workers : Optional[int], optional
+            The maximum number of parallel Graphviz processes, by default the default of ThreadPoolExecutor
+
+        Returns
+        -------
+        List[str]
+            The paths of the rendered files, in the order of the nets.
+        """
+        graphs = [self.build_petri_net(*net) for net in nets]
+        return self.save_all(graphs, file_names, max_workers)
+
+
+@lru_cache(maxsize=None)
+def _get_colormap(name: str):
+    import matplotlib
+
+    return matplotlib.colormaps[name]
+
+
+@lru_cache(maxsize=4096)
+def _get_hex_color(name: str, ratio: float) -> str:
+    """
+    Looks up a color of a matplotlib colormap as hex string, colormaps and colors are cached across renders.
+    """
+    import matplotlib
+
+    return matplotlib.colors.to_hex(_get_colormap(name)(ratio))
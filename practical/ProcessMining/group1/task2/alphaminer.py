@@ -1,10 +1,9 @@
 from itertools import combinations, pairwise
 import numpy as np
-import os
 import pandas as pd
-import pm4py
 from pm4py.objects.petri_net.obj import PetriNet, Marking
 from pm4py.objects.petri_net.utils.petri_utils import add_arc_from_to
+from practical.ProcessMining.group1.shared import utils
 from practical.ProcessMining.group1.shared.visualizer import Visualizer
 from typing import Dict, List, Tuple, Set
 
@@ -30,15 +29,17 @@ class AlphaMiner:
         maximal_pairs (np.ndarray): The maximized pair set as result of the alpha miner algorithm.
     """
 
-    def __init__(self, file_path: str, case_id='case_id', activity_key='activity', timestamp_key='timestamp'):
+    def __init__(self, file_path: str, case_id='case_id', activity_key='activity', timestamp_key='timestamp',
+                 cache_path: str = None):
         """
         Initializes the AlphaMiner class with a event log file.
 
         Parameters:
             file_path (str): The path to the event log file.
+            cache_path (str): Optional directory to cache the parsed event log in, see utils.load_event_log.
         """
-        self.event_log, self.activities, self.all_pairs = self._import_event_log(file_path, case_id,
-                                                                                 activity_key, timestamp_key)
+        self.event_log, self.activities, self.all_pairs = self._import_event_log(file_path, case_id, activity_key,
+                                                                                 timestamp_key, cache_path)
         self.traces = self._extract_traces(self.event_log)
 
         self.t_in, self.t_out = self._get_start_end_activities(self.traces)
@@ -125,38 +126,27 @@ class AlphaMiner:
 
         return matrix
 
-    def _import_event_log(self, file_path: str, case_id='case_id', activity_key='activity',
-                          timestamp_key='timestamp') -> Tuple[pd.DataFrame, Dict[int, str], List[Tuple[int, int]]]:
+    def _import_event_log(self, file_path: str, case_id='case_id', activity_key='activity', timestamp_key='timestamp',
+                          cache_path: str = None) -> Tuple[pd.DataFrame, Dict[int, str], List[Tuple[int, int]]]:
         """
         Imports the event log from a file.
 
         Parameters:
             file_path (str): The path to the event log file.
+            cache_path (str): Optional directory to cache the parsed event log in.
 
         Returns:
             Tuple[pd.DataFrame, Dict[int, str], List[Tuple[int, int]]]: The event log data,
             the mapping of activity IDs to activity names, and all pairs of activities.
         """
-        if not os.path.exists(file_path):
-            raise Exception("File does not exist")
-
-        extension = os.path.splitext(file_path)[1]
-        if extension == '.csv':
-            event_log = pd.read_csv(file_path, sep=';')
-            event_log = pm4py.format_dataframe(event_log, case_id=case_id, activity_key=activity_key,
-                                               timestamp_key=timestamp_key)
-        elif extension == '.xes':
-            event_log = pm4py.read_xes(file_path)
-        else:
-            raise Exception("File extension must be .csv or xes")
-
-        event_log = event_log.sort_values(['case:concept:name', 'time:timestamp'])
+        event_log = utils.load_event_log(file_path, case_id, activity_key, timestamp_key, categorical=True,
+                                         cache_path=cache_path)
         event_log = (event_log[["case:concept:name", "concept:name"]]
                      .rename(columns={"case:concept:name": "case_id", "concept:name": "activity"}))
         activities = self._create_alphabet(event_log)
         all_pairs = [(a1, a2) for a1 in activities.keys() for a2 in activities.keys()]
-        event_log['activity_id'] = event_log.apply(lambda row: dict(zip(activities.values(),
-                                                                        activities.keys())).get(row['activity']), 1)
+        # The categories are sorted like the alphabet, so their codes are the activity IDs
+        event_log['activity_id'] = event_log['activity'].cat.codes.astype(int)
         return event_log, activities, all_pairs
 
     def _create_alphabet(self, event_log: pd.DataFrame) -> Dict[int, str]:
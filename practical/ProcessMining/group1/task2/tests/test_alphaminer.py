@@ -1,5 +1,6 @@
 import copy
 import os
+import tempfile
 
 import numpy as np
 import pytest
@@ -20,9 +21,13 @@ FILE_PATH_TXT = str(DATA_DIR / 'simple_event_logs.txt')
 TEST_LOGS = utils.read_txt_test_logs(FILE_PATH_TXT)
 
 
+# The test cases are written at collection time, the directory is removed when the interpreter exits
+TEST_CASE_DIR = tempfile.TemporaryDirectory()
+
+
 def get_test_case(case: str):
     cleaned = utils.deduplicate_list(TEST_LOGS[case])
-    return utils.event_log_to_csv(cleaned)
+    return utils.event_log_to_csv(cleaned, TEST_CASE_DIR.name)
 
 
 @pytest.fixture
@@ -356,4 +361,3 @@ def test_transition_connections(alpha_miner):
         assert global_end.in_arcs, "Global end place has no incoming arcs."
         assert any(arc.source == transitions[activity_name] for arc in global_end.in_arcs), \
             f"Terminal activity {activity_name} is not correctly connected to end place."
-
@@ -0,0 +1,184 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class UnionFind:
+    """
+    Disjoint-set forest over the integers 0..n-1 with path halving and union by index.
+
+    Attributes:
+        parent: Parent of every element, roots are their own parent
+    """
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        """
+        Finds the root of the set containing i.
+
+        Parameters:
+            i: Element
+
+        Returns:
+            Root of the set.
+        """
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        """
+        Merges the sets containing i and j. The smaller root becomes the root of the merged set.
+
+        Parameters:
+            i: Element of the first set
+            j: Element of the second set
+        """
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    def union_pairs(self, pairs: Iterable[Tuple[int, int]]) -> None:
+        """
+        Merges the sets of all given pairs.
+
+        Parameters:
+            pairs: Pairs of elements
+        """
+        for i, j in pairs:
+            self.union(i, j)
+
+
+class CutEngine:
+    """
+    Dense boolean-matrix representation of a directly-follows graph (dfg) for the cut detection of the
+    Inductive Miner. The activities are indexed in sorted order, the adjacency and the transitive closure are
+    NumPy bool matrices. The closure is computed at most once, so all cuts on a sublog share it.
+
+    Attributes:
+        activities: Sorted activities of the dfg and the start and end activities
+        index: Mapping of activities to their matrix index
+        adjacency: adjacency[i, j] is True if activity j directly follows activity i
+        in_dfg: in_dfg[i] is True if activity i occurs in an edge of the dfg
+        start: start[i] is True if activity i is a start activity
+        end: end[i] is True if activity i is an end activity
+    """
+
+    def __init__(self, dfg: Dict[Tuple[str, str], int], start: Optional[Dict[str, int]] = None,
+                 end: Optional[Dict[str, int]] = None):
+        """
+        Initialize the engine for a dfg.
+
+        Parameters:
+            dfg: Directly-follows graph
+            start: Start activities in the log
+            end: End activities in the log
+        """
+        start, end = start or {}, end or {}
+        dfg_activities = {activity for edge in dfg.keys() for activity in edge}
+        self.activities = sorted(dfg_activities.union(start.keys()).union(end.keys()))
+        self.index = {activity: i for i, activity in enumerate(self.activities)}
+
+        n = len(self.activities)
+        self.adjacency = np.zeros((n, n), dtype=bool)
+        if dfg:
+            sources, targets = zip(*((self.index[a], self.index[b]) for a, b in dfg.keys()))
+            self.adjacency[list(sources), list(targets)] = True
+        self.in_dfg = self.mask(dfg_activities)
+        self.start = self.mask(start.keys())
+        self.end = self.mask(end.keys())
+        self._closure = None
+
+    def mask(self, activities: Iterable[str]) -> np.ndarray:
+        """
+        Converts activities to a boolean mask over the activity indices.
+
+        Parameters:
+            activities: Activities of the engine
+
+        Returns:
+            Boolean array that is True for the given activities.
+        """
+        mask = np.zeros(len(self.activities), dtype=bool)
+        mask[[self.index[activity] for activity in activities]] = True
+        return mask
+
+    def to_set(self, mask: np.ndarray) -> Set[str]:
+        """
+        Converts a boolean mask over the activity indices to a set of activities.
+
+        Parameters:
+            mask: Boolean array over the activity indices
+
+        Returns:
+            Set of activities.
+        """
+        return {self.activities[i] for i in np.flatnonzero(mask)}
+
+    @property
+    def closure(self) -> np.ndarray:
+        """
+        Transitive closure of the dfg, computed with Warshall's algorithm on the first access.
+        closure[i, j] is True if activity j is reachable from activity i by at least one edge.
+        """
+        if self._closure is None:
+            closure = self.adjacency.copy()
+            for k in range(len(self.activities)):
+                # Everything that reaches k reaches everything k reaches
+                closure |= np.outer(closure[:, k], closure[k])
+            self._closure = closure
+        return self._closure
+
+    def component_ids(self, related: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Merges activities that are related with union-find and labels every activity with its group.
+
+        Parameters:
+            related: Symmetric boolean matrix, related[i, j] is True if i and j belong to the same group
+            mask: Optional boolean array of the activities to group. Default are all activities.
+
+        Returns:
+            Array with the smallest index of the group of every activity, -1 for activities outside the mask.
+        """
+        nodes = np.arange(len(self.activities)) if mask is None else np.flatnonzero(mask)
+        union_find = UnionFind(len(self.activities))
+        sub_related = related[np.ix_(nodes, nodes)]
+        rows, columns = np.nonzero(np.triu(sub_related, 1))
+        union_find.union_pairs(zip(nodes[rows].tolist(), nodes[columns].tolist()))
+
+        component = np.full(len(self.activities), -1, dtype=int)
+        component[nodes] = [union_find.find(i) for i in nodes.tolist()]
+        return component
+
+    def groups(self, related: np.ndarray, mask: Optional[np.ndarray] = None) -> List[Set[str]]:
+        """
+        Merges activities that are related with union-find.
+
+        Parameters:
+            related: Symmetric boolean matrix, related[i, j] is True if i and j belong to the same group
+            mask: Optional boolean array of the activities to group. Default are all activities.
+
+        Returns:
+            List of groups of activities, ordered by their first activity.
+        """
+        groups = {}
+        for i, root in enumerate(self.component_ids(related, mask).tolist()):
+            if root >= 0:
+                groups.setdefault(root, set()).add(self.activities[i])
+        return list(groups.values())
+
+    def connected_components(self, mask: Optional[np.ndarray] = None) -> List[Set[str]]:
+        """
+        Finds the weakly connected components of the dfg.
+
+        Parameters:
+            mask: Optional boolean array of the activities to keep, edges to other activities are ignored.
+
+        Returns:
+            List of components, ordered by their first activity.
+        """
+        return self.groups(self.adjacency | self.adjacency.T, mask)
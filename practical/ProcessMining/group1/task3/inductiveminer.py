@@ -1,19 +1,14 @@
 import logging
-import os
 import re
+import time
 from collections import defaultdict
 from enum import Enum
-from typing import List, Tuple, Dict, Set, Optional, Union
-import graphviz
-import networkx as nx
-import pandas as pd
-from IPython.display import Image, display
-import pm4py
-from pm4py.objects.conversion.log import converter as log_converter
-from pm4py.visualization.petri_net import visualizer as pn_vis
-from pm4py.algo.discovery.inductive import algorithm as inductive_miner
-from pm4py.objects.conversion.process_tree import converter as pt_to_petri_converter
-from practical.ProcessMining.group1.shared.visualizer import Visualizer
+from typing import TYPE_CHECKING, Any, Callable, List, Tuple, Dict, Set, Optional, Union
+import numpy as np
+from practical.ProcessMining.group1.task3.cut_engine import CutEngine
+
+if TYPE_CHECKING:  # pandas, pm4py and the visualizer are only imported where they are used
+    from pm4py.objects.petri_net.obj import PetriNet, Marking
 
 logging.basicConfig(level="INFO")  # Change to DEBUG for prints
 
@@ -41,23 +36,33 @@ class InductiveMiner:
         start_activities: Start activities in the log
         end_activities: End activities in the log
         process_tree_str: String representation of the process tree
+        instrumentation: Optional hook that is called with the statistics of every cut detection step
     """
     TAU = '𝜏'
 
-    def __init__(self, event_log: Optional[Union[List[Tuple[str]], str]] = None):
+    def __init__(self, event_log: Optional[Union[List[Tuple[str]], str]] = None,
+                 instrumentation: Optional[Callable[[Dict[str, Any]], None]] = None, cache_path: Optional[str] = None):
         """
         Initialize the Inductive Miner with an event log.
 
         Parameters:
-            event_log: List of traces
+            event_log: List of traces or path to an event log file
+            instrumentation: Optional hook that is called once per recursion step in which cuts are detected,
+                e.g. `list.append` to collect the statistics. It receives a dictionary with the size of the
+                sublog ('sublog_size'), its number of activities ('alphabet_size'), whether the filtered graphs
+                of the infrequent variant were used ('filtered') and the cuts tried in priority order with
+                the seconds spent on each ('cuts', list of (CutType, float) tuples).
+            cache_path: Optional directory to cache the parsed event log file in, see utils.load_event_log
         """
         if isinstance(event_log, str):
-            self.event_log = self._import_event_log(event_log)
+            self.event_log = self._import_event_log(event_log, cache_path=cache_path)
         else:
             self.event_log = event_log
         self.alphabet = self._get_alphabet(self.event_log)
         self.dfg, self.start_activities, self.end_activities = self._get_dfg(self.event_log)
         self.process_tree_str = '()'  # start with an empty process tree
+        self._cut_engines = {}
+        self.instrumentation = instrumentation
         self.net, self.initial_marking, self.final_marking = None, None, None
 
     def __str__(self):
@@ -97,6 +102,7 @@ class InductiveMiner:
         """
         # Update the directly-follows graph (dfg), start_activities, and end_activities for the current sublog
         dfg, start_activities, end_activities = self._get_dfg(log)
+        self._cut_engines = {}  # all cuts of this sublog share one engine (and closure) per graph
         groups, new_sublogs = [], []
         operation_found = True
 
@@ -119,34 +125,23 @@ class InductiveMiner:
         return operation_found, groups, new_sublogs
 
     def _import_event_log(self, file_path: str, case_id='case_id', activity_key='activity',
-                          timestamp_key='timestamp') -> List[Tuple[str]]:
+                          timestamp_key='timestamp', cache_path: Optional[str] = None) -> List[Tuple[str]]:
         """
         Imports the event log from a file.
 
         Parameters:
             file_path (str): The path to the event log file.
+            cache_path (str): Optional directory to cache the parsed event log in.
 
         Returns:
             Tuple[pd.DataFrame, Dict[int, str], List[Tuple[int, int]]]: The event log data,
             the mapping of activity IDs to activity names, and all pairs of activities.
         """
-        # Check if the file exists
-        if not os.path.exists(file_path):
-            raise Exception("File does not exist")
-
-        # Differentiate between CSV and XES files
-        extension = os.path.splitext(file_path)[1]
-        if extension == '.csv':
-            event_log = pd.read_csv(file_path, sep=';')
-            event_log = pm4py.format_dataframe(event_log, case_id=case_id, activity_key=activity_key,
-                                               timestamp_key=timestamp_key)
-        elif extension == '.xes':
-            event_log = pm4py.read_xes(file_path)
-        else:
-            raise Exception("File extension must be .csv or xes")
+        from practical.ProcessMining.group1.shared import utils
 
-        # Sort the event log by case ID and timestamp
-        event_log = event_log.sort_values(['case:concept:name', 'time:timestamp'])
+        # Read the event log sorted by case ID and timestamp
+        event_log = utils.load_event_log(file_path, case_id, activity_key, timestamp_key, categorical=True,
+                                         cache_path=cache_path)
         # Group the event log by case ID and extract the activities as tuples
         event_log = event_log.groupby('case:concept:name')['concept:name'].apply(tuple).reset_index()
         event_log = event_log['concept:name'].tolist()
@@ -188,17 +183,25 @@ class InductiveMiner:
         """
         return {activity for trace in log for activity in trace}
 
-    def _get_alphabet_from_dfg(self, dfg: Dict[Tuple[str, str], int]) -> Set[str]:
+    def _get_cut_engine(self, dfg: Dict[Tuple[str, str], int], start: Dict[str, int],
+                        end: Dict[str, int]) -> CutEngine:
         """
-        Extracts the unique activities from the directly-follows graph.
+        Returns the cut engine of a graph, so that all cuts on the same graph share its matrices and
+        transitive closure. The engines are cached until the next recursion step.
 
         Parameters:
             dfg: Directly-follows graph
+            start: Start activities in the log
+            end: End activities in the log
 
         Returns:
-            Set of unique activities in the dfg.
+            Cut engine of the graph.
         """
-        return {activity for edge in dfg.keys() for activity in edge}
+        # The cache holds references to the graphs, so their ids cannot be reused while cached
+        key = (id(dfg), id(start), id(end))
+        if key not in self._cut_engines:
+            self._cut_engines[key] = (dfg, start, end, CutEngine(dfg, start, end))
+        return self._cut_engines[key][-1]
 
     def _is_nontrivial(self, max_groups: Optional[List[Set[str]]]) -> bool:
         """
@@ -277,35 +280,55 @@ class InductiveMiner:
         Returns:
             List of new sublogs resulting from the split. Empty list if no operator could be applied.
         """
-        # Try to apply different types of cuts to the current sublog
-        xor_cut = self._xor_cut(dfg, start_activities, end_activities)
-        sequence_cut = self._sequence_cut(dfg, start_activities, end_activities)
-        parallel_cut = self._parallel_cut(dfg, start_activities, end_activities)
-        loop_cut = self._loop_cut(dfg, start_activities, end_activities)
-
-        # Debug prints to check the cuts
-        logging.debug(f"XOR Cut: {xor_cut}")
-        logging.debug(f"Sequence Cut: {sequence_cut}")
-        logging.debug(f"Parallel Cut: {parallel_cut}")
-        logging.debug(f"Loop Cut: {loop_cut}")
-
-        # If a nontrivial cut (>1) is found, return the partition and the corresponding operator
-        if self._is_nontrivial(xor_cut):
-            logging.debug("Applying XOR Cut")
-            return xor_cut, CutType.XOR
-        elif self._is_nontrivial(sequence_cut):
-            logging.debug("Applying Sequence Cut")
-            return sequence_cut, CutType.SEQUENCE
-        elif self._is_nontrivial(parallel_cut):
-            logging.debug("Applying Parallel Cut")
-            return parallel_cut, CutType.PARALLEL
-        elif self._is_nontrivial(loop_cut):
-            logging.debug("Applying Loop Cut")
-            return loop_cut, CutType.LOOP
-        else:  # If no nontrivial cut is found, apply the fall-through case (flower model)
+        # Try to apply the different types of cuts to the current sublog in priority order
+        cuts = [
+            (CutType.XOR, lambda: self._xor_cut(dfg, start_activities, end_activities)),
+            (CutType.SEQUENCE, lambda: self._sequence_cut(dfg, start_activities, end_activities)),
+            (CutType.PARALLEL, lambda: self._parallel_cut(dfg, start_activities, end_activities)),
+            (CutType.LOOP, lambda: self._loop_cut(dfg, start_activities, end_activities)),
+        ]
+        return self._find_first_cut(log, cuts)
+
+    def _find_first_cut(self, log: List[Tuple[str]], cuts: List[Tuple[CutType, Callable[[], List[Set[str]]]]],
+                        filtered: bool = False) -> Tuple[List[Set[str]], CutType]:
+        """
+        Evaluates the cuts lazily in the given order and stops at the first nontrivial one. If an instrumentation
+        hook is set, it is called with the statistics of this step.
+
+        Parameters:
+            log: List of traces
+            cuts: Pairs of cut type and a function computing the corresponding cut
+            filtered: Whether the cuts are computed on the filtered graphs of the infrequent variant
+
+        Returns:
+            Partition and operator of the first nontrivial cut, or the flower model and CutType.NONE if there is none.
+        """
+        tried = []
+        result = None
+        for cut_type, compute_cut in cuts:
+            start_time = time.perf_counter()
+            groups = compute_cut()
+            tried.append((cut_type, time.perf_counter() - start_time))
+            logging.debug(f"{cut_type.name} Cut: {groups}")
+
+            # If a nontrivial cut (>1) is found, return the partition and the corresponding operator
+            if self._is_nontrivial(groups):
+                logging.debug(f"Applying {cut_type.name} Cut")
+                result = groups, cut_type
+                break
+
+        if self.instrumentation is not None:
+            self.instrumentation({
+                'sublog_size': len(log),
+                'alphabet_size': len(self._get_alphabet(log)),
+                'filtered': filtered,
+                'cuts': tried,
+            })
+
+        if result is None:  # If no nontrivial cut is found, apply the fall-through case (flower model)
             logging.debug("Applying Fall-Through Case")
-            flower_groups = self._handle_fall_through(log)
-            return flower_groups, CutType.NONE
+            result = self._handle_fall_through(log), CutType.NONE
+        return result
 
     def _build_process_tree(self, groups: List[Set[str]], cut_type: Optional[CutType] = None) -> str:
         """
@@ -367,50 +390,22 @@ class InductiveMiner:
         Returns:
             List of groups of activities that form the sequence cut.
         """
-        # Create a group per activity
-        alphabet = self._get_alphabet_from_dfg(dfg)
-        groups = [{activity} for activity in alphabet]
-
-        # Initialize directed graph
-        directed_graph = nx.DiGraph()
-        directed_graph.add_edges_from(dfg)
-
-        # Compute transitive predecessors and successors
-        transitive_successors = {node: set(nx.descendants(directed_graph, node)) for node in directed_graph.nodes}
-        transitive_predecessors = {node: set(nx.ancestors(directed_graph, node)) for node in directed_graph.nodes}
-
-        # Function to merge groups based on transitive relations
-        def merge_groups(groups, transitive_relations):
-            merged = True
-            while merged:
-                merged = False
-                for i in range(len(groups)):
-                    for j in range(i + 1, len(groups)):
-                        if has_transitive_relation(groups[i], groups[j], transitive_relations):
-                            groups[i] = groups[i].union(groups[j])
-                            groups.pop(j)
-                            merged = True
-                            break
-                    if merged:
-                        break
-            return groups
-
-        # Function to check if two groups should be merged
-        def has_transitive_relation(group_a, group_b, transitive_relations):
-            return any(
-                (b in transitive_relations[a] and a in transitive_relations[b]) or
-                (b not in transitive_relations[a] and a not in transitive_relations[b])
-                for a in group_a for b in group_b
-            )
-
-        # Merge pairwise reachable nodes (based on transitive relations)
-        groups = merge_groups(groups, transitive_successors)
-        # Merge pairwise unreachable nodes (based on transitive relations)
-        groups = merge_groups(groups, transitive_predecessors)
+        engine = self._get_cut_engine(dfg, start, end)
+        closure = engine.closure
+
+        # Merge activities that are pairwise reachable or pairwise unreachable (based on transitive relations)
+        related = (closure & closure.T) | (~closure & ~closure.T)
+        groups = engine.groups(related, engine.in_dfg)
+
+        # Count the transitive predecessors and successors of every activity (without the activity itself)
+        reflexive = closure.diagonal()
+        transitive_predecessors = closure.sum(axis=0) - reflexive
+        transitive_successors = closure.sum(axis=1) - reflexive
+        alphabet_size = int(engine.in_dfg.sum())
 
         # Sort the groups based on their reachability
-        groups.sort(key=lambda g: len(transitive_predecessors[next(iter(g))]) + (
-                len(alphabet) - len(transitive_successors[next(iter(g))])))
+        groups.sort(key=lambda g: transitive_predecessors[engine.index[min(g)]] + (
+                alphabet_size - transitive_successors[engine.index[min(g)]]))
 
         return groups
 
@@ -426,13 +421,8 @@ class InductiveMiner:
         Returns:
             List of groups of activities that form the XOR cut.
         """
-        # Convert DFG to an undirected networkx graph
-        undirected_graph = nx.Graph()
-        undirected_graph.add_nodes_from(self._get_alphabet_from_dfg(dfg).union(start.keys()).union(end.keys()))
-        undirected_graph.add_edges_from(dfg.keys())
-
-        # Detect connected components in the graph
-        components = list(nx.connected_components(undirected_graph))
+        # Detect connected components in the dfg, including start and end activities without edges
+        components = self._get_cut_engine(dfg, start, end).connected_components()
         # Replace empty component with the TAU activity
         groups = [component if component != {''} else set(self.TAU) for component in components]
 
@@ -451,34 +441,15 @@ class InductiveMiner:
         Returns:
             List of groups of activities that form the parallel cut.
         """
-        # Extract edges from the dfg
-        edges = set(dfg.keys())
-        start_activities = set(start.keys())
-        end_activities = set(end.keys())
-
-        # Initialize groups with individual activities
-        all_activities = {activity for edge in edges for activity in edge}
-        groups = [{activity} for activity in all_activities]
-
-        # Determine if two groups are not connected by edges
-        def should_merge(group_a, group_b):
-            return any((a, b) not in edges or (b, a) not in edges for a in group_a for b in group_b)
-
-        merged = True
-        while merged:
-            merged = False
-            for i in range(len(groups)):
-                for j in range(i + 1, len(groups)):
-                    if should_merge(groups[i], groups[j]):
-                        groups[i] = groups[i].union(groups[j])
-                        groups.pop(j)
-                        merged = True
-                        break
-                if merged:
-                    break
+        engine = self._get_cut_engine(dfg, start, end)
+
+        # Merge activities that are not connected in both directions, i.e. take the connected components
+        # of the complement of the bidirectional-edge graph
+        bidirectional = engine.adjacency & engine.adjacency.T
+        groups = engine.groups(~bidirectional, engine.in_dfg)
 
         # Filter out groups that do not contain start and end activities
-        groups = [group for group in groups if group & start_activities and group & end_activities]
+        groups = [group for group in groups if group & start.keys() and group & end.keys()]
 
         return groups
 
@@ -494,70 +465,37 @@ class InductiveMiner:
         Returns:
             List of groups of activities that form the loop cut.
         """
-        # Extract edges and activities
-        edges = list(dfg.keys())
-        start_activities = set(start.keys())
-        end_activities = set(end.keys())
+        engine = self._get_cut_engine(dfg, start, end)
+        adjacency = engine.adjacency
 
         # Merge start and end activities into the first group (do-group)
-        do_group = start_activities.union(end_activities)
-
-        # Extract inner edges (excluding start and end activities)
-        inner_edges = [edge for edge in edges if edge[0] not in do_group and edge[1] not in do_group]
-
-        # Add connected components as loop groups
-        graph = nx.Graph()
-        graph.add_edges_from(inner_edges)
-        connected_components = list(nx.connected_components(graph))
-        loop_groups = connected_components if len(connected_components) > 0 else []
-
-        # Add remaining activities to their own groups
-        alphabet = self._get_alphabet_from_dfg(dfg)
-        loop_groups += [{a} for a in alphabet if not any(a in group for group in loop_groups + [do_group])]
-
-        pure_start_activities = start_activities.difference(end_activities)  # only start, not end activity
-        # Put all activities in the do-group that follow a start activity which is not an end activity
-        # (a loop activity can only follow a start activity if it is also an end activity)
-        for a in pure_start_activities:
-            for (x, b) in edges:
-                if x == a:
-                    # Find the group that contains the activity
-                    merge_group = set()
-                    for group in loop_groups:
-                        merge_group = group if b in group else merge_group
-                    # Remove the group from the loop groups and add it to the do group
-                    loop_groups = [group for group in loop_groups if group != merge_group]
-                    do_group = do_group.union(merge_group)
-
-        pure_end_activities = end_activities.difference(start_activities)  # only end, not start activity
-        # Put all activities in the do-group that precede an end activity which is not a start activity
-        # (a loop activity can only precede an end activity if it is also a start activity)
-        for b in pure_end_activities:
-            for (a, x) in edges:
-                if x == b:
-                    # Find the group that contains the activity
-                    merge_group = set()
-                    for group in loop_groups:
-                        merge_group = group if b in group else merge_group
-                    # Remove the group from the loop groups and add it to the do group
-                    loop_groups = [group for group in loop_groups if group != merge_group]
-                    do_group = do_group.union(merge_group)
-
-        # Ensure all loop activities can reach start activities
-        i = 1
-        while i < len(loop_groups):
-            if any((a, b) not in edges for a in loop_groups[i] for b in start_activities):
-                do_group.update(loop_groups.pop(i))
-            else:
-                i += 1
-
-        # Ensure all loop activities can be reached from end activities
-        i = 1
-        while i < len(loop_groups):
-            if any((b, a) not in edges for a in loop_groups[i] for b in end_activities):
-                do_group.update(loop_groups.pop(i))
-            else:
-                i += 1
+        do_mask = engine.start | engine.end
+        loop_mask = engine.in_dfg & ~do_mask
+
+        # Label the loop activities with their connected component over the inner edges (excluding start and
+        # end activities), activities without inner edges form their own group
+        component = engine.component_ids(adjacency | adjacency.T, loop_mask)
+
+        absorbed = np.zeros(len(engine.activities), dtype=bool)
+        # Put all groups in the do-group that follow a start activity which is not an end activity
+        # (a loop group can only follow a start activity if it is also an end activity)
+        pure_start = engine.start & ~engine.end
+        absorbed[component[adjacency[pure_start].any(axis=0) & loop_mask]] = True
+        # Put all groups in the do-group that precede an end activity which is not a start activity
+        # (a loop group can only precede an end activity if it is also a start activity)
+        pure_end = engine.end & ~engine.start
+        absorbed[component[adjacency[:, pure_end].any(axis=1) & loop_mask]] = True
+
+        # A loop activity that follows an end activity has to follow all end activities, and one that precedes a
+        # start activity has to precede all start activities. Groups with other activities join the do-group.
+        from_end, to_start = adjacency[engine.end], adjacency[:, engine.start]
+        valid = (~from_end.any(axis=0) | from_end.all(axis=0)) & (~to_start.any(axis=1) | to_start.all(axis=1))
+        absorbed[component[loop_mask & ~valid]] = True
+
+        # Collect the groups, the do-group first and the loop groups ordered by their first activity
+        do_group = engine.to_set(do_mask | (loop_mask & absorbed[component]))
+        loop_groups = [engine.to_set(component == root) for root in np.unique(component[loop_mask])
+                       if not absorbed[root]]
 
         # Return the cut if more than one group (i.e., do- and loop-group found)
         groups = [do_group, *loop_groups]
@@ -599,25 +537,20 @@ class InductiveMiner:
         Returns:
             List of sublogs resulting from the parallel split.
         """
-        # Initialize a dictionary to store the sublogs
-        sublogs_dict = {}
+        # Map each activity to the index of its group and preallocate one sublog per group
+        group_index = {activity: i for i, group in enumerate(cut) for activity in group}
+        sublogs = [[] for _ in cut]
 
-        # Iterate over each trace in the log
+        # Project each trace onto the groups in a single pass
         for trace in log:
-            # Iterate over each group in the cut
-            for i, group in enumerate(cut):
-                # Iterate over each activity in the trace
-                subtrace = [activity for activity in trace if activity in group]
-
+            subtraces = [[] for _ in cut]
+            for activity in trace:
+                i = group_index.get(activity)
+                if i is not None:
+                    subtraces[i].append(activity)
+            for sublog, subtrace in zip(sublogs, subtraces):
                 # If no activities were added to the subtrace, add an empty trace
-                if not subtrace:
-                    subtrace = ['']
-
-                # Add the subtrace to the corresponding group in the sublogs dictionary
-                sublogs_dict[str(group)] = sublogs_dict.get(str(group), []) + [tuple(subtrace)]
-
-        # Convert the sublogs dictionary to a list of sublogs
-        sublogs = [log for log in sublogs_dict.values()]
+                sublog.append(tuple(subtrace) if subtrace else ('',))
 
         return sublogs
 
@@ -630,51 +563,24 @@ class InductiveMiner:
             cut: List of groups of activities that form the cut
 
         Returns:
-            List of sublogs resulting from the loop split.
-        """
-        new_log = []
-
-        # Iterate over each group in the cut
-        for group in cut:
-            sublog = []
-            # Iterate over each trace in the log
-            for trace in log:
-                trace_list = list(trace)  # Convert the trace tuple to a list for manipulation
-                # Continuously find and remove subtraces that match the current group
-                while True:
-                    subtrace = self._find_subsequence_in_arbitrary_order(trace_list, list(group))
-                    if not subtrace:
-                        break
-                    sublog.append(tuple(subtrace))  # Add the found subsequence to the sublog
-                    # Remove the elements of the found subsequence from the trace_list
-                    for item in subtrace:
-                        trace_list.remove(item)
-            if sublog:
-                new_log.append(sublog)
-
-        return new_log
-
-    def _find_subsequence_in_arbitrary_order(self, main: List[str], sub: List[str]) -> List[str]:
-        """
-        Finds a subsequence in the main list that contains the same elements as the sub list,
-        regardless of their order.
-
-        Parameters:
-            main: The main list in which to find the subsequence.
-            sub: The sub list whose elements should be found in the main list.
-
-        Returns:
-            The found subsequence in the main list. If no such subsequence is found, returns an empty list.
+            List of sublogs resulting from the loop split. Each trace contributes its maximal subtraces of
+            activities of the same group.
         """
-        sub_len = len(sub)
-        sorted_sub = sorted(sub)  # Sort the sub list for comparison
+        # Map each activity to the index of its group and preallocate one sublog per group
+        group_index = {activity: i for i, group in enumerate(cut) for activity in group}
+        sublogs = [[] for _ in cut]
 
-        # Slide a window over the main list to find a matching subsequence
-        for i in range(len(main) - sub_len + 1):
-            window = main[i:i + sub_len]
-            if sorted(window) == sorted_sub:  # Check if the sorted window matches the sorted sub list
-                return window
-        return []
+        # Split each trace in a single pass into maximal subtraces of activities of the same group
+        for trace in log:
+            start = 0
+            for end in range(1, len(trace) + 1):
+                if end == len(trace) or group_index.get(trace[end]) != group_index.get(trace[start]):
+                    i = group_index.get(trace[start])
+                    if i is not None:
+                        sublogs[i].append(tuple(trace[start:end]))
+                    start = end
+
+        return [sublog for sublog in sublogs if sublog]
 
     def _find_substring_in_arbitrary_order(self, main: str, sub: str) -> str:
         """
@@ -703,6 +609,43 @@ class InductiveMiner:
         # If no matching subsequence is found, return an empty string
         return ''
 
+    @staticmethod
+    def _parse_process_tree(tree_str: str) -> Union[str, Tuple[str, List, str]]:
+        """
+        Parses the process tree string into a nested structure.
+
+        Parameters:
+            tree_str: The process tree string.
+
+        Returns:
+            A nested structure representing the process tree. Inner nodes are (operator, children, node id)
+            tuples, leaves are activities.
+        """
+        stack = []
+        node_counter = 0
+
+        # Use regex to find tokens: sequences of characters, parentheses, and commas
+        tokens = re.findall(r'→|↺|∧|×|\(|\)|,|[^,()\s][^,()]*', tree_str)
+
+        for token in tokens:
+            if token == '(':
+                stack.append(token)  # Add opening bracket to the stack
+            elif token == ')':
+                children = []
+                while stack and stack[-1] != '(':
+                    children.append(stack.pop())  # Collect all children until an opening bracket is found
+                stack.pop()  # Remove the opening bracket
+                operator = stack.pop()  # Get the operator
+                node_id = f'node{node_counter}'  # Generate a unique node ID
+                node_counter += 1
+                stack.append((operator.strip(), children[::-1], node_id))  # Append the parsed subtree
+            elif token == ',':
+                continue  # Skip commas
+            else:
+                stack.append(token)  # Add activity or operator to the stack
+
+        return stack[0] if stack else None  # Return the root of the parsed tree
+
     def visualize_process_tree(self):
         """
         Visualizes the process tree as a PNG image.
@@ -713,77 +656,118 @@ class InductiveMiner:
         Returns:
             Image: The PNG image of the process tree.
         """
-        def parse_tree(tree_str):
-            """
-            Parses the process tree string into a nested structure.
-
-            Parameters:
-                tree_str (str): The process tree string.
-
-            Returns:
-                tuple: A nested structure representing the process tree.
-            """
-            stack = []
-            node_counter = 0
-
-            # Use regex to find tokens: sequences of characters, parentheses, and commas
-            tokens = re.findall(r'→|↺|∧|×|\(|\)|,|[^,()\s][^,()]*', tree_str)
-
-            for token in tokens:
-                if token == '(':
-                    stack.append(token)  # Add opening bracket to the stack
-                elif token == ')':
-                    children = []
-                    while stack and stack[-1] != '(':
-                        children.append(stack.pop())  # Collect all children until an opening bracket is found
-                    stack.pop()  # Remove the opening bracket
-                    operator = stack.pop()  # Get the operator
-                    node_id = f'node{node_counter}'  # Generate a unique node ID
-                    node_counter += 1
-                    stack.append((operator.strip(), children[::-1], node_id))  # Append the parsed subtree
-                elif token == ',':
-                    continue  # Skip commas
-                else:
-                    stack.append(token)  # Add activity or operator to the stack
-
-            return stack[0] if stack else None  # Return the root of the parsed tree
-
         # Parse the process tree string into a nested structure
-        tree = parse_tree(self.process_tree_str)
+        tree = self._parse_process_tree(self.process_tree_str)
         # print(f"Parsed tree: {tree}")  # show the parsed tree if needed
 
+        from practical.ProcessMining.group1.shared.visualizer import Visualizer
+
         # Create a new Graphviz graph
         visualizer = Visualizer()
         graph = visualizer.build_process_tree(tree)
 
         return graph
 
-    def build_and_visualize_petrinet(self):
+    def _build_petri_net(self, tree: Union[str, Tuple[str, List, str]]) -> Tuple['PetriNet', 'Marking', 'Marking']:
         """
-        Builds and visualizes the Petri net from the event log using PM4Py.
+        Converts a parsed process tree into a workflow net. Every leaf becomes one transition (silent for
+        TAU) and neighbouring subtrees share their connecting places.
+
+        Parameters:
+            tree: The parsed process tree, see _parse_process_tree.
 
-        Uses the inductive miner algorithm to discover the Petri net.
+        Returns:
+            The Petri net with its initial and final marking.
+        """
+        from pm4py.objects.petri_net.obj import PetriNet, Marking
+        from pm4py.objects.petri_net.utils.petri_utils import add_arc_from_to
+
+        net = PetriNet("Inductive Miner Petri Net")
+        counter = {'place': 0, 'tau': 0}
+
+        def new_place(name: Optional[str] = None) -> PetriNet.Place:
+            if name is None:
+                counter['place'] += 1
+                name = f'p_{counter["place"]}'
+            place = PetriNet.Place(name)
+            net.places.add(place)
+            return place
+
+        def new_transition(label: Optional[str]) -> PetriNet.Transition:
+            if label is None:
+                counter['tau'] += 1
+                transition = PetriNet.Transition(f'tau_{counter["tau"]}', label=None)
+            else:
+                transition = PetriNet.Transition(label, label=label)
+            net.transitions.add(transition)
+            return transition
+
+        def connect(transition: PetriNet.Transition, source: PetriNet.Place, sink: PetriNet.Place) -> None:
+            add_arc_from_to(source, transition, net)
+            add_arc_from_to(transition, sink, net)
+
+        # Convert the tree top-down with an explicit stack of (subtree, source place, sink place)
+        source, sink = new_place('source'), new_place('sink')
+        stack = [(tree, source, sink)]
+        while stack:
+            node, node_source, node_sink = stack.pop()
+            if not isinstance(node, tuple):  # Leaf: one transition between the places
+                connect(new_transition(None if node == self.TAU else node), node_source, node_sink)
+                continue
+
+            operator, children, _ = node
+            if operator == CutType.SEQUENCE.value:
+                # Chain the children over intermediate places
+                places = [node_source] + [new_place() for _ in children[1:]] + [node_sink]
+                stack.extend((child, places[i], places[i + 1]) for i, child in enumerate(children))
+            elif operator == CutType.XOR.value:
+                # All children share the source and sink place
+                stack.extend((child, node_source, node_sink) for child in children)
+            elif operator == CutType.PARALLEL.value:
+                # Silent split and join transitions around one pair of places per child
+                split, join = new_transition(None), new_transition(None)
+                add_arc_from_to(node_source, split, net)
+                add_arc_from_to(join, node_sink, net)
+                for child in children:
+                    child_source, child_sink = new_place(), new_place()
+                    add_arc_from_to(split, child_source, net)
+                    add_arc_from_to(child_sink, join, net)
+                    stack.append((child, child_source, child_sink))
+            elif operator == CutType.LOOP.value:
+                # The do-part leads from the loop entry to its exit, every redo-part back to the entry
+                loop_start, loop_end = new_place(), new_place()
+                connect(new_transition(None), node_source, loop_start)
+                connect(new_transition(None), loop_end, node_sink)
+                stack.append((children[0], loop_start, loop_end))
+                stack.extend((child, loop_end, loop_start) for child in children[1:])
+            else:  # Groups without operator are treated as a choice
+                stack.extend((child, node_source, node_sink) for child in children)
+
+        initial_marking, final_marking = Marking(), Marking()
+        initial_marking[source] = 1
+        final_marking[sink] = 1
+        return net, initial_marking, final_marking
+
+    def build_and_visualize_petrinet(self):
+        """
+        Builds and visualizes the Petri net of the discovered process tree. The tree is discovered first if the
+        miner has not been run yet.
         """
         if self.net is None or self.initial_marking is None or self.final_marking is None:
-            # Convert the event log to PM4Py event log format
-            data = [{'case:concept:name': idx, 'concept:name': activity, 'time:timestamp': idx}
-                    for idx, trace in enumerate(self.event_log)
-                    for activity in trace]
-            df = pd.DataFrame(data)
-            event_log = log_converter.apply(df)  # Convert the DataFrame to an event log
-
-            # Discover ProcessTree using inductive miner algorithm
-            process_tree = inductive_miner.apply(event_log)
+            if self.process_tree_str == '()':
+                self.run()
+            # Convert the process tree to a Petri net
+            tree = self._parse_process_tree(self.process_tree_str)
+            self.net, self.initial_marking, self.final_marking = self._build_petri_net(tree)
 
-            # Convert ProcessTree to PetriNet
-            self.net, self.initial_marking, self.final_marking = pt_to_petri_converter.apply(process_tree)
+        from practical.ProcessMining.group1.shared.visualizer import Visualizer
 
         # Visualize the Petri net
         visualizer = Visualizer()
         graph = visualizer.build_petri_net(self.net, self.initial_marking, self.final_marking)
         return graph
 
-    def get_petrinet(self) -> Tuple[nx.DiGraph, Dict[str, int], Dict[str, int]]:
+    def get_petrinet(self) -> Tuple['PetriNet', 'Marking', 'Marking']:
         """
         Returns the Petri net and initial/final markings.
         """
@@ -1,7 +1,7 @@
 import copy
 from collections import defaultdict
 from itertools import combinations, chain
-from typing import Optional, List, Tuple, Dict, Set, Union
+from typing import Any, Callable, Optional, List, Tuple, Dict, Set, Union
 
 from practical.ProcessMining.group1.task3.inductiveminer import InductiveMiner, CutType
 from practical.ProcessMining.group1.shared.utils import deduplicate_list
@@ -15,8 +15,9 @@ class InductiveMinerInfrequent(InductiveMiner):
     Attributes (which are not inherited):
         threshold: coefficient used to define infrequency. (1 - threshold) * 100 => outliers
     """
-    def __init__(self, event_log: Optional[Union[List[Tuple[str]], str]] = None, threshold: float = 0.0):
-        super().__init__(event_log=event_log)
+    def __init__(self, event_log: Optional[Union[List[Tuple[str]], str]] = None, threshold: float = 0.0,
+                 instrumentation: Optional[Callable[[Dict[str, Any]], None]] = None, cache_path: Optional[str] = None):
+        super().__init__(event_log=event_log, instrumentation=instrumentation, cache_path=cache_path)
         self.threshold = threshold
 
     def run(self) -> None:
@@ -51,6 +52,7 @@ class InductiveMinerInfrequent(InductiveMiner):
 
         # Update the directly-follows graph (dfg), start_activities, and end_activities for the current sublog
         dfg, start_activities, end_activities = self._get_dfg(log)
+        self._cut_engines = {}
         new_sublogs = []
 
         base_cut, operator = self._handle_base_cases_filtered(log)
@@ -83,26 +85,17 @@ class InductiveMinerInfrequent(InductiveMiner):
             Tuple of groups and operator
         """
         dfg_filtered = self.get_frequent_directly_follows_graph(dfg)
-        efg_filtered = self.get_frequent_eventually_follows_graph(log)
-
-        # Try to apply different types of cuts to the current sublog
-        xor_cut = self._xor_cut(dfg_filtered, start_activities, end_activities)
-        sequence_cut = self._sequence_cut(efg_filtered, start_activities, end_activities)
-        parallel_cut = self._parallel_cut(dfg_filtered, start_activities, end_activities)
-        loop_cut = self._loop_cut(dfg_filtered, start_activities, end_activities)
-
-        # If a nontrivial cut (>1) is found, return the partition and the corresponding operator
-        if self._is_nontrivial(xor_cut):
-            return xor_cut, CutType.XOR
-        elif self._is_nontrivial(sequence_cut):
-            return sequence_cut, CutType.SEQUENCE
-        elif self._is_nontrivial(parallel_cut):
-            return parallel_cut, CutType.PARALLEL
-        elif self._is_nontrivial(loop_cut):
-            return loop_cut, CutType.LOOP
-        else:  # If no nontrivial cut is found, apply the fall-through case (flower model)
-            flower_groups = self._handle_fall_through(log)
-            return flower_groups, CutType.NONE
+
+        # Try to apply different types of cuts to the current sublog in priority order, the eventually follows
+        # graph is only computed if the sequence cut is tried
+        cuts = [
+            (CutType.XOR, lambda: self._xor_cut(dfg_filtered, start_activities, end_activities)),
+            (CutType.SEQUENCE, lambda: self._sequence_cut(self.get_frequent_eventually_follows_graph(log),
+                                                          start_activities, end_activities)),
+            (CutType.PARALLEL, lambda: self._parallel_cut(dfg_filtered, start_activities, end_activities)),
+            (CutType.LOOP, lambda: self._loop_cut(dfg_filtered, start_activities, end_activities)),
+        ]
+        return self._find_first_cut(log, cuts, filtered=True)
 
     def _handle_base_cases_filtered(self, log: List[Tuple[str]]) -> Tuple[List[Set[str]], CutType]:
         """
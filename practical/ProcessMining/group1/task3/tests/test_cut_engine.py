@@ -0,0 +1,121 @@
+import random
+
+import networkx as nx
+import pytest
+
+from practical.ProcessMining.group1.shared.utils import check_lists_of_sets_equal
+from practical.ProcessMining.group1.task3.cut_engine import CutEngine, UnionFind
+from practical.ProcessMining.group1.task3.inductiveminer import InductiveMiner
+
+
+class TestCutEngine:
+    def test_union_find(self):
+        union_find = UnionFind(5)
+        union_find.union_pairs([(3, 4), (1, 3)])
+
+        assert union_find.find(4) == 1
+        assert union_find.find(0) == 0
+        assert union_find.find(2) == 2
+
+    def test_activities(self):
+        engine = CutEngine({('b', 'a'): 1}, {'b': 1, 'c': 1}, {'a': 1})
+
+        assert engine.activities == ['a', 'b', 'c']
+        assert engine.to_set(engine.in_dfg) == {'a', 'b'}
+        assert engine.to_set(engine.start) == {'b', 'c'}
+        assert engine.to_set(engine.end) == {'a'}
+        assert engine.adjacency[engine.index['b'], engine.index['a']]
+        assert not engine.adjacency[engine.index['a'], engine.index['b']]
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_closure_matches_networkx(self, seed: int):
+        rng = random.Random(seed)
+        activities = 'abcdefghij'
+        dfg = {(a, b): 1 for a in activities for b in activities if rng.random() < 0.15}
+        graph = nx.DiGraph(list(dfg))
+        engine = CutEngine(dfg)
+
+        cyclic = {a for component in nx.strongly_connected_components(graph) for a in component
+                  if len(component) > 1 or graph.has_edge(a, a)}
+        for a in graph.nodes:
+            reachable = engine.to_set(engine.closure[engine.index[a]])
+            assert reachable - {a} == nx.descendants(graph, a)
+            assert (a in reachable) == (a in cyclic)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_connected_components_match_networkx(self, seed: int):
+        rng = random.Random(seed)
+        activities = 'abcdefghij'
+        dfg = {(a, b): 1 for a in activities for b in activities if rng.random() < 0.05}
+        engine = CutEngine(dfg, {'k': 1})
+
+        graph = nx.Graph(list(dfg))
+        graph.add_node('k')
+        assert check_lists_of_sets_equal(engine.connected_components(), list(nx.connected_components(graph)))
+
+    def test_closure_is_shared_per_sublog(self):
+        miner = InductiveMiner([('a', 'b', 'c'), ('a', 'c', 'b')])
+
+        engine = miner._get_cut_engine(miner.dfg, miner.start_activities, miner.end_activities)
+        miner._sequence_cut(miner.dfg, miner.start_activities, miner.end_activities)
+        miner._xor_cut(miner.dfg, miner.start_activities, miner.end_activities)
+        miner._loop_cut(miner.dfg, miner.start_activities, miner.end_activities)
+
+        assert miner._get_cut_engine(miner.dfg, miner.start_activities, miner.end_activities) is engine
+        assert engine._closure is not None
+        assert len(miner._cut_engines) == 1
+
+        miner.recursion_step(miner.event_log)
+        assert miner._get_cut_engine(miner.dfg, miner.start_activities, miner.end_activities) is not engine
+
+    def test_parallel_cut_large_alphabet(self):
+        # Two concurrent sequences of 100 activities each, all pairs across them in both orders
+        first = [f'a{i:03}' for i in range(100)]
+        second = [f'b{i:03}' for i in range(100)]
+        dfg = {edge: 1 for edge in zip(first, first[1:])}
+        dfg.update({edge: 1 for edge in zip(second, second[1:])})
+        dfg.update({(a, b): 1 for a in first for b in second})
+        dfg.update({(b, a): 1 for a in first for b in second})
+        miner = InductiveMiner([tuple(first)])
+
+        parallel_cut = miner._parallel_cut(dfg, {'a000': 1, 'b000': 1}, {'a099': 1, 'b099': 1})
+        assert check_lists_of_sets_equal(parallel_cut, [set(first), set(second)])
+
+    def test_component_ids(self):
+        engine = CutEngine({('a', 'b'): 1, ('c', 'd'): 1, ('d', 'e'): 1})
+        related = engine.adjacency | engine.adjacency.T
+
+        assert engine.component_ids(related).tolist() == [0, 0, 2, 2, 2]
+        assert engine.component_ids(related, engine.mask('ace')).tolist() == [0, -1, 2, -1, 4]
+
+    def test_loop_cut_many_loop_groups(self):
+        # Do-part 'a' with 50 independent redo-parts
+        log = [tuple(activity for i in range(50) for activity in ('a', f'r{i:02}')) + ('a',)]
+        miner = InductiveMiner(log)
+
+        loop_cut = miner._loop_cut(miner.dfg, miner.start_activities, miner.end_activities)
+        assert loop_cut[0] == {'a'}
+        assert check_lists_of_sets_equal(loop_cut[1:], [{f'r{i:02}'} for i in range(50)])
+
+    def test_loop_cut_predecessor_of_pure_end(self):
+        # 'c' is followed by the end activity 'e', which is no start activity, so 'c' cannot be a redo-part
+        miner = InductiveMiner([('f', 'e', 'c', 'e')])
+
+        assert miner._loop_cut(miner.dfg, miner.start_activities, miner.end_activities) == []
+
+    def test_loop_cut_checks_all_loop_groups(self):
+        # 'x' only follows the end activity 'c' and not 'd', so it is no redo-part, even as the only loop group
+        miner = InductiveMiner([('a', 'c'), ('a', 'd'), ('a', 'c', 'x', 'a', 'd')])
+        assert miner._loop_cut(miner.dfg, miner.start_activities, miner.end_activities) == []
+
+        # 'y' follows both end activities
+        miner = InductiveMiner([('a', 'c'), ('a', 'd'), ('a', 'c', 'x', 'a', 'd'), ('a', 'd', 'y', 'a', 'c'),
+                                ('a', 'c', 'y', 'a', 'c')])
+        loop_cut = miner._loop_cut(miner.dfg, miner.start_activities, miner.end_activities)
+        assert loop_cut == [{'a', 'c', 'd', 'x'}, {'y'}]
+
+    def test_loop_cut_redo_sequence(self):
+        miner = InductiveMiner([('a', 'b', 'c', 'a'), ('a',)])
+
+        loop_cut = miner._loop_cut(miner.dfg, miner.start_activities, miner.end_activities)
+        assert loop_cut == [{'a'}, {'b', 'c'}]
@@ -7,6 +7,8 @@ from practical.ProcessMining.group1.shared.utils import event_log_to_dataframe,
     extract_traces_from_text
 from practical.ProcessMining.group1.task3.inductiveminer import InductiveMiner, CutType
 import pm4py
+from pm4py.algo.conformance.tokenreplay import algorithm as token_replay
+from pm4py.objects.log.obj import EventLog, Trace, Event
 # from IPython.display import Image
 from unittest.mock import MagicMock, patch
 
@@ -203,6 +205,24 @@ class TestInductiveMiner:
         loop_split = miner._split_log(miner.event_log, loop_cut, CutType.LOOP)
         assert all(sorted(sl) in expected_split for sl in loop_split)
 
+    @pytest.mark.parametrize(
+        "log,cut,expected_split",
+        [
+            ([('a', 'b', 'a', 'a', 'b', 'a')],
+             [set('a'), set('b')],
+             [[('a',), ('a', 'a'), ('a',)],
+              [('b',), ('b',)]]),
+            ([('a', 'c', 'b', 'd', 'a', 'b', 'b'), ('a', 'b')],
+             [set('ab'), set('cd')],
+             [[('a',), ('b',), ('a', 'b', 'b'), ('a', 'b')],
+              [('c',), ('d',)]]),
+        ]
+    )
+    def test_loop_split(self, log: List[Tuple[str]], cut: List[Set], expected_split: List[List[Tuple]]):
+        miner = InductiveMiner(log)
+
+        assert miner._split_log(log, cut, CutType.LOOP) == expected_split
+
     @pytest.mark.parametrize(
         "log,expected_cut,expected_operator",
         [
@@ -234,6 +254,33 @@ class TestInductiveMiner:
         miner.run()
         assert miner.process_tree_str == expected_string
 
+    def test_apply_cut_stops_at_first_nontrivial_cut(self):
+        # Sequence cut is the first nontrivial cut, parallel and loop cut must not be computed
+        miner = InductiveMiner([('a', 'b'), ('a', 'c')])
+        with patch.object(miner, '_parallel_cut') as mock_parallel, patch.object(miner, '_loop_cut') as mock_loop:
+            groups, operator = miner._apply_cut(miner.event_log, miner.dfg, miner.start_activities,
+                                                miner.end_activities)
+
+        assert operator == CutType.SEQUENCE
+        assert groups == [set('a'), set('bc')]
+        mock_parallel.assert_not_called()
+        mock_loop.assert_not_called()
+
+    def test_instrumentation(self):
+        statistics = []
+        miner = InductiveMiner([('a', 'b', 'c'), ('a', 'c', 'b')], instrumentation=statistics.append)
+        miner.run()
+
+        # Steps with cut detection: the whole log (sequence) and the sublog of b and c (parallel)
+        assert [step['sublog_size'] for step in statistics] == [2, 2]
+        assert [step['alphabet_size'] for step in statistics] == [3, 2]
+        assert [[cut_type for cut_type, _ in step['cuts']] for step in statistics] == [
+            [CutType.XOR, CutType.SEQUENCE],
+            [CutType.XOR, CutType.SEQUENCE, CutType.PARALLEL],
+        ]
+        assert all(seconds >= 0 for step in statistics for _, seconds in step['cuts'])
+        assert not any(step['filtered'] for step in statistics)
+
     @patch('graphviz.Digraph.pipe', return_value=b'')
     def test_visualize_process_tree(self, mock_pipe):
         log = [('a', 'b'), ('b', 'c')]
@@ -247,29 +294,43 @@ class TestInductiveMiner:
         # mock_pipe.assert_called_once_with()
         # assert isinstance(result, Image)
 
-    @patch('pm4py.visualization.petri_net.visualizer.view')
-    @patch('pm4py.visualization.petri_net.visualizer.apply', return_value='gviz')
-    @patch('pm4py.objects.conversion.process_tree.converter.apply',
-           return_value=(MagicMock(), MagicMock(), MagicMock()))
+    @patch('pm4py.algo.discovery.inductive.algorithm.apply')
     @patch('pm4py.objects.conversion.log.converter.apply')
-    def test_build_and_visualize_petrinet(self, mock_log_converter, mock_pt_converter, mock_pn_apply, mock_pn_view):
+    def test_build_and_visualize_petrinet(self, mock_log_converter, mock_inductive_miner):
         log = [('a', 'b'), ('b', 'c')]
         miner = InductiveMiner(log)
         miner.net = None
         miner.initial_marking = None
         miner.final_marking = None
 
-        # Mocking log converter
-        mock_log_converter.return_value = MagicMock()
-
         # Call the method
         miner.build_and_visualize_petrinet()
 
-        # Assertions
-        mock_log_converter.assert_called_once()
-        mock_pt_converter.assert_called_once()
-        # mock_pn_apply.assert_called_once_with(miner.net, miner.initial_marking, miner.final_marking)
-        # mock_pn_view.assert_called_once()
+        # The Petri net is converted from the discovered process tree without running pm4py again
+        mock_log_converter.assert_not_called()
+        mock_inductive_miner.assert_not_called()
+        net, initial_marking, final_marking = miner.get_petrinet()
+        assert {t.label for t in net.transitions if t.label} == {'a', 'b', 'c'}
+        assert [p.name for p in initial_marking] == ['source']
+        assert [p.name for p in final_marking] == ['sink']
+
+    @pytest.mark.parametrize(
+        "log",
+        [
+            [('a', 'b', 'c', 'd'), ('a', 'c', 'b', 'd'), ('a', 'e', 'd')],
+            [('a', 'b', 'a', 'b', 'a'), ('a', 'c', 'a')],
+            [('a', 'b', 'c', 'd'), ('d', 'a', 'b'), ('a', 'd', 'c'), ('b', 'c', 'd',)],
+            [('a', 'c', 'e', 'q'), ('b', 'd', 'f', 'r'), ('a', 'c', 'e'), ('b', 'd', 'f')],
+        ]
+    )
+    def test_build_petri_net_replays_log(self, log: List[Tuple[str]]):
+        miner = InductiveMiner(log)
+        miner.run()
+        net, initial_marking, final_marking = miner._build_petri_net(miner._parse_process_tree(str(miner)))
+
+        event_log = EventLog([Trace([Event({'concept:name': activity}) for activity in trace]) for trace in log])
+        replay = token_replay.apply(event_log, net, initial_marking, final_marking)
+        assert all(result['trace_is_fit'] for result in replay)
 
     @pytest.mark.parametrize(
         "log,expected_tree",
@@ -285,3 +285,14 @@ class TestInductiveMinerInfrequent:
         result[0] = sorted(result[0])
         assert result == expected_filter
 
+    def test_instrumentation_filtered(self):
+        statistics = []
+        # No cut is found, neither on the graphs nor on the filtered graphs
+        log = [('a', 'b', 'c')] * 9 + [('a', 'c', 'b', 'a', 'c')]
+        miner = InductiveMinerInfrequent(event_log=log, threshold=0.3, instrumentation=statistics.append)
+        miner.run()
+
+        assert [step['filtered'] for step in statistics] == [False, True]
+        assert all(step['sublog_size'] == 10 and step['alphabet_size'] == 3 for step in statistics)
+        assert all([cut_type for cut_type, _ in step['cuts']] == [CutType.XOR, CutType.SEQUENCE, CutType.PARALLEL,
+                                                                  CutType.LOOP] for step in statistics)
@@ -3,6 +3,7 @@ import pm4py
 from pm4py.objects.petri_net.obj import PetriNet, Marking
 from pm4py.objects.conversion.log import converter as log_converter
 import pytest
+from unittest.mock import patch
 
 from practical.ProcessMining.group1.shared import utils
 from practical.ProcessMining.group1.shared.visualizer import Visualizer
@@ -304,4 +305,91 @@ class TestTokenReplay:
         assert 'label=<<B>+2</B>>' in graph.body[3]
         # Check if the fillcolor is adjusted
         for i in range(3, 6):
-            assert 'fillcolor=transparent' not in graph.body[i]
\ No newline at end of file
+            assert 'fillcolor=transparent' not in graph.body[i]
+
+    def test_visualize_token_maxima(self, token_replay):
+        visualizer = Visualizer()
+        tokens = token_replay.get_unconformity_tokens()
+
+        assert visualizer._get_token_maxima(tokens) == (max(tokens["missing"].values()),
+                                                        max(tokens["remaining"].values()))
+        assert visualizer._get_token_maxima(None) == (0, 0)
+        # Passing precomputed maxima gives the same attributes as computing them per place
+        place = next(iter(tokens["missing"]))
+        assert (visualizer._get_place_attributes(place, token_replay.initial_marking, token_replay.final_marking,
+                                                 tokens, visualizer._get_token_maxima(tokens)) ==
+                visualizer._get_place_attributes(place, token_replay.initial_marking, token_replay.final_marking,
+                                                 tokens))
+
+    def test_render_petri_nets(self, tmp_path, token_replay):
+        visualizer = Visualizer()
+        nets = [(token_replay.net, token_replay.initial_marking, token_replay.final_marking),
+                (token_replay.net, token_replay.initial_marking, token_replay.final_marking,
+                 token_replay.get_unconformity_tokens())]
+        file_names = [str(tmp_path / 'net'), str(tmp_path / 'net_tokens')]
+
+        with patch('graphviz.Digraph.render', side_effect=lambda filename, **kwargs: f'{filename}.png') as render:
+            paths = visualizer.render_petri_nets(nets, file_names, max_workers=2)
+
+        assert paths == [f'{file_name}.png' for file_name in file_names]
+        assert render.call_count == 2
+
+        with pytest.raises(ValueError):
+            visualizer.render_petri_nets(nets, [file_names[0]] * 2)
+
+    def test_write_petri_net(self, tmp_path, token_replay):
+        visualizer = Visualizer()
+        tokens = token_replay.get_unconformity_tokens()
+        graph = visualizer.build_petri_net(token_replay.net, token_replay.initial_marking,
+                                           token_replay.final_marking, tokens)
+
+        file_name = tmp_path / 'net.gv'
+        visualizer.write_petri_net(token_replay.net, token_replay.initial_marking, token_replay.final_marking,
+                                   str(file_name), tokens)
+        assert file_name.read_text(encoding='utf-8') == graph.source
+
+    def test_write_petri_net_level_of_detail(self, tmp_path):
+        # source -> a -> p1 -> tau1 -> p2 -> tau2 -> p3 -> tau3 -> p4 -> long_activity_name -> sink
+        net = PetriNet('chain')
+        places = [PetriNet.Place(name) for name in ['source', 'p1', 'p2', 'p3', 'p4', 'sink']]
+        transitions = [PetriNet.Transition('a', 'a'), PetriNet.Transition('tau1', None),
+                       PetriNet.Transition('tau2', None), PetriNet.Transition('tau3', None),
+                       PetriNet.Transition('long', 'long_activity_name')]
+        net.places.update(places)
+        net.transitions.update(transitions)
+        for place, transition, next_place in zip(places, transitions, places[1:]):
+            pm4py.objects.petri_net.utils.petri_utils.add_arc_from_to(place, transition, net)
+            pm4py.objects.petri_net.utils.petri_utils.add_arc_from_to(transition, next_place, net)
+        initial_marking, final_marking = Marking({places[0]: 1}), Marking({places[-1]: 1})
+
+        file_name = tmp_path / 'chain.gv'
+        Visualizer().write_petri_net(net, initial_marking, final_marking, str(file_name),
+                                     collapse_silent_chains=True, max_label_length=5)
+        source = file_name.read_text(encoding='utf-8')
+        lines = source.splitlines()
+
+        # The three silent transitions and the two places between them become one silent transition
+        assert sum('shape=box' in line for line in lines) == 3
+        assert sum('shape=circle' in line or 'shape=doublecircle' in line for line in lines) == 4
+        assert sum('->' in line for line in lines) == 6
+        assert 'label="long…"' in source
+        assert 'long_activity_name' not in source
+        assert graphviz.Source(source).source == source
+
+    def test_write_petri_net_weighted_arc(self, tmp_path):
+        net = PetriNet('weighted')
+        source, sink = PetriNet.Place('source'), PetriNet.Place('sink')
+        transition = PetriNet.Transition('a', 'a')
+        net.places.update([source, sink])
+        net.transitions.add(transition)
+        pm4py.objects.petri_net.utils.petri_utils.add_arc_from_to(source, transition, net, weight=2)
+        pm4py.objects.petri_net.utils.petri_utils.add_arc_from_to(transition, sink, net)
+        initial_marking, final_marking = Marking({source: 2}), Marking({sink: 1})
+
+        # Arcs are drawn without their weight, like in build_petri_net
+        visualizer = Visualizer()
+        file_name = tmp_path / 'weighted.gv'
+        visualizer.write_petri_net(net, initial_marking, final_marking, str(file_name))
+        source_code = file_name.read_text(encoding='utf-8')
+        assert source_code == visualizer.build_petri_net(net, initial_marking, final_marking).source
+        assert all('label' not in line for line in source_code.splitlines() if '->' in line)
@@ -1,5 +1,4 @@
 from collections import defaultdict
-import pm4py
 import random
 from typing import List, Dict
 
@@ -225,6 +224,8 @@ class TokenReplay:
             im: Dictionary representing the initial marking of the Petri net.
             fm: Dictionary representing the final marking of the Petri net.
         """
+        import pm4py
+
         fitness = pm4py.conformance.fitness_token_based_replay(log, net, im, fm)
         simplicity = pm4py.analysis.simplicity_petri_net(net, im, fm)
         precision = pm4py.conformance.precision_token_based_replay(log, net, im, fm)
@@ -7,11 +7,13 @@ from graphviz import Digraph
 # Alpha Miner plus class
 class AlphaMinerplus:
     def __init__(self, traces):
+        self._stages = {}  # Memoized results of the pipeline stages, reset whenever traces are replaced
         self.traces = traces  # Traces from an event log
         self.transitions = SortedSet()
         self.initial_transitions = SortedSet()
         self.final_transitions = SortedSet()
         self.relations = SortedDict()  # Dictionary to keep of track of the relations ->, #, <-, ||
+        self.relations_without_length_one_loops = SortedDict()  # Relations on W - L1L, used for the places
         self.pairs = []
         self.maximal_pairs = []
         self.places = []  # Set of places between maximal pairs
@@ -22,10 +24,49 @@ class AlphaMinerplus:
         self.F_L1L = None
         self.W_minusL1L = SortedDict()
 
+    @property
+    def traces(self):
+        return self._traces
+
+    @traces.setter
+    def traces(self, traces):
+        # New traces invalidate everything computed from the old ones
+        self._traces = traces
+        self._stages = {}
+
+    def _stage(self, name, compute):
+        # Compute a stage of the pipeline once and reuse it until traces change
+        if name not in self._stages:
+            self._stages[name] = compute()
+        return self._stages[name]
+
+    def mine(self):
+        # Run the whole alpha plus algorithm, every stage is computed exactly once
+        # 1) T := transitions, T_I and T_O
+        self.get_transitions()
+        self.initial_transitions = SortedSet()
+        self.final_transitions = SortedSet()
+        self.getInitialTransitions()
+        self.getFinalTransitions()
+        # 2) L1L (computes the footprint of W)
+        self.get_length_one_loops()
+        # 3) T' := T \ L1L
+        self.remove_length_one_loops()
+        # 4) F_L1L
+        self.get_FL1L()
+        # 5) W - L1L
+        self.generate_W_minus_L1L()
+        # 6) Places of the alpha algorithm on W - L1L
+        self.get_footprint_without_length_one_loops()
+        self.getPairs(self.relations_without_length_one_loops)
+        self.get_maximal_pairs()
+        self.places = []
+        self.add_places()
+        return self.places, self.F_L1L
 
     def get_transitions(self):
         # Sets all transitions for the current petri net
-        self.transitions = set(chain.from_iterable(self.traces.values()))
+        self.transitions = self._stage("transitions", lambda: set(chain.from_iterable(self.traces.values())))
     
 
     def getInitialTransitions(self) -> SortedSet:
@@ -51,60 +92,64 @@ class AlphaMinerplus:
                 self.final_transitions= SortedSet()   
         return self.final_transitions
  
-    def get_footprint(self) -> np.ndarray: 
-        #Step 1: remove duplicate traces
-        traces_without_duplicates = SortedSet()
-        for trace in self.traces.values():
-            traces_without_duplicates.add("".join(trace))
-       
-      
-        #Step 2: Due to loop completeness, (definition 3.3: Ordering relations capturing length 2 loops) we need to examine all possible 
-        # firing sequences that have the form: aba with  t_i-1 = a ;   t_i = b   ;  t_i+1 = a
-         #Extract relations between each transitions
-        # generate Footprint
-
-        for transition_1 in self.transitions:
-            self.relations[transition_1] = SortedDict()
-            for transition_2 in self.transitions:
-                two_element_transitions = transition_1+transition_2
-                three_element_transition_1 = transition_2+transition_1+transition_2   
-                # eg aba, we also need bab
-                three_element_transition_2 = transition_1+transition_2+transition_1
-
-                all_relations = None
-                for trace in traces_without_duplicates:               
-                    if all_relations == None :
-                        if trace.find(two_element_transitions) >= 0:          
-                            all_relations = "->"  
-                        elif trace.find(two_element_transitions[::-1]) >= 0:      
-                            all_relations = "<-"
-                    else:
-                        if trace.find(two_element_transitions) >= 0:
-                            if all_relations == "<-": 
-                                if trace.find(three_element_transition_1) <= 0 and trace.find(three_element_transition_2) <= 0:      
-                                    all_relations = "||"
-                        elif trace.find(two_element_transitions[::-1]) >= 0:
-                            if all_relations == "->":
-                                if trace.find(three_element_transition_1) <= 0 and trace.find(three_element_transition_2) <= 0:       
-                                    all_relations = "||"                      
-
-                if all_relations == None:
-                    all_relations = "#"
-                self.relations[transition_1][transition_2] = all_relations
-
-      
-      
-        
-
-        
-      
-
-
-
-
-
-
-    def getPairs(self):
+    def get_footprint(self) -> np.ndarray:
+        # Footprint of the log W
+        self.relations, matrix = self._stage("footprint", lambda: self._compute_footprint(self.traces))
+        return matrix
+
+    def get_footprint_without_length_one_loops(self) -> np.ndarray:
+        # Footprint of the log W - L1L, second pass of the alpha plus algorithm
+        self.generate_W_minus_L1L()
+        self.relations_without_length_one_loops, matrix = self._stage(
+            "footprint_without_length_one_loops", lambda: self._compute_footprint(self.W_minusL1L))
+        return matrix
+
+    @staticmethod
+    def _compute_footprint(traces):
+        # Step 1: encode every distinct trace as integer codes, traces are separated by -1
+        transitions = sorted(set(chain.from_iterable(traces.values())))
+        index = {transition: i for i, transition in enumerate(transitions)}
+        n = len(transitions)
+
+        traces_without_duplicates = set(tuple(trace) for trace in traces.values())
+        codes = []
+        for trace in traces_without_duplicates:
+            codes.extend(index[activity] for activity in trace)
+            codes.append(-1)
+        codes = np.array(codes, dtype=np.int64)
+
+        # Step 2: single scan over all traces, count directly-follows pairs ab (a >W b)
+        # and, due to loop completeness (definition 3.3: Ordering relations capturing length 2 loops),
+        # all firing sequences of the form aba with t_i-1 = a ; t_i = b ; t_i+1 = a
+        follows = np.zeros((n, n), dtype=np.int64)
+        first, second = codes[:-1], codes[1:]
+        valid = (first >= 0) & (second >= 0)
+        np.add.at(follows, (first[valid], second[valid]), 1)
+
+        length_two_loops = np.zeros((n, n), dtype=np.int64)
+        first, second, third = codes[:-2], codes[1:-1], codes[2:]
+        valid = (first >= 0) & (second >= 0) & (first == third)
+        np.add.at(length_two_loops, (first[valid], second[valid]), 1)
+
+        # Step 3: derive the relations, aba or bab prevents a || b
+        directly_follows = follows > 0
+        in_length_two_loop = (length_two_loops > 0) | (length_two_loops > 0).T
+        sequence = directly_follows & (~directly_follows.T | in_length_two_loop)
+        matrix = np.select(
+            [sequence, sequence.T, directly_follows & directly_follows.T],
+            ["->", "<-", "||"],
+            default="#",
+        )
+        # A transition directly following itself is a length one loop, marked with ->
+        np.fill_diagonal(matrix, np.where(np.diag(directly_follows), "->", "#"))
+
+        relations = SortedDict(
+            (transition_1, SortedDict(zip(transitions, matrix[i].tolist())))
+            for i, transition_1 in enumerate(transitions)
+        )
+        return relations, matrix
+
+    def getPairs(self, relations=None):
         # Generate pairs of activities, same procedure as the regular alpha miner
         # There must not be a relation between the activities
         # additinally the activities in the set have to be direcly successed by each other
@@ -113,155 +158,95 @@ class AlphaMinerplus:
         # causally related (i.e. a →L b), all elements in A are independent (a1#a2), and all elements in B
         # are independent (b1#Lb2) as well
 
-        choice_pairs = []
-
-        causality_pairs = []
-        
-        #Extract all possible pairs of activities with the causality relation
-        for activity1 ,relations1 in self.relations.items(): 
-            for activity2 , relation in relations1.items():
-                if relation == "->" :
-                    causality_pairs.append((activity1,activity2))
-                if relation == "#":
-                    if activity1 == activity2:
-                        choice_pairs.append((activity1,))
-                    else:
-                        choice_pairs.append((activity1,activity2))
-
-    
-        pairs = causality_pairs
-
-        # We need to check the combinations too, while checking if the activities are independent in their respective sets
-     
-
-        i = 0
-        j = len(choice_pairs)
-
-        while i < j :
-            current_choice_pair = choice_pairs[i]
-            for pair in choice_pairs:
-                union = True
-           
-                if len(SortedSet(current_choice_pair).intersection(SortedSet(pair))) != 0:
-                    for e1 in pair:
-                        if union == False:
-                            break
-                        for e2 in current_choice_pair:
-                            if self.relations[e1][e2] != "#":  #check if the activities are independent
-                                union = False
-                                break
-                    if union :  # if not independent, create a new pair which is the union of the 2 activities eg  [a,d]  +  [a, f] -> [a, d, f]
-                        
-                        new_pair = SortedSet(current_choice_pair) | SortedSet(pair) 
-                   
-                      
-                        if tuple(new_pair) not in choice_pairs:
-                     
-                        
-                            choice_pairs.append(tuple(new_pair))
-                            j = j + 1
-                            
-                
-            i = i + 1
-
-      # Union
-        for pair_choices1 in choice_pairs:
-            for pair_choices2 in choice_pairs:
-                relation_between_pair = None
-                makePair = True
-
-                intersection = SortedSet(pair_choices1).intersection(pair_choices2)
-                pair_choices2 = SortedSet(pair_choices2)
-
-                if len(intersection) != 0:
-                    # remove intersection terms in the second pair
-                    for term in intersection:
-                        pair_choices2.discard(term)
-
-                if len(pair_choices2) == 0:
-                    continue
-                pair_choices2 = tuple(pair_choices2)
-
-                for activity1 in pair_choices1:
-                    if not makePair:
-                        break
-                    for activity2 in pair_choices2:
-                        relation = self.relations[activity1][activity2]
-                        if (relation_between_pair is not None
-                            and relation_between_pair != relation):
-                            makePair = False
-                            break
-                        else:
-                            relation_between_pair = relation
-                        if relation != "->":
-                            makePair = False
-                            break
-                if makePair is True:
-                    if relation_between_pair == "->":
-                        new_pair = (pair_choices1, pair_choices2)
-                    else:
-                        new_pair = (pair_choices2, pair_choices1) # TODO- include in tests
-                    pairs.append(new_pair)
-
-        self.pairs = pairs
-
-
+        # By default the relations of the log W are used, mine() passes the relations of W - L1L
+        if relations is None:
+            relations = self.relations
+
+        # Every activity appears twice in a compatibility graph, once as candidate for A (bit i) and once as
+        # candidate for B (bit n + i). Two candidates on the same side are connected if they are independent,
+        # a candidate a for A and b for B are connected if a -> b. A set of candidates that are pairwise
+        # connected (a clique) with both sides non-empty is exactly a pair (A, B).
+        transitions = list(relations.keys())
+        n = len(transitions)
+        neighbors = [0] * (2 * n)
+        for i, activity1 in enumerate(transitions):
+            for j, activity2 in enumerate(transitions):
+                relation = relations[activity1][activity2]
+                if relation == "->":
+                    neighbors[i] |= 1 << (n + j)
+                    neighbors[n + j] |= 1 << i
+                elif relation == "#" and i != j:
+                    neighbors[i] |= 1 << j
+                    neighbors[n + i] |= 1 << (n + j)
+        side_A = (1 << n) - 1
+        side_B = side_A << n
+
+        # Only pairs that can not be extended (maximal cliques) are enumerated, smaller pairs would be
+        # discarded by get_maximal_pairs anyway. Bron-Kerbosch with pivoting on bitmasks, skipping branches
+        # that can not contain both sides.
+        pairs = []
+        stack = [(0, (1 << (2 * n)) - 1, 0)]
+        while stack:
+            clique, candidates, excluded = stack.pop()
+            reachable = clique | candidates
+            if not reachable & side_A or not reachable & side_B:
+                continue  # This branch can not produce a pair any more
+            if not candidates and not excluded:
+                if clique & side_A and clique & side_B:
+                    pairs.append((clique & side_A, clique >> n))
+                continue
+            pivot = max(self._members(candidates | excluded),
+                        key=lambda u: bin(candidates & neighbors[u]).count("1"))
+            for v in self._members(candidates & ~neighbors[pivot]):
+                stack.append((clique | 1 << v, candidates & neighbors[v], excluded & neighbors[v]))
+                candidates &= ~(1 << v)
+                excluded |= 1 << v
+
+        self.pairs = sorted((self._to_tuple(mask_A, transitions), self._to_tuple(mask_B, transitions))
+                            for mask_A, mask_B in pairs)
+
+    @staticmethod
+    def _members(mask):
+        # Indices of the set bits of a bitmask
+        while mask:
+            lowest = mask & -mask
+            yield lowest.bit_length() - 1
+            mask ^= lowest
+
+    @staticmethod
+    def _to_tuple(mask, transitions):
+        return tuple(transitions[i] for i in AlphaMinerplus._members(mask))
 
     def get_maximal_pairs(self):
-            # Set of paired activities that are maximal
-            pos1 = 0
-            pair_appended = []
-            maximal_pairs = []
-            for pair1 in self.pairs:
-                append_flag = True
-                # flatten pair 1
-                flat_pair1 = []
-                for pair_element in pair1:
-                    for e in pair_element:
-                        flat_pair1.append(e)
-
-                pos2 = 0
-                for pair2 in self.pairs:
-                    if pos1 != pos2:
-                        flat_pair2 = []
-                        for pair_element in pair2:
-                            for e in pair_element:
-                                flat_pair2.append(e)
-                        # flat the pair 1
-
-                        # flat the pair 2
-                        # check if pair1 issubset of pair 2 or pair 2 is subset of 1
-                        if (SortedSet(flat_pair1).issubset(flat_pair2) 
-                        and SortedSet(flat_pair1) != SortedSet(flat_pair2)):
-                            append_flag = False
-                    pos2 = pos2 + 1
-
-                if append_flag is True:
-
-                    if SortedSet(flat_pair1) not in pair_appended:
-                        maximal_pairs.append(pair1)
-                        pair_appended.append(SortedSet(flat_pair1))
-                pos1 = pos1 + 1
-
-            self.maximal_pairs = maximal_pairs
-
-
-
+        # Set of paired activities that are maximal, i.e. not contained in another pair (A ⊆ A' and B ⊆ B')
+        transitions = sorted(set(chain.from_iterable(chain.from_iterable(self.pairs))))
+        index = {transition: i for i, transition in enumerate(transitions)}
 
+        def to_mask(activities):
+            return sum(1 << index[activity] for activity in activities)
 
+        # Sort by size, so that a pair can only be contained in a pair that was already checked
+        masks = sorted({(to_mask(pair[0]), to_mask(pair[1])) for pair in self.pairs},
+                       key=lambda masks: -bin(masks[0]).count("1") - bin(masks[1]).count("1"))
+        maximal_masks = []
+        for mask_A, mask_B in masks:
+            if not any(mask_A & other_A == mask_A and mask_B & other_B == mask_B
+                       for other_A, other_B in maximal_masks):
+                maximal_masks.append((mask_A, mask_B))
 
+        self.maximal_pairs = sorted((self._to_tuple(mask_A, transitions), self._to_tuple(mask_B, transitions))
+                                    for mask_A, mask_B in maximal_masks)
 
     def get_length_one_loops(self) -> SortedSet:
         # extract length one loop
-        self.length_one_loops = SortedSet()
         self.get_transitions()
         # compute footprint matrix and extract all transitions that have a causality relation with itself, eg: aa, bb etc.
 
         self.get_footprint()
 
-        for transition in self.transitions:
-            if self.relations[transition][transition] == "->":
-                self.length_one_loops.add(transition)
+        self.length_one_loops = self._stage("length_one_loops", lambda: SortedSet(
+            transition for transition in self.transitions if self.relations[transition][transition] == "->"))
+        return self.length_one_loops
 
 
 
@@ -285,7 +270,6 @@ class AlphaMinerplus:
 
         self.F_L1L = SortedSet()
         place_counter = 1
-        self.get_transitions()
         AB_composition = []
         for transition1 in self.length_one_loops:
             
@@ -357,19 +341,16 @@ class AlphaMinerplus:
 #    length one loops SortedSet(['b', 'c'])
 #    trace without length one loops ['a', 'd', 'e']
     def generate_W_minus_L1L(self):
-       
-        length_one_loops = self.length_one_loops
-       
+        self.W_minusL1L = self._stage("W_minus_L1L", self._compute_W_minus_L1L)
+        return self.W_minusL1L
+
+    def _compute_W_minus_L1L(self):
+        length_one_loops = self.get_length_one_loops()
+        W_minusL1L = SortedDict()
         for trace_key,trace in self.traces.items():
-             trace_pr = trace
-           
-            
-            
-             trace_pr = self.diff(trace_pr,length_one_loops)
-           
-             self.W_minusL1L[trace_key] = trace_pr
-       
-       
+             W_minusL1L[trace_key] = self.diff(trace,length_one_loops)
+        return W_minusL1L
+
 
 
     def add_places(self):
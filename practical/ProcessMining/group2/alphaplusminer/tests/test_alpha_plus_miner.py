@@ -0,0 +1,150 @@
+import os
+
+from sortedcontainers import SortedSet
+
+from practical.ProcessMining.group2.alphaplusminer.alpha_plus_miner import AlphaMinerplus
+
+LOGS_DIR = os.path.join(os.path.dirname(__file__), '..', 'Logs')
+
+
+def get_footprint(traces):
+    miner = AlphaMinerplus(traces)
+    miner.get_transitions()
+    miner.get_footprint()
+    return miner.relations
+
+
+def test_get_footprint():
+    relations = get_footprint({'1': ['a', 'b', 'c', 'd'], '2': ['a', 'c', 'b', 'd']})
+    assert relations == {
+        'a': {'a': '#', 'b': '->', 'c': '->', 'd': '#'},
+        'b': {'a': '<-', 'b': '#', 'c': '||', 'd': '->'},
+        'c': {'a': '<-', 'b': '||', 'c': '#', 'd': '->'},
+        'd': {'a': '#', 'b': '<-', 'c': '<-', 'd': '#'},
+    }
+
+
+def test_get_footprint_loops():
+    # b c b is a length two loop, so b and c are not parallel; e is a length one loop
+    relations = get_footprint({'1': ['a', 'b', 'c', 'b', 'd'], '2': ['a', 'b', 'd', 'e', 'e']})
+    assert relations['b']['c'] == '->'
+    assert relations['c']['b'] == '->'
+    assert relations['e']['e'] == '->'
+    assert relations['a']['a'] == '#'
+    # Length two loop at the very start of a trace
+    relations = get_footprint({'1': ['b', 'c', 'b', 'd']})
+    assert relations['b']['c'] == '->'
+    assert relations['c']['b'] == '->'
+
+
+def test_get_footprint_multi_character_names():
+    single = get_footprint({'1': ['a', 'b', 'c', 'b', 'd'], '2': ['a', 'c', 'b', 'd']})
+    renamed = {'a': 'register', 'b': 'check', 'c': 'ch', 'd': 'archive'}
+    multi = get_footprint({
+        '1': [renamed[a] for a in ['a', 'b', 'c', 'b', 'd']],
+        '2': [renamed[a] for a in ['a', 'c', 'b', 'd']],
+    })
+    for a, row in single.items():
+        for b, relation in row.items():
+            assert multi[renamed[a]][renamed[b]] == relation
+    # Joining x, ab into 'xab' must not make x directly followed by a
+    relations = get_footprint({'1': ['x', 'ab'], '2': ['a', 'y'], '3': ['y', 'b']})
+    assert relations['x']['a'] == '#'
+    assert relations['x']['ab'] == '->'
+
+
+def test_get_footprint_xes():
+    import pm4py
+
+    log = pm4py.read_xes(os.path.join(LOGS_DIR, 'pdc2023_000000.xes'), return_legacy_log_object=True)
+    traces = {str(i): [event['concept:name'] for event in trace] for i, trace in enumerate(log)}
+    relations = get_footprint(traces)
+    assert len(relations) == 28
+    for a, row in relations.items():
+        for b, relation in row.items():
+            inverse = {'->': '<-', '<-': '->', '||': '||', '#': '#'}[relation]
+            if a != b and relations[b][a] != '->':
+                assert relations[b][a] == inverse
+
+
+def get_maximal_pairs(traces):
+    miner = AlphaMinerplus(traces)
+    miner.get_transitions()
+    miner.get_footprint()
+    miner.getPairs()
+    miner.get_maximal_pairs()
+    return miner.maximal_pairs
+
+
+def test_get_maximal_pairs():
+    maximal_pairs = get_maximal_pairs({
+        '1': ['a', 'b', 'c', 'd'],
+        '2': ['a', 'c', 'b', 'd'],
+        '3': ['a', 'e', 'd'],
+    })
+    assert maximal_pairs == [
+        (('a',), ('b', 'e')),
+        (('a',), ('c', 'e')),
+        (('b', 'e'), ('d',)),
+        (('c', 'e'), ('d',)),
+    ]
+
+
+def test_get_maximal_pairs_length_two_loop():
+    maximal_pairs = get_maximal_pairs({'1': ['a', 'b', 'd'], '2': ['a', 'b', 'c', 'b', 'd']})
+    assert maximal_pairs == [(('a', 'c'), ('b',)), (('b',), ('c', 'd'))]
+
+
+def test_get_maximal_pairs_many_activities():
+    # 50 exclusive activities would mean 2^50 candidate sets when growing all independent sets
+    choices = ['x{}'.format(i) for i in range(50)]
+    maximal_pairs = get_maximal_pairs({str(i): ['start', choice, 'end'] for i, choice in enumerate(choices)})
+    assert maximal_pairs == [(('start',), tuple(sorted(choices))), (tuple(sorted(choices)), ('end',))]
+
+    sequence = ['s{:02d}'.format(i) for i in range(60)]
+    maximal_pairs = get_maximal_pairs({'1': sequence})
+    assert maximal_pairs == [((a,), (b,)) for a, b in zip(sequence, sequence[1:])]
+
+
+def test_get_maximal_pairs_filters_contained_pairs():
+    miner = AlphaMinerplus({'1': ['a', 'b'], '2': ['a', 'c']})
+    miner.get_transitions()
+    miner.get_footprint()
+    miner.pairs = [(('a',), ('b',)), (('a',), ('b', 'c')), (('a',), ('c',)), (('a',), ('b', 'c'))]
+    miner.get_maximal_pairs()
+    assert miner.maximal_pairs == [(('a',), ('b', 'c'))]
+
+
+def test_mine():
+    # c is a length one loop between b and d, it must not break the sequence b -> d
+    miner = AlphaMinerplus({'1': ['a', 'b', 'd'], '2': ['a', 'b', 'c', 'c', 'd']})
+    places, F_L1L = miner.mine()
+    assert list(miner.length_one_loops) == ['c']
+    assert miner.W_minusL1L == {'1': ['a', 'b', 'd'], '2': ['a', 'b', 'd']}
+    assert miner.relations['b']['d'] == '->'
+    assert miner.relations_without_length_one_loops['b']['d'] == '->'
+    assert places == [
+        ('input', SortedSet(['a'])),
+        (('a',), 'Place_1', ('b',)),
+        (('b',), 'Place_2', ('d',)),
+        (SortedSet(['d']), 'output'),
+    ]
+    assert list(F_L1L) == [('Place_1', 'c'), ('c', 'Place_1')]
+
+
+def test_mine_computes_each_footprint_once():
+    miner = AlphaMinerplus({'1': ['a', 'b', 'd'], '2': ['a', 'b', 'c', 'c', 'd']})
+    computed = []
+    compute_footprint = miner._compute_footprint
+    miner._compute_footprint = lambda traces: computed.append(traces) or compute_footprint(traces)
+    miner.mine()
+    miner.mine()
+    # One footprint of W and one of W - L1L
+    assert len(computed) == 2
+
+    # Replacing the traces invalidates all stages
+    miner.traces = {'1': ['a', 'b']}
+    places, F_L1L = miner.mine()
+    assert len(computed) == 4
+    assert list(miner.length_one_loops) == []
+    assert places[1:-1] == [(('a',), 'Place_1', ('b',))]
@@ -3,26 +3,136 @@ import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__)))
 
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple
 
 from models_from_pm4py import (
-    get_log_from_file,
+    get_variant_log_from_file,
     get_model_from_pm4py,
     AlgoPm4Py,
 )
 from replay import get_traces_with_replay
+from pipeline_cache import PipelineCache
+from variant_log import VariantLog
 from generate_footprint import FootPrintMatrix
 from check_conformance import ConformanceChecking
 from visualize_matrix import visualize_sorted_dict
 from pm4py.visualization.petri_net import visualizer
-from pm4py.objects.log.util import split_train_test
 from itertools import combinations
 from pm4py.algo.simulation.playout.petri_net import variants
 
 
+def _discover_and_replay(
+    input_log,
+    algorithm: AlgoPm4Py,
+    variant=variants.extensive,
+    model=None,
+    progress_callback=None,
+    progress_interval=10000,
+):
+    """
+    Discover a model from a log (unless given), replay it and compute the footprint of the replayed log.
+
+    Defined on module level so that it can be sent to worker processes.
+
+    Parameters:
+    ----------
+    input_log : EventLog or VariantLog
+        The input log in EventLog form (pm4py) or as VariantLog.
+    algorithm : AlgoPm4Py
+        The process mining algorithm to be applied to the input log.
+    variant : variants (optional)
+        The variant of the replay algorithm to be used. Default is variants.extensive.
+    model : tuple (optional)
+        Previously discovered (net, initial marking, final marking). Default is None.
+    progress_callback : callable (optional)
+        Progress hook for the extensive playout, see `get_traces_with_replay`. Default is None.
+    progress_interval : int (optional)
+        Number of expanded states between two progress reports. Default is 10000.
+
+    Returns:
+    -------
+    tuple
+        The discovered model and the relations of the replayed FootPrintMatrix.
+    """
+    if model is None:
+        model = get_model_from_pm4py(input_log, algorithm)
+    net, start, end = model
+    logs_replayed = get_traces_with_replay(
+        net, start, end, variant, progress_callback, progress_interval
+    )
+    fpm_replayed = FootPrintMatrix(logs_replayed)
+    fpm_replayed.generate_footprint()
+    return model, fpm_replayed.relations
+
+
+_FOLD_LOG = None
+
+
+def _init_fold_worker(variant_log: VariantLog):
+    """
+    Store the variant-compressed log once per worker process, so that folds can be sent as variant counts.
+    """
+    global _FOLD_LOG
+    _FOLD_LOG = variant_log
+
+
+def _fold_pipeline(counts, algorithm: AlgoPm4Py):
+    """
+    Run discovery and replay on one fold of the log stored by `_init_fold_worker`.
+    """
+    return _discover_and_replay(_FOLD_LOG.to_event_log(counts), algorithm)
+
+
 class Comparison:
 
-    def pipeline(self, input_log, algorithm: AlgoPm4Py, variant=variants.extensive):
+    def __init__(self, cache: PipelineCache = None):
+        """
+        Initialize a Comparison instance.
+
+        Parameters:
+        ----------
+        cache : PipelineCache (optional)
+            Cache for discovered models and footprints. Default is a new in-memory cache;
+            pass a PipelineCache with a `cache_dir` to reuse results across runs.
+            The cached entries are unpickled, so only use a trusted `cache_dir`.
+        """
+        self.cache = cache if cache is not None else PipelineCache()
+
+    def get_log_footprint(self, input_log, log_key=None):
+        """
+        Get the FootPrintMatrix of a log, computing it only if it is not cached yet.
+
+        Parameters:
+        ----------
+        input_log : EventLog or VariantLog
+            The input log in EventLog form (pm4py) or as VariantLog.
+        log_key : str (optional)
+            Precomputed `PipelineCache.log_key` of the input log.
+
+        Returns:
+        -------
+        FootPrintMatrix
+            The FootPrintMatrix of the input log.
+        """
+        if log_key is None:
+            log_key = self.cache.log_key(input_log)
+        relations = self.cache.get(PipelineCache.LOG_FOOTPRINT, log_key)
+        if relations is None:
+            fpm = FootPrintMatrix(input_log)
+            fpm.generate_footprint()
+            relations = fpm.relations
+            self.cache.put(PipelineCache.LOG_FOOTPRINT, log_key, relations)
+        return FootPrintMatrix.from_relations(relations)
+
+    def pipeline(
+        self,
+        input_log,
+        algorithm: AlgoPm4Py,
+        variant=variants.extensive,
+        progress_callback=None,
+        progress_interval=10000,
+    ):
         """
         Execute a process mining pipeline on an input log using a specified algorithm.
 
@@ -32,14 +142,21 @@ class Comparison:
         3. Replay the resulting model to obtain replayed logs.
         4. Generate a FootPrintMatrix from the replayed logs.
 
+        Results of every step are looked up in `self.cache` first, keyed by the
+        variants of the input log, the algorithm and the replay variant.
+
         Parameters:
         ----------
-        input_log : EventLog
-            The input log in EventLog form (pm4py).
+        input_log : EventLog or VariantLog
+            The input log in EventLog form (pm4py) or as VariantLog.
         algorithm : AlgoPm4Py
             The process mining algorithm to be applied to the input log.
         variant : variants (optional)
             The variant of the replay algorithm to be used. Default is variants.extensive.
+        progress_callback : callable (optional)
+            Progress hook for the extensive playout, see `get_traces_with_replay`. Default is None.
+        progress_interval : int (optional)
+            Number of expanded states between two progress reports. Default is 10000.
 
         Returns:
         -------
@@ -48,24 +165,41 @@ class Comparison:
         """
         # Pipeline:
         # 1. Get footprint matrix from log
-        fpm_original = FootPrintMatrix(input_log)
-        fpm_original.generate_footprint()
-        # 2. Run algorithm on log
-        net, start, end = get_model_from_pm4py(input_log, algorithm)
-        # 3. Replay resulting model from algorithm
-        logs_replayed = get_traces_with_replay(net, start, end, variant)
-        # 4. Get footprint matrix from replayed log
-        fpm_replayed = FootPrintMatrix(logs_replayed)
-        fpm_replayed.generate_footprint()
+        log_key = self.cache.log_key(input_log)
+        fpm_original = self.get_log_footprint(input_log, log_key)
+
+        model_key = self.cache.model_key(log_key, algorithm, variant)
+        relations = self.cache.get(PipelineCache.REPLAYED_FOOTPRINT, model_key)
+        if relations is None:
+            # 2. Run algorithm on log
+            # 3. Replay resulting model from algorithm
+            # 4. Get footprint matrix from replayed log
+            model, relations = _discover_and_replay(
+                input_log,
+                algorithm,
+                variant,
+                self.cache.get(PipelineCache.MODEL, model_key),
+                progress_callback,
+                progress_interval,
+            )
+            self.cache.put(PipelineCache.MODEL, model_key, model)
+            self.cache.put(PipelineCache.REPLAYED_FOOTPRINT, model_key, relations)
+        fpm_replayed = FootPrintMatrix.from_relations(relations)
         return fpm_original, fpm_replayed
 
     def log_2_log(
-        self, event_log: str, algorithm: 'AlgoPm4Py'
+        self,
+        event_log: str,
+        algorithm: 'AlgoPm4Py',
+        folds: int = 4,
+        max_workers: int = None,
+        seed: int = None,
     ) -> List[Tuple[str, float]]:
         """
-        This function takes a log and an algorithm, splits it into multiple sublogs.
+        This function takes a log and an algorithm, splits it into k sublogs (folds).
         Next, after running the algorithm on each sublog, the resulting model is being replayed in order to get a new log.
         Finally, the resulting logs are being compared to the original log.
+        The folds are index views on one variant-compressed copy of the log and are processed in parallel worker processes.
 
 
         Parameters:
@@ -74,35 +208,66 @@ class Comparison:
             Path to the event log.
         algorithm: AlgoPm4Py
             Algorithm to be used.
+        folds: int
+            Number of sublogs. Default is 4.
+        max_workers: int
+            Maximum number of worker processes. Default is None (one per CPU), 1 runs everything in this process.
+        seed: int
+            Seed for the random split of the log. Default is None.
 
         Returns:
         -------
-        List of tuples, where each tuple contains the name of the sublog and the conformance value.
+        List of tuples, where each tuple contains the name of the sublog and the conformance value,
+        i.e. the distribution of the conformance values over all folds.
         """
+        variant_log = get_variant_log_from_file(event_log, self.cache)
+
+        # Split log into sublogs, each given by the number of traces per variant
+        fold_counts = [
+            variant_log.variant_counts(indices)
+            for indices in variant_log.split(folds, seed)
+        ]
+        model_keys = [
+            self.cache.model_key(
+                self.cache.variants_key(variant_log.named_variants(counts)),
+                algorithm,
+                variants.extensive,
+            )
+            for counts in fold_counts
+        ]
+        pending = [
+            i
+            for i, model_key in enumerate(model_keys)
+            if self.cache.get(PipelineCache.REPLAYED_FOOTPRINT, model_key) is None
+        ]
 
-        def split_log_into_sublogs(log):
-            sublogs = []
-            # Initial split to divide the log into two equal parts
-            split_1, split_2 = split_train_test.split(log, train_percentage=0.5)
-
-            # Further split each part into two sublogs
-            sublog_1, sublog_2 = split_train_test.split(split_1, train_percentage=0.5)
-            sublog_3, sublog_4 = split_train_test.split(split_2, train_percentage=0.5)
-
-            sublogs.extend([sublog_1, sublog_2, sublog_3, sublog_4])
-            return sublogs
-
-        log = get_log_from_file(event_log)
-
-        # Split log into sublogs. We use 4 sublogs for ease of use.
-        sublogs = split_log_into_sublogs(log)
+        # Run algorithm on each sublog
+        if len(pending) > 1 and max_workers != 1:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_fold_worker,
+                initargs=(variant_log,),
+            ) as executor:
+                futures = {
+                    i: executor.submit(_fold_pipeline, fold_counts[i], algorithm)
+                    for i in pending
+                }
+                results = {i: future.result() for i, future in futures.items()}
+        else:
+            results = {
+                i: _discover_and_replay(
+                    variant_log.to_event_log(fold_counts[i]), algorithm
+                )
+                for i in pending
+            }
+        for i, (model, relations) in results.items():
+            self.cache.put(PipelineCache.MODEL, model_keys[i], model)
+            self.cache.put(PipelineCache.REPLAYED_FOOTPRINT, model_keys[i], relations)
 
         replayed_logs = []
-        # Run algorithm on each sublog
-        for i, sublog in enumerate(sublogs):
-            # Run pipeline
-            footprint_of_log, footprint_of_replayed_log = self.pipeline(
-                sublog, algorithm
+        for i, model_key in enumerate(model_keys):
+            footprint_of_replayed_log = FootPrintMatrix.from_relations(
+                self.cache.get(PipelineCache.REPLAYED_FOOTPRINT, model_key)
             )
             visualize_sorted_dict(
                 footprint_of_replayed_log.relations, "l2l_{}".format(i)
@@ -110,7 +275,7 @@ class Comparison:
             replayed_logs.append(footprint_of_replayed_log)
 
         # Compare with original log
-        footprint_of_log, x = self.pipeline(log, algorithm)
+        footprint_of_log = self.get_log_footprint(variant_log)
         visualize_sorted_dict(footprint_of_log.relations, "l2l_original")
         comparison_values = []
         conformance_checking = ConformanceChecking()
@@ -140,7 +305,7 @@ class Comparison:
         -------
         Conformance value.
         """
-        log = get_log_from_file(event_log)
+        log = get_variant_log_from_file(event_log, self.cache)
 
         # Run pipeline
         footprint_of_log, footprint_of_replayed_log = self.pipeline(log, algorithm)
@@ -158,7 +323,11 @@ class Comparison:
         return result
 
     def model_2_model(
-        self, log: str, algorithms: List['AlgoPm4Py'], scenario: int
+        self,
+        log: str,
+        algorithms: List['AlgoPm4Py'],
+        scenario: int,
+        max_workers: int = None,
     ) -> Dict[str, float]:
         """
         This function takes a log, a list of algorithms and one of two scenarios.
@@ -166,6 +335,7 @@ class Comparison:
         The resulting logs are compared in dfferent ways, depending on the scenario.
         Scenario 1: Each log is compared to the original log.
         Scenario 2: Each log is compared to the other logs.
+        Discovery and replay of the algorithms that are not cached yet run in parallel worker processes.
 
         Parameters:
         ----------
@@ -176,28 +346,61 @@ class Comparison:
             List of algorithms to be used.
         scenario: number
             Scenario to be used.
+        max_workers: int
+            Maximum number of worker processes. Default is None (one per CPU), 1 runs everything in this process.
 
         Returns:
         -------
         Dictionary containing the comparison values.
         """
 
-        log_from_file = get_log_from_file(log)
+        log_from_file = get_variant_log_from_file(log, self.cache)
+        log_key = self.cache.log_key(log_from_file)
+        fpm_original = self.get_log_footprint(log_from_file, log_key)
+        visualize_sorted_dict(fpm_original.relations, "m2m_original")
+
+        model_keys = {
+            algorithm: self.cache.model_key(log_key, algorithm, variants.extensive)
+            for algorithm in algorithms
+        }
+        pending = [
+            algorithm
+            for algorithm in dict.fromkeys(algorithms)
+            if self.cache.get(PipelineCache.REPLAYED_FOOTPRINT, model_keys[algorithm])
+            is None
+        ]
+        if len(pending) > 1 and max_workers != 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    algorithm: executor.submit(
+                        _discover_and_replay, log_from_file, algorithm
+                    )
+                    for algorithm in pending
+                }
+                results = {
+                    algorithm: future.result() for algorithm, future in futures.items()
+                }
+        else:
+            results = {
+                algorithm: _discover_and_replay(log_from_file, algorithm)
+                for algorithm in pending
+            }
+        for algorithm, (model, relations) in results.items():
+            self.cache.put(PipelineCache.MODEL, model_keys[algorithm], model)
+            self.cache.put(
+                PipelineCache.REPLAYED_FOOTPRINT, model_keys[algorithm], relations
+            )
 
+        # Collect the footprints in the order of the given algorithms
         generated_fpms = {}
-        fpm_original = None
         for algorithm in algorithms:
-            pipeline_fpm_original, pipeline_fpm_replayed = self.pipeline(
-                log_from_file, algorithm
+            fpm_replayed = FootPrintMatrix.from_relations(
+                self.cache.get(PipelineCache.REPLAYED_FOOTPRINT, model_keys[algorithm])
             )
             visualize_sorted_dict(
-                pipeline_fpm_replayed.relations, "m2m_{}".format(str(algorithm))
+                fpm_replayed.relations, "m2m_{}".format(str(algorithm))
             )
-
-            generated_fpms[str(algorithm)] = pipeline_fpm_replayed
-            if fpm_original == None:
-                fpm_original = pipeline_fpm_original
-                visualize_sorted_dict(pipeline_fpm_original.relations, "m2m_original")
+            generated_fpms[str(algorithm)] = fpm_replayed
 
         comparison_values = {}
         if scenario == 1:
@@ -221,14 +424,14 @@ class Comparison:
         return comparison_values
 
 
-log_path = "InputLogs/L8.csv"
-
+if __name__ == "__main__":
+    log_path = "InputLogs/L8.csv"
 
-com = Comparison()
-print(
-    com.model_2_model(
-        log_path,
-        [AlgoPm4Py.ALPHA, AlgoPm4Py.ALPHAPLUS, AlgoPm4Py.INDUCTIVEMINER],
-        2,
+    com = Comparison()
+    print(
+        com.model_2_model(
+            log_path,
+            [AlgoPm4Py.ALPHA, AlgoPm4Py.ALPHAPLUS, AlgoPm4Py.INDUCTIVEMINER],
+            2,
+        )
     )
-)
@@ -92,9 +92,10 @@ class FootPrintMatrix:
 
         Parameters:
         ----------
-        log : list of dict
+        log : list of dict or VariantLog
             The event log to convert, where each trace is a list of events, and each
-            event is a dictionary with at least the 'concept:name' key.
+            event is a dictionary with at least the 'concept:name' key. For a VariantLog,
+            every variant is taken once, as duplicate traces do not change the footprint.
 
         Returns:
         -------
@@ -102,6 +103,12 @@ class FootPrintMatrix:
             A dictionary where keys are trace numbers (as strings) and values are lists
             of activity names.
         """
+        if hasattr(log, "named_variants"):
+            return {
+                str(trace_num): list(variant)
+                for trace_num, (variant, _) in enumerate(log.named_variants(), start=1)
+            }
+
         traces = {}
         trace_num = 1
 
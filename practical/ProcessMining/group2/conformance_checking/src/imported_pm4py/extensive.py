@@ -16,10 +16,10 @@
 """
 import datetime
 import sys
+import time
 from collections import Counter
 from enum import Enum
-from typing import Optional, Dict, Any, Union
-from tqdm import tqdm
+from typing import Optional, Dict, Any, Union, NamedTuple
 
 from pm4py.objects import petri_net
 from pm4py.objects.log import obj as log_instance
@@ -39,6 +39,15 @@ class Parameters(Enum):
     RETURN_ELEMENTS = "return_elements"
     MAX_MARKING_OCC = "max_marking_occ"
     PETRI_SEMANTICS = "petri_semantics"
+    PROGRESS_CALLBACK = "progress_callback"
+    PROGRESS_INTERVAL = "progress_interval"
+
+
+class PlayoutProgress(NamedTuple):
+    states_expanded: int
+    frontier_size: int
+    visited_size: int
+    states_per_second: float
 
 
 POSITION_MARKING = 0
@@ -46,6 +55,12 @@ POSITION_TRACE = 1
 POSITION_ELEMENTS = 2
 
 
+def _get_progress(states_expanded, to_visit, visited, start_time) -> PlayoutProgress:
+    elapsed = time.perf_counter() - start_time
+    states_per_second = states_expanded / elapsed if elapsed > 0 else 0.0
+    return PlayoutProgress(states_expanded, len(to_visit), len(visited), states_per_second)
+
+
 def apply(net: PetriNet, initial_marking: Marking, final_marking: Marking = None,
           parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> EventLog:
     """
@@ -64,6 +79,9 @@ def apply(net: PetriNet, initial_marking: Marking, final_marking: Marking = None
         Parameters of the algorithm:
             Parameters.MAX_TRACE_LENGTH -> Maximum trace length
             Parameters.PETRI_SEMANTICS -> Petri net semantics
+            Parameters.PROGRESS_CALLBACK -> Callable receiving a PlayoutProgress every
+                PROGRESS_INTERVAL states and once when the playout is finished (default: None, no reporting)
+            Parameters.PROGRESS_INTERVAL -> Number of states between two progress reports (default: 10000)
     """
     if parameters is None:
         parameters = {}
@@ -76,6 +94,8 @@ def apply(net: PetriNet, initial_marking: Marking, final_marking: Marking = None
     return_elements = exec_utils.get_param_value(Parameters.RETURN_ELEMENTS, parameters, False)
     max_marking_occ = exec_utils.get_param_value(Parameters.MAX_MARKING_OCC, parameters, sys.maxsize)
     semantics = exec_utils.get_param_value(Parameters.PETRI_SEMANTICS, parameters, petri_net.semantics.ClassicSemantics())
+    progress_callback = exec_utils.get_param_value(Parameters.PROGRESS_CALLBACK, parameters, None)
+    progress_interval = max(1, exec_utils.get_param_value(Parameters.PROGRESS_INTERVAL, parameters, 10000))
 
     # assigns to each event an increased timestamp from 1970
     curr_timestamp = 10000000
@@ -85,12 +105,15 @@ def apply(net: PetriNet, initial_marking: Marking, final_marking: Marking = None
     to_visit = [(initial_marking, (), ())]
     visited = set()
 
-    # Initialize tqdm progress bar
-    pbar = tqdm(total=len(to_visit), desc="Processing states", unit="state")
+    states_expanded = 0
+    start_time = time.perf_counter()
 
     while len(to_visit) > 0:
         state = to_visit.pop(0)
-        pbar.update(1)  # Update progress bar
+        states_expanded += 1
+        # Only touch the clock when a report is actually due
+        if progress_callback is not None and states_expanded % progress_interval == 0:
+            progress_callback(_get_progress(states_expanded, to_visit, visited, start_time))
 
         m = state[POSITION_MARKING]
         trace = state[POSITION_TRACE]
@@ -126,9 +149,9 @@ def apply(net: PetriNet, initial_marking: Marking, final_marking: Marking = None
             if new_state in visited or len(new_trace) > max_trace_length:
                 continue
             to_visit.append(new_state)
-            pbar.total = len(to_visit) + pbar.n  # Adjust the total length of the progress bar
 
-    pbar.close()  # Close the progress bar
+    if progress_callback is not None:
+        progress_callback(_get_progress(states_expanded, to_visit, visited, start_time))
 
     if return_elements:
         return feasible_elements
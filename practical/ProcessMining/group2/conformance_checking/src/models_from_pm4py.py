@@ -1,9 +1,15 @@
 import csv
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
 import pm4py
 from pm4py.objects.log.obj import EventLog, Trace, Event
 from enum import Enum
 from pm4py.objects.log.importer.xes import importer
+from pipeline_cache import PipelineCache
+from variant_log import VariantLog
 
 FILE_DIR = os.path.dirname(__file__)
 
@@ -15,7 +21,7 @@ class AlgoPm4Py(Enum):
     HEURISTICMINER = 4
 
 
-def get_log_from_file(file_path="InputLogs/L1.csv"):
+def get_log_from_file(file_path="InputLogs/L1.csv", cache=None):
     """
     Load an event log from a file.
 
@@ -27,15 +33,20 @@ def get_log_from_file(file_path="InputLogs/L1.csv"):
     ----------
     file_path : str, optional
         The path to the log file. Default is "InputLogs/L1.csv".
+    cache : PipelineCache, optional
+        Cache for the parsed log, keyed by the path, modification time and content of the
+        file. Default is None (parse the file on every call).
 
     Returns:
     -------
     EventLog
         The loaded event log.
     """
-
     file_path = os.path.join(FILE_DIR, "..", file_path)
+    return _load_cached(cache, PipelineCache.EVENT_LOG, file_path, _read_log)
 
+
+def _read_log(file_path):
     if file_path.endswith(".xes"):
         log = importer.apply(file_path)
     else:
@@ -61,6 +72,48 @@ def get_log_from_file(file_path="InputLogs/L1.csv"):
     return log
 
 
+def get_variant_log_from_file(file_path="InputLogs/L1.csv", cache=None):
+    """
+    Load an event log from a file as an integer-coded VariantLog.
+
+    Other than `get_log_from_file`, .csv files are read in bulk without creating pm4py
+    objects per event. .xes files are imported with the `importer` and compressed afterwards.
+
+    Parameters:
+    ----------
+    file_path : str, optional
+        The path to the log file. Default is "InputLogs/L1.csv".
+    cache : PipelineCache, optional
+        Cache for the parsed log, keyed by the path, modification time and content of the
+        file. Default is None (parse the file on every call).
+
+    Returns:
+    -------
+    VariantLog
+        The loaded event log.
+    """
+    file_path = os.path.join(FILE_DIR, "..", file_path)
+    return _load_cached(cache, PipelineCache.VARIANT_LOG, file_path, _read_variant_log)
+
+
+def _read_variant_log(file_path):
+    if file_path.endswith(".xes"):
+        return VariantLog.from_event_log(_read_log(file_path))
+    return VariantLog.from_csv(file_path)
+
+
+def _load_cached(cache, kind, file_path, read):
+    # Parse the file only if the cache has no entry for its current content
+    if cache is None:
+        return read(file_path)
+    key = cache.file_key(file_path)
+    log = cache.get(kind, key)
+    if log is None:
+        log = read(file_path)
+        cache.put(kind, key, log)
+    return log
+
+
 def get_model_from_pm4py(
     log,
     algorithm: AlgoPm4Py = AlgoPm4Py.ALPHAPLUS,
@@ -73,8 +126,9 @@ def get_model_from_pm4py(
 
     Parameters:
     ----------
-    log : EventLog
+    log : EventLog or VariantLog
         The event log from which to discover the Petri net model.
+        A VariantLog is converted to an EventLog first.
     algorithm : AlgoPm4Py, optional
         The process mining algorithm to use for discovery. Default is AlgoPm4Py.ALPHAPLUS.
 
@@ -83,6 +137,8 @@ def get_model_from_pm4py(
     tuple
         A tuple containing the discovered Petri net, initial marking, and final marking.
     """
+    if hasattr(log, "to_event_log"):
+        log = log.to_event_log()
     if algorithm == AlgoPm4Py.ALPHA:
         return pm4py.discover_petri_net_alpha(log)
     elif algorithm == AlgoPm4Py.ALPHAPLUS:
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import Counter
+
+
+class PipelineCache:
+    """
+    Content-addressed cache for the intermediate results of `Comparison.pipeline`.
+
+    Entries are keyed by a hash of the log's variant multiset, so two logs with the
+    same variants and frequencies share their entries, no matter how they were loaded.
+    Discovered models and playout footprints additionally include the algorithm and
+    the playout variant in their key. Logs imported from files are keyed by the file,
+    see `file_key`, so a log file is only parsed once. Entries are kept in memory and, if `cache_dir`
+    is given, also pickled to disk so that they survive across runs. Pickled entries are loaded
+    as they are, so only use a `cache_dir` that nobody else can write to.
+    """
+
+    LOG_FOOTPRINT = "log_fpm"
+    MODEL = "model"
+    REPLAYED_FOOTPRINT = "replayed_fpm"
+    EVENT_LOG = "event_log"
+    VARIANT_LOG = "variant_log"
+
+    def __init__(self, cache_dir=None):
+        """
+        Initialize a PipelineCache instance.
+
+        Parameters:
+        ----------
+        cache_dir : str, optional
+            Directory to persist cache entries in. Default is None (memory only).
+            The entries are unpickled on load, only point it at a trusted directory.
+        """
+        self.cache_dir = cache_dir
+        self.entries = {}
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def log_key(log):
+        """
+        Compute the content hash of an event log.
+
+        Parameters:
+        ----------
+        log : EventLog or VariantLog
+            The event log to hash.
+
+        Returns:
+        -------
+        str
+            Hex digest over the sorted variant multiset of the log.
+        """
+        if hasattr(log, "named_variants"):
+            return PipelineCache.variants_key(log.named_variants())
+        variants = Counter(
+            tuple(event["concept:name"] for event in trace) for trace in log
+        )
+        return PipelineCache.variants_key(variants.items())
+
+    @staticmethod
+    def variants_key(variants):
+        """
+        Compute the content hash of a variant multiset.
+
+        Parameters:
+        ----------
+        variants : iterable of tuple
+            (variant as tuple of activity names, count) pairs.
+
+        Returns:
+        -------
+        str
+            Hex digest over the sorted variant multiset.
+        """
+        payload = json.dumps(sorted(variants))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def file_key(file_path):
+        """
+        Compute the key of a log file from its path, modification time and content.
+
+        Parameters:
+        ----------
+        file_path : str
+            The path to the log file.
+
+        Returns:
+        -------
+        str
+            Hex digest that changes whenever the file is moved, touched or edited.
+        """
+        content_hash = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                content_hash.update(chunk)
+        payload = "{}|{}|{}".format(
+            os.path.abspath(file_path),
+            os.stat(file_path).st_mtime_ns,
+            content_hash.hexdigest(),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def model_key(log_key, algorithm, variant):
+        """
+        Combine a log hash with the parameters of a discovery and playout run.
+
+        Parameters:
+        ----------
+        log_key : str
+            Hash of the input log, see `log_key`.
+        algorithm : AlgoPm4Py
+            The process mining algorithm.
+        variant : module
+            The playout variant.
+
+        Returns:
+        -------
+        str
+            Hex digest identifying the run.
+        """
+        payload = "{}|{}|{}".format(log_key, str(algorithm), variant.__name__)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, kind, key):
+        return os.path.join(self.cache_dir, "{}_{}.pkl".format(key, kind))
+
+    def get(self, kind, key):
+        """
+        Look up a cache entry, falling back to disk if it is not held in memory.
+
+        Parameters:
+        ----------
+        kind : str
+            Entry type, one of LOG_FOOTPRINT, MODEL, REPLAYED_FOOTPRINT, EVENT_LOG or VARIANT_LOG.
+        key : str
+            Hash of the entry.
+
+        Returns:
+        -------
+        object
+            The cached value or None if there is no entry.
+        """
+        if (kind, key) in self.entries:
+            return self.entries[(kind, key)]
+        if self.cache_dir is not None and os.path.exists(self._path(kind, key)):
+            with open(self._path(kind, key), "rb") as file:
+                value = pickle.load(file)
+            self.entries[(kind, key)] = value
+            return value
+        return None
+
+    def put(self, kind, key, value):
+        """
+        Store a cache entry in memory and, if configured, on disk.
+
+        Parameters:
+        ----------
+        kind : str
+            Entry type, one of LOG_FOOTPRINT, MODEL, REPLAYED_FOOTPRINT, EVENT_LOG or VARIANT_LOG.
+        key : str
+            Hash of the entry.
+        value : object
+            Picklable value to store.
+        """
+        self.entries[(kind, key)] = value
+        if self.cache_dir is not None:
+            with open(self._path(kind, key), "wb") as file:
+                pickle.dump(value, file)
+
+    def clear(self):
+        """
+        Drop all in-memory entries. Files on disk are kept.
+        """
+        self.entries = {}
@@ -4,7 +4,14 @@ import imported_pm4py.basic_playout as basic
 from pm4py.algo.simulation.playout.petri_net import variants
 
 
-def get_traces_with_replay(net, start, end, variant=variants.extensive):
+def get_traces_with_replay(
+    net,
+    start,
+    end,
+    variant=variants.extensive,
+    progress_callback=None,
+    progress_interval=10000,
+):
     """
     Replay a Petri net to obtain traces using the specified replay variant.
 
@@ -21,15 +28,24 @@ def get_traces_with_replay(net, start, end, variant=variants.extensive):
         The final marking of the Petri net.
     variant : variants, optional
         The variant of the replay algorithm to use. Default is variants.extensive.
+    progress_callback : callable, optional
+        Called with an `extensive.PlayoutProgress` (states expanded, frontier size,
+        visited-set size, states per second) every `progress_interval` states of the
+        extensive playout. Default is None, which disables progress reporting.
+    progress_interval : int, optional
+        Number of expanded states between two progress reports. Default is 10000.
 
     Returns:
     -------
     list
         The replayed traces obtained from the Petri net.
     """
-    print("Replaying Petri Net with TQDM")
     if variant == variants.basic_playout:
         playout = basic.apply(net, start, end)
     else:
-        playout = extensive.apply(net, start, end)
+        parameters = {
+            extensive.Parameters.PROGRESS_CALLBACK: progress_callback,
+            extensive.Parameters.PROGRESS_INTERVAL: progress_interval,
+        }
+        playout = extensive.apply(net, start, end, parameters=parameters)
     return playout
@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+from pm4py.objects.log.obj import EventLog, Trace, Event
+
+
+class VariantLog:
+    """
+    Variant-compressed, integer-coded event log.
+
+    Every distinct trace (variant) is stored once as a tuple of activity codes and every
+    trace of the log only as the index of its variant. Sublogs are represented as index
+    arrays into the traces of this log, so splitting never copies any trace.
+    The pm4py representation is only built on demand, see `to_event_log`.
+    """
+
+    def __init__(self, activities, variants, trace_variants):
+        """
+        Initialize a VariantLog instance.
+
+        Parameters:
+        ----------
+        activities : list of str
+            Activity names, indexed by activity code.
+        variants : list of tuple of int
+            Distinct traces as tuples of activity codes.
+        trace_variants : np.ndarray
+            Variant index of every trace in the log, in log order.
+        """
+        self.activities = activities
+        self.variants = variants
+        self.trace_variants = np.asarray(trace_variants, dtype=np.int64)
+        self._event_log = None
+
+    def __len__(self):
+        return len(self.trace_variants)
+
+    def __getstate__(self):
+        # Do not send the pm4py representation to worker processes, it is rebuilt there on demand
+        state = self.__dict__.copy()
+        state["_event_log"] = None
+        return state
+
+    @classmethod
+    def from_csv(cls, file_path):
+        """
+        Read a log from a CSV file with `case id, activity` rows without a header.
+
+        Consecutive rows with the same case id form a trace. The file is read and
+        integer-coded in bulk; only the trace boundaries are iterated in Python.
+
+        Parameters:
+        ----------
+        file_path : str
+            The path to the CSV file.
+
+        Returns:
+        -------
+        VariantLog
+            The variant-compressed log.
+        """
+        try:
+            data = pd.read_csv(
+                file_path,
+                header=None,
+                names=["case", "activity"],
+                dtype=str,
+                keep_default_na=False,
+            )
+        except pd.errors.EmptyDataError:
+            return cls([], [], [])
+        codes, activities = pd.factorize(data["activity"])
+        cases = data["case"].to_numpy()
+        starts = np.flatnonzero(np.r_[True, cases[1:] != cases[:-1]])
+        bounds = starts.tolist() + [len(codes)]
+        codes = codes.tolist()
+
+        variant_ids = {}
+        trace_variants = np.fromiter(
+            (
+                variant_ids.setdefault(tuple(codes[start:end]), len(variant_ids))
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ),
+            dtype=np.int64,
+            count=len(starts),
+        )
+        return cls(activities.tolist(), list(variant_ids), trace_variants)
+
+    @classmethod
+    def from_event_log(cls, log):
+        """
+        Create a VariantLog from a pm4py event log.
+
+        Parameters:
+        ----------
+        log : EventLog
+            The event log (pm4py) to compress.
+
+        Returns:
+        -------
+        VariantLog
+            The variant-compressed log.
+        """
+        activity_codes = {}
+        variant_ids = {}
+        trace_variants = np.empty(len(log), dtype=np.int64)
+        for i, trace in enumerate(log):
+            variant = tuple(
+                activity_codes.setdefault(event["concept:name"], len(activity_codes))
+                for event in trace
+            )
+            trace_variants[i] = variant_ids.setdefault(variant, len(variant_ids))
+        return cls(list(activity_codes), list(variant_ids), trace_variants)
+
+    def variant_counts(self, indices=None):
+        """
+        Count the variants of the log or of a sublog.
+
+        Parameters:
+        ----------
+        indices : np.ndarray, optional
+            Trace indices of a sublog. Default is None (the whole log).
+
+        Returns:
+        -------
+        np.ndarray
+            Number of traces per variant index.
+        """
+        trace_variants = (
+            self.trace_variants if indices is None else self.trace_variants[indices]
+        )
+        return np.bincount(trace_variants, minlength=len(self.variants))
+
+    def named_variants(self, counts=None):
+        """
+        List the variant multiset of the log (or of a sublog) with activity names.
+
+        Parameters:
+        ----------
+        counts : np.ndarray, optional
+            Number of traces per variant index. Default is None (the whole log).
+
+        Returns:
+        -------
+        list of tuple
+            (variant as tuple of activity names, count) for every variant that occurs.
+        """
+        if counts is None:
+            counts = self.variant_counts()
+        return [
+            (tuple(self.activities[code] for code in variant), int(count))
+            for variant, count in zip(self.variants, counts)
+            if count > 0
+        ]
+
+    def split(self, folds, seed=None):
+        """
+        Randomly split the traces of the log into k folds of (almost) equal size.
+
+        Parameters:
+        ----------
+        folds : int
+            Number of folds.
+        seed : int, optional
+            Seed of the random permutation. Default is None.
+
+        Returns:
+        -------
+        list of np.ndarray
+            Trace indices of every fold.
+        """
+        if not 1 <= folds <= len(self):
+            raise ValueError(
+                "Number of folds must be between 1 and the number of traces ({})".format(
+                    len(self)
+                )
+            )
+        permutation = np.random.default_rng(seed).permutation(len(self))
+        return np.array_split(permutation, folds)
+
+    def to_event_log(self, counts=None):
+        """
+        Convert the log (or a sublog given by its variant counts) to a pm4py event log.
+
+        One Trace object is created per variant and shared by all of its occurrences.
+        The conversion of the whole log is done once and then reused.
+
+        Parameters:
+        ----------
+        counts : np.ndarray, optional
+            Number of traces per variant index. Default is None (the whole log).
+
+        Returns:
+        -------
+        EventLog
+            The event log (pm4py).
+        """
+        if counts is None:
+            if self._event_log is None:
+                self._event_log = self.to_event_log(self.variant_counts())
+            return self._event_log
+        log = EventLog()
+        for variant_index, count in enumerate(counts):
+            if count == 0:
+                continue
+            trace = Trace(
+                [
+                    Event({"concept:name": self.activities[code]})
+                    for code in self.variants[variant_index]
+                ]
+            )
+            trace.attributes["concept:name"] = str(variant_index)
+            for _ in range(count):
+                log.append(trace)
+        return log
@@ -52,3 +52,4 @@ def visualize_sorted_dict(sorted_dict, name):
     plt.title('Footprint Matrix {}'.format(name), fontsize=22)
     # plt.show()
     plt.savefig(OUTPUT_DIR + '/fpm_{}.png'.format(name))
+    plt.close(fig)
@@ -1,5 +1,8 @@
 import os
 import sys
+from collections import Counter
+
+import pytest
 
 SCRIPT_DIR = os.path.dirname(__file__)
 sys.path.append(os.path.join(SCRIPT_DIR, ".."))
@@ -20,6 +23,20 @@ from src.visualize_matrix import (
     visualize_sorted_dict,
 )
 from src.comparison import Comparison, AlgoPm4Py
+from src.pipeline_cache import PipelineCache
+from src.variant_log import VariantLog
+from src.models_from_pm4py import get_log_from_file, get_variant_log_from_file
+import src.visualize_matrix
+
+
+@pytest.fixture(autouse=True)
+def plot_dir(tmp_path_factory, monkeypatch):
+    # Save the footprint plots of the tests in a temporary directory, not in the tracked footprintmatrix_plots
+    # src.comparison imports the module as `visualize_matrix`, so both module objects are patched
+    output_dir = tmp_path_factory.mktemp("footprintmatrix_plots")
+    for module in (src.visualize_matrix, sys.modules["visualize_matrix"]):
+        monkeypatch.setattr(module, "OUTPUT_DIR", str(output_dir))
+    return output_dir
 
 
 def test_cf():
@@ -211,6 +228,80 @@ def test_log_2_log():
         assert 0 <= comparison_value <= 1
 
 
+def test_log_2_log_k_fold():
+    log_path = "InputLogs/L1.csv"
+    serial = Comparison().log_2_log(
+        log_path, AlgoPm4Py.ALPHA, folds=6, max_workers=1, seed=0
+    )
+    parallel = Comparison().log_2_log(
+        log_path, AlgoPm4Py.ALPHA, folds=6, max_workers=2, seed=0
+    )
+    assert [sublog for sublog, _ in serial] == [f"sublog_{i}" for i in range(6)]
+    assert parallel == serial
+    for sublog, comparison_value in serial:
+        assert 0 <= comparison_value <= 1
+
+
+def test_variant_log():
+    log = get_log_from_file("InputLogs/L1.csv")
+    variant_log = VariantLog.from_event_log(log)
+    assert len(variant_log) == len(log)
+    variants = Counter(
+        tuple(event['concept:name'] for event in trace) for trace in log
+    )
+    assert sorted(variant_log.named_variants()) == sorted(variants.items())
+
+    folds = variant_log.split(4, seed=1)
+    assert sorted(i for fold in folds for i in fold) == list(range(len(log)))
+    assert sum(variant_log.variant_counts(fold).sum() for fold in folds) == len(log)
+
+    sublog = variant_log.to_event_log(variant_log.variant_counts(folds[0]))
+    assert len(sublog) == len(folds[0])
+    assert PipelineCache.log_key(sublog) == PipelineCache.variants_key(
+        variant_log.named_variants(variant_log.variant_counts(folds[0]))
+    )
+
+
+def test_get_variant_log_from_file():
+    for log_path in ["InputLogs/L1.csv", "InputLogs/L9.csv"]:
+        log = get_log_from_file(log_path)
+        variant_log = get_variant_log_from_file(log_path)
+        expected = VariantLog.from_event_log(log)
+        assert len(variant_log) == len(log)
+        assert variant_log.named_variants() == expected.named_variants()
+        assert [variant_log.variants[i] for i in variant_log.trace_variants] == [
+            expected.variants[i] for i in expected.trace_variants
+        ]
+
+        fpm_log = FootPrintMatrix(log)
+        fpm_log.generate_footprint()
+        fpm_variant_log = FootPrintMatrix(variant_log)
+        fpm_variant_log.generate_footprint()
+        assert fpm_variant_log.relations == fpm_log.relations
+
+    # The pm4py representation is built once on demand
+    event_log = variant_log.to_event_log()
+    assert event_log is variant_log.to_event_log()
+    assert PipelineCache.log_key(event_log) == PipelineCache.log_key(variant_log)
+
+
+def test_log_file_cache(tmp_path):
+    cache = PipelineCache(str(tmp_path))
+    log_path = "InputLogs/pdc2023_000000.xes"
+    variant_log = get_variant_log_from_file(log_path, cache)
+    assert len(os.listdir(tmp_path)) == 1
+
+    # A new cache on the same directory reads the log from disk instead of parsing the file
+    cached = get_variant_log_from_file(log_path, PipelineCache(str(tmp_path)))
+    assert cached is not variant_log
+    assert cached.named_variants() == variant_log.named_variants()
+    assert cached.trace_variants.tolist() == variant_log.trace_variants.tolist()
+
+    log = get_log_from_file("InputLogs/L1.csv", cache)
+    assert get_log_from_file("InputLogs/L1.csv", cache) is log
+    assert len(os.listdir(tmp_path)) == 2
+
+
 def test_log_2_model():
     log_path = "InputLogs/L1.csv"
     comparison = Comparison()
@@ -258,3 +349,85 @@ def test_model_2_model_scenario_2():
         'AlgoPm4Py.ALPHAPLUS vs. AlgoPm4Py.INDUCTIVEMINER': 1.0,
         'AlgoPm4Py.HEURISTICMINER vs. AlgoPm4Py.INDUCTIVEMINER': 1.0,
     }
+
+
+def test_pipeline_progress_callback():
+    input_log = EventLog()
+    for trace_id, activities in enumerate([['a', 'b', 'c'], ['a', 'c', 'b']]):
+        trace = Trace()
+        trace.attributes['concept:name'] = str(trace_id)
+        for activity in activities:
+            trace.append(Event({'concept:name': activity}))
+        input_log.append(trace)
+
+    progress = []
+    comparison = Comparison()
+    comparison.pipeline(
+        input_log,
+        AlgoPm4Py.ALPHA,
+        progress_callback=progress.append,
+        progress_interval=2,
+    )
+
+    assert len(progress) > 1
+    # Periodic reports every 2 states, followed by one final report
+    assert [p.states_expanded for p in progress[:-1]] == list(
+        range(2, 2 * len(progress) - 1, 2)
+    )
+    final = progress[-1]
+    assert final.frontier_size == 0
+    assert 0 < final.visited_size <= final.states_expanded
+    assert final.states_per_second >= 0
+
+
+def test_pipeline_cache(tmp_path):
+    def build_log(traces):
+        log = EventLog()
+        for trace_id, activities in enumerate(traces):
+            trace = Trace()
+            trace.attributes['concept:name'] = str(trace_id)
+            for activity in activities:
+                trace.append(Event({'concept:name': activity}))
+            log.append(trace)
+        return log
+
+    log_1 = build_log([['a', 'b', 'c'], ['a', 'c', 'b'], ['a', 'b', 'c']])
+    # Same variant multiset in a different order
+    log_2 = build_log([['a', 'c', 'b'], ['a', 'b', 'c'], ['a', 'b', 'c']])
+    log_3 = build_log([['a', 'b', 'c']])
+    assert PipelineCache.log_key(log_1) == PipelineCache.log_key(log_2)
+    assert PipelineCache.log_key(log_1) != PipelineCache.log_key(log_3)
+
+    cache = PipelineCache(cache_dir=str(tmp_path))
+    comparison = Comparison(cache)
+    fpm_original, fpm_replayed = comparison.pipeline(log_1, AlgoPm4Py.ALPHA)
+    assert len(cache.entries) == 3
+    comparison.pipeline(log_2, AlgoPm4Py.ALPHA)
+    assert len(cache.entries) == 3
+    comparison.pipeline(log_2, AlgoPm4Py.INDUCTIVEMINER)
+    assert len(cache.entries) == 5
+
+    # A new cache on the same directory reads the entries back from disk
+    cached_comparison = Comparison(PipelineCache(cache_dir=str(tmp_path)))
+    cached_original, cached_replayed = cached_comparison.pipeline(
+        log_1, AlgoPm4Py.ALPHA
+    )
+    assert cached_original.relations == fpm_original.relations
+    assert cached_replayed.relations == fpm_replayed.relations
+
+
+def test_model_2_model_parallel_matches_serial():
+    log_path = "InputLogs/L1.csv"
+    algorithms = [
+        AlgoPm4Py.INDUCTIVEMINER,
+        AlgoPm4Py.ALPHA,
+        AlgoPm4Py.HEURISTICMINER,
+    ]
+    serial = Comparison().model_2_model(log_path, algorithms, 2, max_workers=1)
+    parallel = Comparison().model_2_model(log_path, algorithms, 2, max_workers=3)
+    assert list(parallel.items()) == list(serial.items())
+    assert list(parallel.keys()) == [
+        'AlgoPm4Py.INDUCTIVEMINER vs. AlgoPm4Py.ALPHA',
+        'AlgoPm4Py.INDUCTIVEMINER vs. AlgoPm4Py.HEURISTICMINER',
+        'AlgoPm4Py.ALPHA vs. AlgoPm4Py.HEURISTICMINER',
+    ]
@@ -1,18 +1,99 @@
 import os
 import copy
-import itertools
+from collections import Counter
 from practical.ProcessMining.group2.inductive_miner.src.graph_utils import *
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
 class EventLog:
-    def __init__(self, traces: Dict[str, int]):
+    def __init__(self, traces: Dict[str, int], activities: Optional[List[str]] = None):
         """
         Initialize EventLog object.
 
-        :param traces: Dictionary where keys are traces and values are counts.
+        :param traces: Dictionary where keys are traces (strings of single character activities or
+                       tuples of activities) and values are counts.
+        :param activities: Optional list of already known activities, the index of an activity is its code.
         """
-        self.traces = traces
+        self._traces = traces
+        self.activities = [] if activities is None else activities  # Activity names, indexed by code
+        self.codes = {activity: code for code, activity in enumerate(self.activities)}
+        # Multiset of variants, every trace as tuple of activity codes
+        self.variants = Counter()
+        for trace, count in traces.items():
+            self.variants[self.encode(trace)] += count
+
+    @classmethod
+    def from_variants(cls, variants: Counter, activities: Optional[List[str]] = None) -> 'EventLog':
+        """
+        Create an EventLog object from a multiset of tuple-encoded traces, e.g. a sublog of a split.
+
+        :param variants: Counter where keys are tuples of activities and values are counts.
+        :param activities: Activity names of the codes in variants. If None, the variants contain activity names.
+        :return: EventLog object.
+        """
+        if activities is None:
+            return EventLog(variants)
+        event_log = EventLog({}, activities)
+        event_log._traces = None
+        event_log.variants = variants
+        return event_log
+
+    @property
+    def traces(self) -> Dict[str, int]:
+        """
+        Traces of the log, as given or decoded from the variants for sublogs.
+        """
+        if self._traces is None:
+            self._traces = self.decode(self.variants)
+        return self._traces
+
+    def encode(self, trace) -> Tuple[int, ...]:
+        """
+        Encode a trace as tuple of activity codes, unknown activities get the next free code.
+
+        :param trace: String or sequence of activities.
+        :return: Tuple of activity codes.
+        """
+        codes = []
+        for activity in trace:
+            code = self.codes.get(activity)
+            if code is None:
+                code = self.codes[activity] = len(self.activities)
+                self.activities.append(activity)
+            codes.append(code)
+        return tuple(codes)
+
+    def decode(self, variants: Counter) -> Counter:
+        """
+        Decode a multiset of tuple-encoded traces to activity names.
+
+        :param variants: Counter where keys are tuples of activity codes and values are counts.
+        :return: Counter where keys are tuples of activities and values are counts.
+        """
+        return Counter({tuple(self.activities[code] for code in variant): count
+                        for variant, count in variants.items()})
+
+    def named_variants(self) -> Counter:
+        """
+        Get the variants of the log with activity names.
+
+        :return: Counter where keys are tuples of activities and values are counts.
+        """
+        return self.decode(self.variants)
+
+    def cut_map(self, cuts: List[List[str]]) -> List[int]:
+        """
+        Map every activity code to the index of the cut containing it.
+
+        :param cuts: List of lists representing cuts.
+        :return: List with the cut index of every activity code, -1 for activities that are in no cut.
+        """
+        cut_map = [-1] * len(self.activities)
+        for i, cut in enumerate(cuts):
+            for activity in cut:
+                if activity in self.codes:
+                    cut_map[self.codes[activity]] = i
+        return cut_map
 
     @classmethod
     def from_file(cls, file_path: str = None) -> 'EventLog':
@@ -46,7 +127,10 @@ class DirectlyFollowsGraph(Graph):
 
     def construct_dfg(self) -> None:
         """Construct Directly Follows Graph."""
-        for trace in self.event_log.traces.keys():
+        edges = set()  # Set of added edges, avoids scanning the adjacency lists
+        activities = self.event_log.activities
+        for variant in self.event_log.variants.keys():
+            trace = [activities[code] for code in variant]
             if trace:  # Check if trace is not empty
                 self.start_nodes.add(trace[0])  # First activity in trace is a start
                 self.end_nodes.add(trace[-1])  # Last activity in trace is an end
@@ -55,7 +139,8 @@ class DirectlyFollowsGraph(Graph):
                     current_activity = trace[i]
                     next_activity = trace[i + 1]
 
-                    if next_activity not in self.graph[current_activity]:
+                    if (current_activity, next_activity) not in edges:
+                        edges.add((current_activity, next_activity))
                         self.graph[current_activity].append(next_activity)
                     if (next_activity not in self.graph):  # Add next activity to graph if not already present, i.e. if it is an end node
                         self.graph[next_activity] = []
@@ -65,6 +150,7 @@ class DirectlyFollowsGraph(Graph):
                         self.graph[node] = []
             else:
                 self.graph[''] = [] # Add tau node for empty traces
+        self.invalidate_closure()
 
     def __str__(self) -> str:
         """Represent Directly Follows Graph as string."""
@@ -80,6 +166,7 @@ class ProcessTree:
         self.event_log = event_log
         self.root = None
         self.children = []
+        self.tree = None  # Mined tree, computed once by construct_process_tree
 
     def find_base_case(self) -> str:
         """
@@ -87,14 +174,14 @@ class ProcessTree:
 
         :return: Base case activity or None.
         """
-        if len(self.event_log.traces) == 0:
+        if len(self.event_log.variants) == 0:
             return 'tau'
-        elif len(self.event_log.traces) == 1:
-            only_trace = next(iter(self.event_log.traces))
-            if only_trace == "":
+        elif len(self.event_log.variants) == 1:
+            only_trace = next(iter(self.event_log.variants))
+            if len(only_trace) == 0:
                 return 'tau'
             elif len(only_trace) == 1:
-                return only_trace
+                return self.event_log.activities[only_trace[0]]
         return None
 
     def find_exclusive_choice_cut(self, dfg: DirectlyFollowsGraph) -> List[List[str]]:
@@ -115,83 +202,92 @@ class ProcessTree:
         """
         Find sequence cut.
 
+        The strongly connected components are condensed to a DAG and visited in topological order.
+        Components that are pairwise unreachable are merged with union-find, the resulting groups
+        are the cuts in sequence order.
+
         :param dfg: DirectlyFollowsGraph object.
         :return: List of lists representing cuts.
         """
-        def is_skippable(p: int, cuts: list) -> bool:
+        def find_skippable(cuts: List[List[str]]) -> List[bool]:
             """
-            Check if a cut is skippable (according to strict sequence cut detection).
-            .This can be helpful if optionality in sequence is present
+            Check for each cut if it is skippable (according to strict sequence cut detection), i.e. if an
+            edge jumps over it, an end node lies before it or a start node lies after it.
+            This can be helpful if optionality in sequence is present
 
-            :param p: Index of the cut.
-            :param cuts: List of cuts.
-            :return: True if the cut is skippable, False otherwise.
+            :param cuts: List of cuts in sequence order.
+            :return: List with True for every skippable cut.
             """
-            edges = dfg.get_all_edges()
-            for i, j in itertools.product(range(p), range(p + 1, len(sorted_cuts))):
-                for node1, node2 in itertools.product(sorted_cuts[i], sorted_cuts[j]):
-                    transitive_edge = (node1, node2)
-                    if (transitive_edge in edges 
-                        or node1 in dfg.end_nodes 
-                        or node2 in dfg.start_nodes):
-                        return True
-            return False
-
-        remaining_nodes = set(dfg.get_all_nodes())
-
-        # Find strongly connected components
-        components = dfg.find_strongly_connected_components()
-        cuts = []
+            n = len(cuts)
+            cut_of = {node: i for i, cut in enumerate(cuts) for node in cut}
+            # Count the edges jumping over each cut with a difference array
+            jumps = [0] * (n + 1)
+            for node1, node2 in dfg.get_all_edges():
+                if cut_of[node1] + 1 < cut_of[node2]:
+                    jumps[cut_of[node1] + 1] += 1
+                    jumps[cut_of[node2]] -= 1
+            end_before = [False] * n
+            start_after = [False] * n
+            for p in range(1, n):
+                end_before[p] = end_before[p - 1] or any(node in dfg.end_nodes for node in cuts[p - 1])
+            for p in range(n - 2, -1, -1):
+                start_after[p] = start_after[p + 1] or any(node in dfg.start_nodes for node in cuts[p + 1])
+
+            skippable = []
+            open_jumps = 0
+            for p in range(n):
+                open_jumps += jumps[p]
+                # Only inner cuts can be skipped
+                skippable.append(0 < p < n - 1 and (open_jumps > 0 or end_before[p] or start_after[p]))
+            return skippable
+
+        def find(component: int) -> int:
+            while parent[component] != component:
+                parent[component] = parent[parent[component]]
+                component = parent[component]
+            return component
+
+        # Condense strongly connected components, the topological order puts sources first
+        bitset_dfg = BitsetGraph.from_graph(dfg)
+        components, _ = bitset_dfg.strongly_connected_components()
+        components.reverse()
+        component_of = {}
+        for k, component in enumerate(components):
+            for node in bitset_dfg.members(component):
+                component_of[node] = k
+        reach = bitset_dfg.reachability()
+
+        # A component can only reach components after it in topological order, so every later
+        # component it does not reach is pairwise unreachable with it and belongs to the same cut
+        parent = list(range(len(components)))
+        later = 0
         for component in components:
-            if len(component) > 1:
-                cuts.append(set(component))
-                for node in component:
-                    remaining_nodes.discard(node)
-
-        # Find pairwise unreachable nodes and merge them to one node
-        unreachable_pairs = dfg.find_unreachable_pairs()
-        
-        merged_nodes = set()
-        for pair1, pair2 in itertools.product(unreachable_pairs, repeat=2):
-            set1, set2 = set(pair1), set(pair2)
-            if pair1 != pair2:
-                if set1.intersection(set2):
-                    merged_nodes.update(set1.union(set2))
-
-        if merged_nodes and cuts:
-            for cut in cuts:
-                if cut.intersection(merged_nodes):
-                    cut.update(merged_nodes)
-                    break
-        elif merged_nodes:
-            cuts.append(merged_nodes)
-        else:
-            for pair in unreachable_pairs:
-                cuts.append(set(pair))
-                remaining_nodes = remaining_nodes - set(pair)
-
-        # Remove merged nodes from remaining nodes to be processed
-        remaining_nodes = remaining_nodes - merged_nodes
-
-        for node in remaining_nodes:
-            cuts.append(node)
-
-        # Build cuts graph
-        cuts_graph, cut_map = dfg.build_cuts_graph(cuts)
-
-        # Sort cuts by traversing the cut graph (always a path graph)
-        start_node = cut_map[list(dfg.start_nodes)[0]]
-        sorted_cut_indices = cuts_graph.traverse_path(start_node)
-        sorted_cuts = [cuts[i] for i in sorted_cut_indices]
+            later |= component
+        for k, component in enumerate(components):
+            later &= ~component
+            unreachable = later & ~reach[bitset_dfg.members(component)[0]]
+            while unreachable:
+                other = component_of[(unreachable & -unreachable).bit_length() - 1]
+                unreachable &= ~components[other]
+                root1, root2 = find(k), find(other)
+                if root1 != root2:
+                    # Keep the earliest component as root, so roots are ordered like the cuts
+                    parent[max(root1, root2)] = min(root1, root2)
+
+        cut_masks = {}
+        for k, component in enumerate(components):
+            cut_masks[find(k)] = cut_masks.get(find(k), 0) | component
+        sorted_cuts = [bitset_dfg.to_nodes(mask) for _, mask in sorted(cut_masks.items())]
 
         # Merge skippable cuts
+        skippable = find_skippable(sorted_cuts)
         merged_cuts = []
         i = 0
         while i < len(sorted_cuts):
             # If the current cut is skippable, start merging process
-            if is_skippable(i, sorted_cuts):
+            if skippable[i]:
                 start = i
-                while i < len(sorted_cuts) and is_skippable(i, sorted_cuts):
+                while i < len(sorted_cuts) and skippable[i]:
                     i += 1
                 # Merge all consecutive skippable cuts into one
                 merged_cuts.append([activity for cut in sorted_cuts[start:i] for activity in cut])
@@ -200,7 +296,7 @@ class ProcessTree:
                 merged_cuts.append(list(sorted_cuts[i]))
                 i += 1
 
-        return None if len(merged_cuts) == 1 else merged_cuts
+        return None if len(merged_cuts) <= 1 else merged_cuts
 
     def find_parallel_cut(self, dfg: DirectlyFollowsGraph) -> Optional[List[List[str]]]:
         """
@@ -230,6 +326,7 @@ class ProcessTree:
         # Remove dual edges to be removed
         for edge in removed_edges:
             updated_graph.graph[edge[0]].remove(edge[1])
+        updated_graph.invalidate_closure()
 
         cuts = updated_graph.find_components()
 
@@ -262,6 +359,7 @@ class ProcessTree:
             for children in reduced_graph.graph.values():
                 if node in children:
                     children.remove(node)
+        reduced_graph.invalidate_closure()
 
         # Find connected components as possible candidates for loop bodies
         undirected = reduced_graph.convert_to_undirected()
@@ -349,113 +447,99 @@ class ProcessTree:
         # We need at least to components for a valid loop cut
         return None if len(cuts) < 2 else cuts
 
-    def exclusive_choice_split(self, cuts: List[List[str]]) -> List[List[str]]:
+    def exclusive_choice_split(self, cuts: List[List[str]]) -> List[Counter]:
         """
         Split the log based on exclusive choice.
 
         :param cuts: List of lists representing cuts.
-        :return: List of lists representing splits.
+        :return: List of sublogs, each a Counter of tuple-encoded traces.
         """
-        cuts = [set(cut) for cut in cuts]
-        splits = [set() for _ in range(len(cuts))]
+        cut_map = self.event_log.cut_map(cuts)
+        splits = [Counter() for _ in range(len(cuts))]
 
-        for trace in self.event_log.traces:
+        for trace, count in self.event_log.variants.items():
             if trace:
-                for i, cut in enumerate(cuts):
-                    if all(activity in cut for activity in trace):
-                        splits[i].add(trace)
-                        break
-
-        splits = [list(split) for split in splits]
+                # The cuts are disjoint, so only the cut of the first activity can contain the whole trace
+                cut_index = cut_map[trace[0]]
+                if cut_index != -1 and all(cut_map[activity] == cut_index for activity in trace):
+                    splits[cut_index][trace] += count
 
         return splits
 
-    def sequence_split(self, cuts: List[List[str]]) -> List[List[str]]:
+    def sequence_split(self, cuts: List[List[str]]) -> List[Counter]:
         """
         Split the log based on sequence.
 
         :param cuts: List of lists representing cuts.
-        :return: List of lists representing splits.
-        """
-        cuts = [set(cut) for cut in cuts] # Convert to set for faster lookup
-        splits = [set() for _ in range(len(cuts))]
-
-        for trace in self.event_log.traces:
-            subtrace = ""
-            trace = list(trace)
-            for i,cut in enumerate(cuts):
-                while trace and trace[0] in cut:
-                    subtrace += trace.pop(0)
-                splits[i].add(subtrace)
-                subtrace = ""
-                if not trace:
+        :return: List of sublogs, each a Counter of tuple-encoded traces.
+        """
+        cut_map = self.event_log.cut_map(cuts)
+        splits = [Counter() for _ in range(len(cuts))]
+
+        for trace, count in self.event_log.variants.items():
+            start = 0
+            for i in range(len(cuts)):
+                end = start
+                while end < len(trace) and cut_map[trace[end]] == i:
+                    end += 1
+                splits[i][trace[start:end]] += count
+                start = end
+                if start == len(trace):
                     break
 
-        splits = [list(split) for split in splits]
-
         return splits
 
-    def parallel_split(self, cuts: List[List[str]]) -> List[List[str]]:
+    def parallel_split(self, cuts: List[List[str]]) -> List[Counter]:
         """
         Split the log based on parallelism.
 
         :param cuts: List of lists representing cuts.
-        :return: List of lists representing splits.
+        :return: List of sublogs, each a Counter of tuple-encoded traces.
         """
-        cuts = [set(cut) for cut in cuts]
-        splits = [set() for _ in range(len(cuts))]
+        cut_map = self.event_log.cut_map(cuts)
+        splits = [Counter() for _ in range(len(cuts))]
 
-        for trace in self.event_log.traces:
-            for cut in cuts:
-                sub_trace = ''.join([activity for activity in trace if activity in cut])
+        for trace, count in self.event_log.variants.items():
+            sub_traces = [[] for _ in range(len(cuts))]
+            for activity in trace:
+                if cut_map[activity] != -1:
+                    sub_traces[cut_map[activity]].append(activity)
+            for i, sub_trace in enumerate(sub_traces):
                 if sub_trace:
-                    splits[cuts.index(cut)].add(sub_trace)
-
-        splits = [list(split) for split in splits]
+                    splits[i][tuple(sub_trace)] += count
 
         return splits
 
-    def loop_split(self, cuts: List[List[str]]) -> List[List[str]]:
+    def loop_split(self, cuts: List[List[str]]) -> List[Counter]:
         """
         Split the log based on loops.
 
         :param cuts: List of lists representing cuts.
-        :return: List of lists representing splits.
+        :return: List of sublogs, each a Counter of tuple-encoded traces.
         """
-        cuts = [set(cut) for cut in cuts]
-        splits = [set() for _ in range(len(cuts))]
+        cut_map = self.event_log.cut_map(cuts)
+        splits = [Counter() for _ in range(len(cuts))]
 
-        for trace in self.event_log.traces:
-            current_sub_trace = ""
-            current_cut_index = -1
-            
-            for activity in trace:
-                for cut_index, cut in enumerate(cuts):
-                    if activity in cut:
-                        if current_cut_index != cut_index:
-                            if current_sub_trace:
-                                splits[current_cut_index].add(current_sub_trace)
-                                current_sub_trace = ""
-                            current_cut_index = cut_index
-                        current_sub_trace += activity
-                        break
-            
-            if current_sub_trace:
-                splits[current_cut_index].add(current_sub_trace)
-
-        splits = [list(split) for split in splits]
+        for trace, count in self.event_log.variants.items():
+            # Cut the trace into maximal slices of activities of the same cut, activities of no cut are dropped
+            activities = [activity for activity in trace if cut_map[activity] != -1]
+            start = 0
+            for end in range(1, len(activities) + 1):
+                if end == len(activities) or cut_map[activities[end]] != cut_map[activities[start]]:
+                    splits[cut_map[activities[start]]][tuple(activities[start:end])] += count
+                    start = end
 
         return splits
     
-    def construct_process_tree(self) -> Tuple[str, List[str]]:
+    def find_split(self) -> Tuple[str, Optional[List[EventLog]]]:
         """
-        Construct the process tree.
+        Find the base case, the first cut that applies or the fallthrough for the log of this tree.
 
-        :return: Tuple containing the operator and subtrees.
+        :return: Tuple containing the operator and the sublogs to mine, or the finished tree and None.
         """
         base_case = self.find_base_case()
         if base_case is not None:
-            return base_case
+            return base_case, None
         
         dfg = DirectlyFollowsGraph(self.event_log)
         dfg.construct_dfg()
@@ -471,19 +555,61 @@ class ProcessTree:
             cuts = find_cut(dfg)
             if cuts is not None:
                 splits = process_split(cuts)
-                subtrees = []
-                for split in splits:
-                    sublog = dict()
-                    for trace in split:
-                        sublog[trace] = 1
-                    subtree = ProcessTree(EventLog(traces=sublog)).construct_process_tree()
-                    subtrees.append(subtree)
-                self.root = operator
-                self.children = [subtree[0] for subtree in subtrees]
-                return operator, subtrees
+                return operator, [EventLog.from_variants(split, self.event_log.activities) for split in splits]
         
         # Fallthrough case
-        return 'O', ['tau'] + dfg.get_all_nodes()
+        return ('O', ['tau'] + dfg.get_all_nodes()), None
+
+    def construct_process_tree(self) -> Tuple[str, List[str]]:
+        """
+        Construct the process tree.
+
+        Sublogs are mined with an explicit stack instead of recursion. Identical sublogs (same multiset
+        of variants) recur e.g. in loop and parallel branches, so each one is mined only once. The
+        result is stored in self.tree and returned by later calls without mining again.
+
+        :return: Tuple containing the operator and subtrees.
+        """
+        if self.tree is not None:
+            return self.tree
+
+        def sublog_key(event_log: EventLog) -> frozenset:
+            return frozenset(event_log.variants.items())
+
+        trees = {}  # Mined tree of every sublog
+        pending = {}  # Operator and sublog keys of sublogs waiting for their subtrees
+        root_key = sublog_key(self.event_log)
+        root_operator = None
+        stack = [(root_key, self)]
+        while stack:
+            key, tree = stack[-1]
+            if key in trees:
+                stack.pop()
+            elif key in pending:
+                # All subtrees are mined
+                operator, child_keys = pending.pop(key)
+                trees[key] = (operator, [trees[child_key] for child_key in child_keys])
+                stack.pop()
+            else:
+                result, sublogs = tree.find_split()
+                if sublogs is None:
+                    trees[key] = result
+                    stack.pop()
+                    continue
+                # Every sublog contains fewer activities or fewer traces than its parent, so no sublog is pending here
+                child_keys = [sublog_key(sublog) for sublog in sublogs]
+                pending[key] = (result, child_keys)
+                if tree is self:
+                    root_operator = result
+                for child_key, sublog in zip(child_keys, sublogs):
+                    if child_key not in trees:
+                        stack.append((child_key, ProcessTree(sublog)))
+
+        self.tree = trees[root_key]
+        if root_operator is not None:
+            self.root = root_operator
+            self.children = [subtree[0] for subtree in self.tree[1]]
+        return self.tree
     
     def __str__(self) -> str:
         """
@@ -498,7 +624,7 @@ class ProcessTree:
             '||': '∧',
             'tau': '𝝉'
         }
-        tree = self.construct_process_tree()
+        tree = self.construct_process_tree()  # Mined once, then cached
 
         def print_tree(subtree) -> str:
             if isinstance(subtree, str): # Base case
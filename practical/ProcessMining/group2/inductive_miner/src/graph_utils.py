@@ -13,6 +13,35 @@ class Graph:
         else:
             self.graph = defaultdict(list)
 
+    @property
+    def graph(self) -> Dict[str, List[str]]:
+        """
+        Adjacency list of the graph.
+        Code that edits the adjacency list in place has to call invalidate_closure() afterwards.
+        """
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph: Dict[str, List[str]]) -> None:
+        self._graph = graph
+        self._closure = None
+
+    def invalidate_closure(self) -> None:
+        """
+        Drop the cached transitive closure, it is recomputed on the next reachability query.
+        """
+        self._closure = None
+
+    def transitive_closure(self) -> Dict[str, Set[str]]:
+        """
+        Get the transitive closure of the graph. It is computed once (see BitsetGraph.reachability)
+        and shared by all reachability queries until the graph is mutated.
+        :return: Dictionary mapping each node to the set of nodes reachable from it (including itself).
+        """
+        if self._closure is None:
+            self._closure = BitsetGraph.from_graph(self).all_pairs_reachability_dag()
+        return self._closure
+
     def add_edge(self, u: str, v: str) -> None:
         """
         Add an edge to the graph.
@@ -22,6 +51,7 @@ class Graph:
         if u not in self.graph:
             self.graph[u] = []
         self.graph[u].append(v)
+        self._closure = None
 
     def add_node(self, u: str) -> None:
         """
@@ -30,6 +60,7 @@ class Graph:
         """
         if u not in self.graph:
             self.graph[u] = []
+            self._closure = None
 
     def get_neighbors(self, u: str) -> List[str]:
         """
@@ -101,8 +132,10 @@ class Graph:
         :param node2: Target node.
         :return: True if reachable, False otherwise.
         """
-        path = self.dfs(node1)
-        return node2 in path
+        closure = self.transitive_closure()
+        if node1 not in closure:
+            return node1 == node2
+        return node2 in closure[node1]
     
     def convert_to_undirected(self) -> 'Graph':
         """
@@ -222,20 +255,15 @@ class Graph:
         Compute reachability for all pairs in a DAG.
         :return: Dictionary with reachability sets.
         """
-        nodes = list(self.graph.keys())
-        reach = {node: set() for node in nodes}
-        
-        for node in nodes:
-            reach[node] = set(self.dfs(node))
-        
-        return reach
+        closure = self.transitive_closure()
+        return {node: set(closure[node]) for node in self.graph.keys()}
 
     def find_unreachable_pairs(self) -> List[Tuple[str, str]]:
         """
         Find all pairs of nodes that are not reachable from each other.
         :return: List of unreachable pairs.
         """
-        reach = self.all_pairs_reachability_dag()
+        reach = self.transitive_closure()
         nodes = self.get_all_nodes()
         non_reachable_pairs = set()
         
@@ -268,3 +296,283 @@ class Graph:
         :return: String representation.
         """
         return "\n".join(f"{node} -> {neighbors}" for node, neighbors in self.graph.items())
+
+
+class BitsetGraph:
+    def __init__(self, initial_graph: Optional[Dict[str, List[str]]] = None):
+        """
+        Initialize the graph. Nodes are mapped to integer ids in insertion order and the
+        successors of a node are stored as a bitset (Python int, bit i is the node with id i).
+        :param initial_graph: Optional initial adjacency list.
+        """
+        self.nodes = []  # Node names, indexed by id
+        self.ids = {}  # Node name -> id
+        self.successors = []  # Successor bitset, indexed by id
+        self._reachability = None  # Reachability bitsets, computed lazily
+        if initial_graph is not None:
+            # Add all nodes first, so that the ids follow the order of the adjacency list
+            for u in initial_graph:
+                self.add_node(u)
+            for u, neighbors in initial_graph.items():
+                for v in neighbors:
+                    self.add_edge(u, v)
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> 'BitsetGraph':
+        """
+        Build a bitset graph from an adjacency list graph.
+        :param graph: Graph object.
+        :return: BitsetGraph object.
+        """
+        return cls(graph.graph)
+
+    def add_node(self, u: str) -> int:
+        """
+        Add a node to the graph.
+        :param u: Node to be added.
+        :return: Id of the node.
+        """
+        if u not in self.ids:
+            self.ids[u] = len(self.nodes)
+            self.nodes.append(u)
+            self.successors.append(0)
+            self._reachability = None
+        return self.ids[u]
+
+    def add_edge(self, u: str, v: str) -> None:
+        """
+        Add an edge to the graph. Adding an existing edge has no effect.
+        :param u: Starting node of the edge.
+        :param v: Ending node of the edge.
+        """
+        i, j = self.add_node(u), self.add_node(v)
+        if not self.successors[i] >> j & 1:
+            self.successors[i] |= 1 << j
+            self._reachability = None
+
+    def has_edge(self, u: str, v: str) -> bool:
+        """
+        Check if the graph contains the edge (u, v).
+        :param u: Starting node of the edge.
+        :param v: Ending node of the edge.
+        :return: True if the edge exists, False otherwise.
+        """
+        return u in self.ids and v in self.ids and bool(self.successors[self.ids[u]] >> self.ids[v] & 1)
+
+    def mask(self, nodes) -> int:
+        """
+        Convert nodes to a bitset.
+        :param nodes: Iterable of nodes.
+        :return: Bitset of the node ids.
+        """
+        mask = 0
+        for node in nodes:
+            mask |= 1 << self.ids[node]
+        return mask
+
+    @staticmethod
+    def members(mask: int) -> List[int]:
+        """
+        Get the ids in a bitset.
+        :param mask: Bitset of node ids.
+        :return: List of ids in ascending order.
+        """
+        ids = []
+        while mask:
+            low = mask & -mask
+            ids.append(low.bit_length() - 1)
+            mask ^= low
+        return ids
+
+    def to_nodes(self, mask: int) -> List[str]:
+        """
+        Convert a bitset to nodes.
+        :param mask: Bitset of node ids.
+        :return: List of nodes in insertion order.
+        """
+        return [self.nodes[i] for i in self.members(mask)]
+
+    def get_neighbors(self, u: str) -> List[str]:
+        """
+        Get the neighbors of a node.
+        :param u: Node whose neighbors are to be fetched.
+        :return: List of neighbors.
+        """
+        return self.to_nodes(self.successors[self.ids[u]])
+
+    def get_all_nodes(self) -> List[str]:
+        """
+        Get all nodes in the graph.
+        :return: List of all nodes.
+        """
+        return list(self.nodes)
+
+    def get_all_edges(self) -> List[Tuple[str, str]]:
+        """
+        Get all edges in the graph.
+        :return: List of all edges.
+        """
+        return [(u, v) for i, u in enumerate(self.nodes) for v in self.to_nodes(self.successors[i])]
+
+    def strongly_connected_components(self) -> Tuple[List[int], List[int]]:
+        """
+        Find the strongly connected components with an iterative version of Tarjan's algorithm.
+        :return: Tuple of the component bitsets, in reverse topological order (sinks first),
+                 and the component index of every node id.
+        """
+        n = len(self.nodes)
+        index = [-1] * n
+        lowlink = [0] * n
+        on_stack = [False] * n
+        component_of = [-1] * n
+        components = []
+        stack = []
+        counter = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, self.successors[root])]
+            while work:
+                node, remaining = work[-1]
+                if remaining:
+                    low = remaining & -remaining
+                    work[-1] = (node, remaining ^ low)
+                    child = low.bit_length() - 1
+                    if index[child] == -1:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack[child] = True
+                        work.append((child, self.successors[child]))
+                    elif on_stack[child]:
+                        lowlink[node] = min(lowlink[node], index[child])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    # node is the root of a component, pop its members
+                    component = 0
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component_of[member] = len(components)
+                        component |= 1 << member
+                        if member == node:
+                            break
+                    components.append(component)
+
+        return components, component_of
+
+    def reachability(self) -> List[int]:
+        """
+        Compute the reachability bitset of every node (including the node itself). The strongly
+        connected components are condensed to a DAG whose reachability is propagated from the
+        sinks to the sources, so every edge of the condensation is processed once.
+        :return: Reachability bitset, indexed by node id.
+        """
+        if self._reachability is None:
+            components, component_of = self.strongly_connected_components()
+            component_reach = []
+            for component in components:
+                # Successor components have a smaller index and are therefore already complete
+                reach = component
+                successors = 0
+                for node in self.members(component):
+                    successors |= self.successors[node]
+                for node in self.members(successors & ~component):
+                    reach |= component_reach[component_of[node]]
+                component_reach.append(reach)
+            self._reachability = [component_reach[c] for c in component_of]
+        return self._reachability
+
+    def is_reachable(self, node1: str, node2: str) -> bool:
+        """
+        Check if node2 is reachable from node1.
+        :param node1: Starting node.
+        :param node2: Target node.
+        :return: True if reachable, False otherwise.
+        """
+        return bool(self.reachability()[self.ids[node1]] >> self.ids[node2] & 1)
+
+    def find_strongly_connected_components(self) -> List[Set[str]]:
+        """
+        Find all strongly connected components.
+        :return: List of strongly connected components, in topological order.
+        """
+        components, _ = self.strongly_connected_components()
+        return [set(self.to_nodes(component)) for component in reversed(components)]
+
+    def all_pairs_reachability_dag(self) -> Dict[str, Set[str]]:
+        """
+        Compute reachability for all pairs.
+        :return: Dictionary with reachability sets.
+        """
+        reach = self.reachability()
+        return {node: set(self.to_nodes(reach[i])) for i, node in enumerate(self.nodes)}
+
+    def find_unreachable_pairs(self) -> List[Tuple[str, str]]:
+        """
+        Find all pairs of nodes that are not reachable from each other.
+        :return: List of unreachable pairs.
+        """
+        reach = self.reachability()
+        n = len(self.nodes)
+        # reached_by[i] is the bitset of nodes that reach node i
+        reached_by = [0] * n
+        for i in range(n):
+            for j in self.members(reach[i]):
+                reached_by[j] |= 1 << i
+        later = (1 << n) - 1
+        pairs = []
+        for i in range(n):
+            later ^= 1 << i
+            unreachable = later & ~reach[i] & ~reached_by[i]
+            pairs.extend((self.nodes[i], self.nodes[j]) for j in self.members(unreachable))
+        return pairs
+
+    def build_cuts_graph(self, cuts: List[List[str]]) -> Tuple[Graph, Dict[str, int]]:
+        """
+        Builds a graph representing connections between cuts and maps each node to its corresponding cut index.
+        Same result as Graph.build_cuts_graph, but every reachability check is a bitset lookup.
+        :param cuts: List of lists, where each inner list represents a cut.
+        :return: Tuple containing the resulting graph (always a path) and a mapping of nodes to their cut indices.
+        """
+        cut_graph = {i: set() for i in range(len(cuts))}
+        cut_map = {node: i for i, scc in enumerate(cuts) for node in scc}
+        cut_masks = [self.mask(cut) for cut in cuts]
+        reach = self.reachability()
+
+        for i, node in enumerate(self.nodes):
+            current_cut = cut_map[node]
+            for j in self.members(self.successors[i]):
+                neighbor_cut = cut_map[self.nodes[j]]
+                if current_cut == neighbor_cut:
+                    continue
+                # The cut of the neighbor is connected if there is no other neighbor, or if another neighbor
+                # lies in the current cut or in the neighbor's cut, or is reachable from the neighbor
+                other_neighbors = self.successors[i] & ~(1 << j)
+                if not other_neighbors or other_neighbors & (cut_masks[current_cut] | cut_masks[neighbor_cut] | reach[j]):
+                    cut_graph[current_cut].add(neighbor_cut)
+
+        return Graph(cut_graph), cut_map
+
+    def to_graph(self) -> Graph:
+        """
+        Convert to an adjacency list graph.
+        :return: Graph object.
+        """
+        return Graph({node: self.to_nodes(self.successors[i]) for i, node in enumerate(self.nodes)})
+
+    def __str__(self) -> str:
+        """
+        String representation of the graph.
+        :return: String representation.
+        """
+        return "\n".join(f"{node} -> {self.to_nodes(self.successors[i])}" for i, node in enumerate(self.nodes))
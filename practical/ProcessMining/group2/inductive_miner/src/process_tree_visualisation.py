@@ -14,6 +14,10 @@ class Relations(Enum):
  
 class Visualisation:
     def visualize_process_tree(self, tree):
+        # A ProcessTree object is rendered from its cached result, it is only mined if that did not happen yet
+        if hasattr(tree, 'construct_process_tree'):
+            tree = tree.construct_process_tree()
+
         # Initialize a Graphviz Digraph object
         dot = Digraph()
         
@@ -1,3 +1,5 @@
+from collections import Counter
+
 from practical.ProcessMining.group2.inductive_miner.src.algo import *
 
 
@@ -105,11 +107,8 @@ def test_exclusive_choice_split():
     dfg0 = DirectlyFollowsGraph(e0)
     dfg0.construct_dfg()
     p0 = ProcessTree(e0)
-    actual = p0.exclusive_choice_split([['e'], ['b', 'c']])
-    target = [['e'], ['bc', 'cb']]
-    assert set(frozenset(sub) for sub in actual) == set(
-        frozenset(sub) for sub in target
-    )
+    actual = [e0.decode(split) for split in p0.exclusive_choice_split([['e'], ['b', 'c']])]
+    assert actual == [Counter({('e',): 1}), Counter({('b', 'c'): 1, ('c', 'b'): 1})]
 
 
 def test_find_sequence_cut():
@@ -154,16 +153,42 @@ def test_find_sequence_cut():
     assert p4.find_sequence_cut(dfg4) == None
 
 
+def test_find_sequence_cut_order():
+    # Cuts are returned in sequence order
+    e0 = EventLog({'abcd': 3, 'acbd': 2, 'aed': 1})
+    dfg0 = DirectlyFollowsGraph(e0)
+    dfg0.construct_dfg()
+    p0 = ProcessTree(e0)
+    assert [sorted(cut) for cut in p0.find_sequence_cut(dfg0)] == [['a'], ['b', 'c', 'e'], ['d']]
+
+    # Several start nodes, c reaches the strongly connected component {a, b, e, f}
+    e1 = EventLog({'cfffea': 1, 'bfab': 1, 'c': 1})
+    dfg1 = DirectlyFollowsGraph(e1)
+    dfg1.construct_dfg()
+    p1 = ProcessTree(e1)
+    assert [sorted(cut) for cut in p1.find_sequence_cut(dfg1)] == [['c'], ['a', 'b', 'e', 'f']]
+
+    # Long sequence
+    activities = [chr(i) for i in range(ord('A'), ord('A') + 50)]
+    e2 = EventLog({''.join(activities): 1})
+    dfg2 = DirectlyFollowsGraph(e2)
+    dfg2.construct_dfg()
+    p2 = ProcessTree(e2)
+    assert p2.find_sequence_cut(dfg2) == [[activity] for activity in activities]
+
+
 def test_sequence_split():
     e0 = EventLog({'abcd': 3, 'acbd': 2, 'aed': 1})
     dfg0 = DirectlyFollowsGraph(e0)
     dfg0.construct_dfg()
     p0 = ProcessTree(e0)
-    actual = p0.sequence_split([['a'], ['b', 'c', 'e'], ['d']])
-    target = [['a'], ['e', 'bc', 'cb'], ['d']]
-    assert set(frozenset(sub) for sub in actual) == set(
-        frozenset(sub) for sub in target
-    )
+    actual = [e0.decode(split) for split in p0.sequence_split([['a'], ['b', 'c', 'e'], ['d']])]
+    # Frequencies of the traces are kept in the sublogs
+    assert actual == [
+        Counter({('a',): 6}),
+        Counter({('b', 'c'): 3, ('c', 'b'): 2, ('e',): 1}),
+        Counter({('d',): 6}),
+    ]
 
 
 def test_find_parallel_cut():
@@ -193,7 +218,8 @@ def test_parallel_split():
     dfg0 = DirectlyFollowsGraph(e0)
     dfg0.construct_dfg()
     p0 = ProcessTree(e0)
-    assert p0.parallel_split([['b'], ['c']]) == [['b'], ['c']]
+    actual = [e0.decode(split) for split in p0.parallel_split([['b'], ['c']])]
+    assert actual == [Counter({('b',): 2}), Counter({('c',): 2})]
 
 
 def test_find_loop_cut():
@@ -255,11 +281,8 @@ def test_loop_split():
     dfg0 = DirectlyFollowsGraph(e0)
     dfg0.construct_dfg()
     p0 = ProcessTree(e0)
-    actual = p0.loop_split([['b', 'c'], ['e', 'f']])
-    target = [['cb', 'bc'], ['ef']]
-    assert set(frozenset(sub) for sub in actual) == set(
-        frozenset(sub) for sub in target
-    )
+    actual = [e0.decode(split) for split in p0.loop_split([['b', 'c'], ['e', 'f']])]
+    assert actual == [Counter({('b', 'c'): 6, ('c', 'b'): 5}), Counter({('e', 'f'): 5})]
 
 
 def test_construct_process_tree():
@@ -292,6 +315,42 @@ def test_construct_process_tree():
     assert p1.construct_process_tree() == 'tau'
 
 
+def test_construct_process_tree_cached():
+    e0 = EventLog({'abcd': 3, 'acbd': 2, 'aed': 1})
+    p0 = ProcessTree(e0)
+    tree = p0.construct_process_tree()
+    assert p0.tree is tree
+    assert p0.root == '->'
+    # Printing and mining again reuse the stored tree
+    mined = []
+    p0.find_split = lambda: mined.append(1)
+    assert p0.construct_process_tree() is tree
+    assert str(p0) in ("➜(a, x(∧(b, c), e), d)", "➜(a, x(∧(c, b), e), d)", "➜(a, x(e, ∧(b, c)), d)", "➜(a, x(e, ∧(c, b)), d)")
+    assert mined == []
+
+
+def test_construct_process_tree_memoized():
+    # Every distinct sublog is mined at most once
+    e0 = EventLog.from_file('./../data/log_from_paper.txt')
+    mined = []
+    find_split = ProcessTree.find_split
+    def counting_find_split(tree):
+        mined.append(frozenset(tree.event_log.variants.items()))
+        return find_split(tree)
+    ProcessTree.find_split = counting_find_split
+    try:
+        tree = ProcessTree(e0).construct_process_tree()
+    finally:
+        ProcessTree.find_split = find_split
+    assert len(mined) == len(set(mined))
+    assert tree[0] == '->' and tree[1][0] == 'a' and tree[1][1][0] == 'O'
+
+    # Long logs do not hit the recursion limit
+    activities = tuple('a{}'.format(i) for i in range(1500))
+    tree = ProcessTree(EventLog({activities: 1})).construct_process_tree()
+    assert tree == ('->', list(activities))
+
+
 def test_mine_process_model():
     e0 = EventLog({'abcd': 3, 'acbd': 2, 'aed': 1})
     i0 = InductiveMiner()
@@ -299,6 +358,31 @@ def test_mine_process_model():
     # TODO: recheck functionality of mine_process_model
 
 
+def test_event_log_variants():
+    # String and tuple traces are stored as the same multiset of variants
+    e0 = EventLog({'abc': 2, 'ab': 1})
+    e1 = EventLog.from_variants(Counter({('a', 'b', 'c'): 2, ('a', 'b'): 1}))
+    assert e0.named_variants() == e1.named_variants() == Counter({('a', 'b', 'c'): 2, ('a', 'b'): 1})
+    assert EventLog({'': 3}).variants == Counter({(): 3})
+    # Activities are encoded as integer codes in order of appearance
+    assert e0.activities == ['a', 'b', 'c']
+    assert e0.variants == Counter({(0, 1, 2): 2, (0, 1): 1})
+    assert e0.cut_map([['c'], ['a', 'b']]) == [1, 1, 0]
+    # Sublogs share the codes of their parent log
+    e2 = EventLog.from_variants(Counter({(2, 0): 1}), e0.activities)
+    assert e2.traces == Counter({('c', 'a'): 1})
+
+
+def test_multi_character_activities():
+    e0 = EventLog({('register', 'check', 'pay', 'archive'): 3, ('register', 'pay', 'check', 'archive'): 2})
+    p0 = ProcessTree(e0)
+    actual = p0.construct_process_tree()
+    target = ('->', ['register', ('||', ['check', 'pay']), 'archive'])
+    assert actual[0] == target[0]
+    assert actual[1][0] == 'register' and actual[1][2] == 'archive'
+    assert actual[1][1][0] == '||' and sorted(actual[1][1][1]) == ['check', 'pay']
+
+
 def test_find_base_case():
     e0 = EventLog({'abcd': 3, 'acbd': 2, 'aed': 1})
     dfg0 = DirectlyFollowsGraph(e0)
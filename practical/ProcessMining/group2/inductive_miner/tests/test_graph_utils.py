@@ -1,4 +1,6 @@
 from practical.ProcessMining.group2.inductive_miner.src.graph_utils import *
+import copy
+import random
 
 
 def test_initialize_graph():
@@ -191,3 +193,81 @@ def test_find_strongly_connected_components():
 def test_build_cuts_graph():
     g0 = Graph({'a': ['b'], 'b': ['c', 'd'], 'c': [], 'd': []})
     pass
+
+
+def random_graph(seed, n=12, edge_probability=0.15):
+    rng = random.Random(seed)
+    nodes = [chr(ord('a') + i) for i in range(n)]
+    return {u: [v for v in nodes if rng.random() < edge_probability] for u in nodes}
+
+
+def test_bitset_graph():
+    g = BitsetGraph({'a': ['b'], 'b': ['c', 'd'], 'c': [], 'd': []})
+    g.add_edge('a', 'b')  # Existing edges are not added twice
+    g.add_edge('d', 'e')
+    assert g.get_all_nodes() == ['a', 'b', 'c', 'd', 'e']
+    assert g.get_neighbors('b') == ['c', 'd']
+    assert g.get_all_edges() == [('a', 'b'), ('b', 'c'), ('b', 'd'), ('d', 'e')]
+    assert g.has_edge('d', 'e') and not g.has_edge('e', 'd')
+    assert g.to_graph().graph == {'a': ['b'], 'b': ['c', 'd'], 'c': [], 'd': ['e'], 'e': []}
+    assert g.is_reachable('a', 'e') == True
+    # Reachability is recomputed after a mutation
+    assert g.is_reachable('e', 'a') == False
+    g.add_edge('e', 'a')
+    assert g.is_reachable('e', 'a') == True
+    assert g.find_strongly_connected_components() == [{'a', 'b', 'd', 'e'}, {'c'}]
+
+
+def test_bitset_graph_matches_graph():
+    for seed in range(50):
+        adjacency = random_graph(seed, edge_probability=0.05 * (1 + seed % 5))
+        graph = Graph(copy.deepcopy(adjacency))
+        bitset_graph = BitsetGraph.from_graph(graph)
+        nodes = graph.get_all_nodes()
+        # Graph.is_reachable uses the same closure, compare against plain DFS instead
+        reach = {u: set(graph.dfs(u)) for u in nodes}
+        for u in nodes:
+            for v in nodes:
+                assert bitset_graph.is_reachable(u, v) == (v in reach[u])
+        assert bitset_graph.all_pairs_reachability_dag() == reach
+        assert set(bitset_graph.find_unreachable_pairs()) == set(
+            (u, v) for i, u in enumerate(nodes) for v in nodes[i + 1:] if v not in reach[u] and u not in reach[v]
+        )
+        assert graph.all_pairs_reachability_dag() == reach
+        assert sorted(map(sorted, bitset_graph.find_strongly_connected_components())) == sorted(
+            map(sorted, graph.find_strongly_connected_components())
+        )
+        cuts = [list(component) for component in graph.find_strongly_connected_components()]
+        assert bitset_graph.build_cuts_graph(cuts)[0].graph == graph.build_cuts_graph(cuts)[0].graph
+
+
+def test_bitset_graph_deep_chain():
+    # Long paths must not hit the recursion limit
+    nodes = ['n{}'.format(i) for i in range(5000)]
+    g = BitsetGraph()
+    for u, v in zip(nodes, nodes[1:]):
+        g.add_edge(u, v)
+    assert g.is_reachable(nodes[0], nodes[-1]) == True
+    assert g.is_reachable(nodes[-1], nodes[0]) == False
+    assert len(g.find_strongly_connected_components()) == len(nodes)
+
+
+def test_transitive_closure_cache():
+    g = Graph({'a': ['b'], 'b': ['c'], 'c': [], 'd': []})
+    assert g.transitive_closure() == {'a': {'a', 'b', 'c'}, 'b': {'b', 'c'}, 'c': {'c'}, 'd': {'d'}}
+    # The closure is computed once and shared by all queries
+    closure = g.transitive_closure()
+    assert g.is_reachable('a', 'c') == True
+    assert g.find_unreachable_pairs() is not None
+    assert g.transitive_closure() is closure
+    # Mutations invalidate the closure
+    g.add_edge('c', 'd')
+    assert g.is_reachable('a', 'd') == True
+    g.add_node('e')
+    assert g.is_reachable('e', 'e') == True
+    assert g.is_reachable('a', 'e') == False
+    g.graph['e'].append('a')
+    g.invalidate_closure()
+    assert g.is_reachable('e', 'd') == True
+    g.graph = {'x': ['y'], 'y': []}
+    assert g.transitive_closure() == {'x': {'x', 'y'}, 'y': {'y'}}